@@ -16,12 +16,21 @@ Created on May 5, 2011
 @author: Aaron Digulla <digulla@hepe.com>
 """
 import os
+import re
 import sys
+import json
 import time
 import logging
-from m4e.common import configLogger, mustBeDirectory, userNeedsHelp, substringBefore
+import StringIO
+import multiprocessing
+from optparse import OptionParser
+from m4e.common import addLogLevelOption, addProfileOption, instrumentation, phase, configLogger, configWorkerLogger, mustBeDirectory, userNeedsHelp, substringBefore, writeIfChanged
+from m4e.compress import compressionMethods, openOutput
 from m4e.patches import PatchLoader, PatchTool
-from m4e.pom import Pom
+from m4e.pom import PomLoader
+from m4e.pomcache import pomCache
+from m4e.graph import DependencyGraph
+from m4e.version import isRange, versionKey, versionSpecKey, parseRange
 from m4e.rendersnake import *
 
 VERSION = '0.9 (13.05.2011)'
@@ -38,6 +47,20 @@ class Problem(object):
     def __repr__(self):
         return 'POM %s: %s' % (self.pom.key(), self.message)
     
+    def groupId(self):
+        '''The groupId of the artifact which this problem is about'''
+        return substringBefore(self.pom.shortKey(), ':')
+    
+    def toDict(self):
+        '''Convert this problem into a dict for the JSON report'''
+        return {
+            'kind': self.__class__.__name__,
+            'category': self.htmlTitle,
+            'groupId': self.groupId(),
+            'pom': self.pom.key(),
+            'message': self.message,
+        }
+    
     def renderOn(self, html):
         html.div( A().class_( 'problem' ) ) \
         .write( 'POM ' ) \
@@ -57,6 +80,11 @@ class ProblemSameKeyDifferentVersion(Problem):
     def __repr__(self):
         return 'POM %s: %s: %s' % (self.pom.key(), self.message, self.other.key())
     
+    def toDict(self):
+        result = Problem.toDict(self)
+        result['other'] = self.other.key()
+        return result
+    
     def renderOn(self, html):
         html.div( A().class_( 'problem' ) ) \
         .write( 'There are two POMs with the same ID but different version:' ) \
@@ -79,6 +107,11 @@ class ProblemWithDependency(Problem):
         
         return 'POM %s: %s%s' % (self.pom.key(), self.message, d)
     
+    def toDict(self):
+        result = Problem.toDict(self)
+        result['dependency'] = None if self.dependency is None else '%s' % self.dependency
+        return result
+    
     def renderOn(self, html):
         html.div( A().class_( 'problem' ) ) \
         .write( 'POM ' ) \
@@ -101,7 +134,7 @@ class ProblemDifferentVersions(Problem):
     
     def __repr__(self):
         versions = list(self.versionBackRefs.keys())
-        versions.sort()
+        versions.sort(key=versionSpecKey)
                 
         message = 'The dependency %s is referenced with %d different versions:\n' % (self.pom.key(),len(versions))
         
@@ -116,9 +149,26 @@ class ProblemDifferentVersions(Problem):
         
         return message
     
+    def toDict(self):
+        result = Problem.toDict(self)
+        
+        versions = list(self.versionBackRefs.keys())
+        versions.sort(key=versionSpecKey)
+        
+        usage = []
+        for version in versions:
+            backRefs = [pom.key() for pom in self.versionBackRefs[version]]
+            backRefs.sort()
+            
+            usage.append({ 'version': version, 'usedBy': backRefs })
+        
+        result['dependency'] = self.pom.key()
+        result['versions'] = usage
+        return result
+    
     def renderOn(self, html):
         versions = list(self.versionBackRefs.keys())
-        versions.sort()
+        versions.sort(key=versionSpecKey)
         
         html.div( A().class_( 'problem' ) ) \
         .write( 'The dependency ' ) \
@@ -165,6 +215,9 @@ class MissingDependency(Problem):
         
         return message
     
+    def groupId(self):
+        return substringBefore(self.key, ':')
+    
     def renderOn(self, html):
         html.div( A().class_( 'problem' ) ) \
         .write( 'The dependency ' ) \
@@ -178,6 +231,182 @@ class MissingDependency(Problem):
         
         html._ul()
         html._div()
+    
+    def toDict(self):
+        result = Problem.toDict(self)
+        result['dependency'] = self.key
+        result['usedBy'] = [d.key() for d in self.dependencies]
+        return result
+
+class ProblemUnsatisfiedRange(Problem):
+    htmlTitle = 'Unsatisfied Version Ranges'
+    
+    def __init__(self, pom, version, backRefs, available):
+        Problem.__init__(self, pom, 'No version of this dependency in the repository matches')
+        
+        self.version = version
+        self.backRefs = backRefs
+        self.available = available
+    
+    def __repr__(self):
+        message = 'No version of %s in this M2 repo matches "%s" (available: %s). It is used in:\n' % (
+                self.pom.shortKey(), self.version, ', '.join(self.available))
+        
+        for pom in self.backRefs:
+            message += '    %s\n' % pom.key()
+        
+        return message
+    
+    def renderOn(self, html):
+        html.div( A().class_( 'problem' ) ) \
+        .write( 'No version of ' ) \
+        .span( A().class_( 'dependency' ) ).write( self.pom.shortKey() )._span() \
+        .write( ' in this M2 repo matches "' ) \
+        .span( A().class_( 'version' ) ).write( self.version )._span() \
+        .write( '" (available: ' )
+        
+        for index, version in enumerate(self.available):
+            if index:
+                html.write(', ')
+            html.span( A().class_( 'version' ) ).write( version )._span()
+        
+        html.write( '). It is used in:' )
+        
+        html.ul()
+
+        for pom in self.backRefs:
+            html.li().span(A().class_('pom')).write(pom.key())._span()._li()
+        
+        html._ul()
+        html._div()
+    
+    def toDict(self):
+        result = Problem.toDict(self)
+        result['dependency'] = self.pom.shortKey()
+        result['version'] = self.version
+        result['available'] = self.available
+        result['usedBy'] = [pom.key() for pom in self.backRefs]
+        return result
+
+class ProblemDependencyCycle(Problem):
+    htmlTitle = 'Dependency Cycles'
+    
+    def __init__(self, pom, cycle):
+        Problem.__init__(self, pom, 'These artifacts depend on each other')
+        
+        self.cycle = cycle
+    
+    def __repr__(self):
+        message = 'There is a dependency cycle between %d artifacts:\n' % len(self.cycle)
+        for key in self.cycle:
+            message += '    %s\n' % key
+        
+        return message
+    
+    def renderOn(self, html):
+        html.div( A().class_( 'problem' ) ) \
+        .write( 'There is a dependency cycle between %d artifacts:' % len(self.cycle) )
+        
+        html.ul()
+        
+        for key in self.cycle:
+            html.li().span(A().class_('pom')).write(key)._span()._li()
+        
+        html._ul()
+        html._div()
+    
+    def toDict(self):
+        result = Problem.toDict(self)
+        result['cycle'] = self.cycle
+        return result
+
+class ProblemOrphanedArtifact(Problem):
+    htmlTitle = 'Orphaned Artifacts'
+    
+    def __init__(self, pom):
+        Problem.__init__(self, pom, 'No other POM in this repository depends on this artifact')
+
+class ProblemPathMismatch(Problem):
+    htmlTitle = "POMs which don't match their path"
+    
+    def __init__(self, pom):
+        Problem.__init__(self, pom, 'The coordinates differ from the path %s: %s' % (
+            pom.pomFile, '; '.join(pom.mismatches)))
+
+class Check(object):
+    '''A check which looks for problems in the indexes built by the Analyzer'''
+    def __init__(self, name, needs, description, func, default=True):
+        self.name = name
+        self.needs = needs
+        self.description = description
+        self.func = func
+        # Optional checks only run when they are enabled explicitly
+        self.default = default
+    
+    def __repr__(self):
+        return 'Check(%s)' % self.name
+
+# All known checks in the order in which they run
+CHECKS = []
+
+def check(name, needs, description, default=True):
+    '''Register a method of Analyzer as a check.
+    
+    needs is the list of indexes which the check uses. Checks with
+    default=False only run when they are enabled explicitly.'''
+    def register(func):
+        CHECKS.append(Check(name, needs, description, func, default))
+        return func
+    
+    return register
+
+class JsonReport(object):
+    '''Write problems as JSON, one object per line, as soon as they are found'''
+    def __init__(self, path):
+        self.path = path
+        self.out = open(path, 'w')
+    
+    def write(self, record):
+        self.out.write(json.dumps(record, sort_keys=True))
+        self.out.write('\n')
+    
+    def problem(self, problem):
+        record = problem.toDict()
+        record['record'] = 'problem'
+        self.write(record)
+    
+    def summary(self, analyzer):
+        self.write({
+            'record': 'summary',
+            'repository': analyzer.repoDir,
+            'poms': len(analyzer.pomFiles),
+            'problems': analyzer.problemCount,
+            'problemsByKind': analyzer.problemCountByKind,
+            'checks': analyzer.checkStats,
+            'timings': analyzer.timings,
+        })
+    
+    def close(self):
+        self.out.close()
+
+class ReportShard(object):
+    '''One page of a sharded HTML report'''
+    def __init__(self, key, title, fileName):
+        self.key = key
+        self.title = title
+        self.fileName = fileName
+        self.problems = []
+        self.pomShortKeys = []
+    
+    def __repr__(self):
+        return 'ReportShard(%s)' % self.key
+
+# The Analyzer which is rendering a sharded report. Worker processes
+# inherit it when they are forked, so the POMs don't have to be pickled.
+_shardOwner = None
+
+def _renderShard(key):
+    return _shardOwner.renderShard(_shardOwner.shards[key])
 
 class Analyzer(object):
     def __init__(self, repoDir):
@@ -186,26 +415,198 @@ class Analyzer(object):
         self.versions = {}
         self.versionBackRefs = {}
         self.problems = []
+        self.problemCount = 0
+        self.problemCountByKind = {}
         self.pomByKey = {}
         self.dependencies = {}
+        self.timings = {}
+        self.artifactVersions = {}
+        self.pomsByShortKey = {}
+        self.dependenciesWithoutVersion = []
+        self.graph = None
+        self.indexes = set()
+        
+        # Names of the checks to run. None means "all checks which run by default"
+        self.enabled = None
+        self.disabled = set()
+        self.checkStats = []
+        
+        # Set keepProblems to False when no HTML report is needed
+        # to keep memory usage flat
+        self.keepProblems = True
+        self.htmlReportEnabled = True
+        
+        # Compress the HTML report with 'gzip' or 'zstd'
+        self.compression = None
+        self.compressionLevel = None
+        # Flush the compressor after this many bytes; 0 means only at the end
+        self.compressionFlushBytes = 0
+        self.jsonReportPath = None
+        self.jsonReport = None
         
         self.timestamp = time.localtime()
         self.htmlReportPath = repoDir + '-analysis-%s.html' % time.strftime('%Y%m%d-%H%M%S', self.timestamp)
+        
+        # Options for sharded reports: Split by 'group' or 'category'
+        self.shardBy = None
+        self.shardReportDir = repoDir + '-analysis'
+        self.onlyShards = None
+        self.processes = None
+        self.shards = {}
+        
+        # Number of threads which read the POMs while they are parsed
+        self.readThreads = 4
 
     def run(self):
-        log.info('Analyzing %s...' % self.repoDir)
-        self.process(self.repoDir)
+        if self.jsonReportPath:
+            log.info('Writing JSON report to %s', self.jsonReportPath)
+            self.jsonReport = JsonReport(self.jsonReportPath)
         
-        log.info('Found %d POM files. Looking for problems...' % len(self.pomFiles))
-        self.checks()
+        try:
+            log.info('Analyzing %s...', self.repoDir)
+            self.timed('scan', self.scan).count(len(self.pomFiles))
+            
+            log.info('Found %d POM files. Looking for problems...', len(self.pomFiles))
+            self.timed('checks', self.checks).count(self.problemCount)
+            
+            log.info('Found %d problems. Generating report...', self.problemCount)
+            self.timed('report', self.report).count(self.problemCount)
+            self.saveMetrics()
+            
+            if self.jsonReport:
+                self.jsonReport.summary(self)
+        finally:
+            if self.jsonReport:
+                self.jsonReport.close()
+    
+    def saveMetrics(self):
+        instrumentation.metric('poms_scanned', len(self.pomFiles))
+        instrumentation.metric('problems', self.problemCount)
+        for kind, count in self.problemCountByKind.items():
+            instrumentation.metric('problems_by_kind', count, kind=kind)
+        for stats in self.checkStats:
+            instrumentation.metric('check_seconds', stats['seconds'], check=stats['name'])
+    
+    def timed(self, name, func, *args):
+        with phase(name) as timer:
+            func(*args)
         
-        log.info('Found %d problems. Generating report...' % len(self.problems))
-        self.report()
+        self.timings[name] = timer.seconds
+        return timer
     
     def checks(self):
-        self.checkDifferentVersions()
-        self.checkMissingDependencies()
+        '''Run all enabled checks and collect how long each one took'''
+        for check in self.enabledChecks():
+            for name in check.needs:
+                self.buildIndex(name)
+            
+            before = self.problemCount
+            start = time.time()
+            
+            check.func(self)
+            
+            stats = {
+                'name': check.name,
+                'seconds': time.time() - start,
+                'problems': self.problemCount - before,
+            }
+            self.checkStats.append(stats)
+            log.info('Check %(name)s found %(problems)d problems in %(seconds).3fs', stats)
+        
+        # The report needs this index
+        self.buildIndex('poms')
+    
+    def enabledChecks(self):
+        result = []
+        for check in CHECKS:
+            if self.enabled is None:
+                if not check.default:
+                    continue
+            elif check.name not in self.enabled:
+                continue
+            if check.name in self.disabled:
+                continue
+            
+            result.append(check)
+        
+        return result
+    
+    # name -> (method which builds the index, indexes which it needs)
+    INDEXES = {
+        'poms': ('indexPoms', ()),
+        'dependencies': ('indexDependencies', ()),
+        'graph': ('indexGraph', ('poms', 'dependencies')),
+    }
+    
+    def buildIndex(self, name):
+        '''Build an index unless it already exists'''
+        if name in self.indexes:
+            return
+        
+        method, needs = self.INDEXES[name]
+        for other in needs:
+            self.buildIndex(other)
+        
+        log.debug('Building index %s', name)
+        self.timed('index %s' % name, getattr(self, method))
+        self.indexes.add(name)
+    
+    def indexPoms(self):
+        '''POMs and versions by groupId:artifactId'''
+        for pom in self.pomFiles:
+            shortKey = pom.shortKey()
+            self.pomByKey[shortKey] = pom
+            self.pomsByShortKey.setdefault(shortKey, []).append(pom)
+            
+            version = pom.key()[len(shortKey)+1:]
+            self.artifactVersions.setdefault(shortKey, []).append(version)
+    
+    def indexDependencies(self):
+        '''Which POMs use a dependency and with which versions'''
+        for pom in self.pomFiles:
+            for d in pom.dependencies():
+                key = d.groupId + ":" + d.artifactId
+                dependencies = self.dependencies.setdefault(key, [])
+                dependencies.append( pom )
+                
+                if not d.version or d.version == '[0,)':
+                    self.dependenciesWithoutVersion.append( (pom, d) )
+                
+                versions = self.versions.setdefault(key, set())
+                versions.add( d.version )
+    
+                versionBackRefs = self.versionBackRefs.setdefault(key, {})
+                backRefs = versionBackRefs.setdefault(d.version, [])
+                backRefs.append( pom )
+    
+    def indexGraph(self):
+        '''The dependency graph of all POMs in the repository'''
+        graph = DependencyGraph()
+        
+        for pom in self.pomFiles:
+            graph.intern(pom.shortKey())
+        
+        for key, poms in self.dependencies.items():
+            for pom in poms:
+                graph.addEdge(pom.shortKey(), key)
+        
+        graph.freeze()
+        log.debug('Created %r', graph)
+        
+        self.graph = graph
+    
+    @check('same-key', ('poms',), 'POMs with the same groupId:artifactId but different versions')
+    def checkSameKey(self):
+        for poms in self.pomsByShortKey.values():
+            for index in range(1, len(poms)):
+                self.newProblem(ProblemSameKeyDifferentVersion(poms[index], poms[index-1]))
+    
+    @check('missing-version', ('dependencies',), 'Dependencies without a version or with the version [0,)')
+    def checkMissingVersions(self):
+        for pom, d in self.dependenciesWithoutVersion:
+            self.newProblem(ProblemWithDependency(pom, d))
     
+    @check('different-versions', ('poms', 'dependencies'), 'Dependencies which are referenced with different versions')
     def checkDifferentVersions(self):
         '''Check the different versions which are used to locate a dependency.'''
         for key, versionBackRefs in self.versionBackRefs.items():
@@ -216,87 +617,306 @@ class Analyzer(object):
                 
                 self.newProblem(ProblemDifferentVersions(pom, versionBackRefs))
     
+    @check('missing-dependencies', ('poms', 'dependencies'), "Dependencies which aren't in the repository")
     def checkMissingDependencies(self):
         for key, dependencies in self.dependencies.items():
             pom = self.pomByKey.get(key, None)
             if not pom:
                 self.newProblem(MissingDependency(key, dependencies))
     
-    def process(self, root):
+    @check('unsatisfied-ranges', ('poms', 'dependencies'), 'Version ranges which no artifact in the repository matches')
+    def checkUnsatisfiedRanges(self):
+        '''Check that every version range is satisfied by an artifact in this repository'''
+        for key, versionBackRefs in self.versionBackRefs.items():
+            available = self.artifactVersions.get(key, None)
+            if not available:
+                # Reported as missing dependency
+                continue
+            
+            available = list(set(available))
+            available.sort(key=versionKey)
+            sortedKeys = [versionKey(version) for version in available]
+            
+            versions = versionBackRefs.keys()
+            versions.sort(key=versionSpecKey)
+            
+            for version in versions:
+                if not isRange(version):
+                    continue
+                
+                range = parseRange(version)
+                if range is None or range.satisfiedBy(sortedKeys):
+                    continue
+                
+                backRefs = versionBackRefs[version]
+                backRefs.sort(key=lambda x: x.key())
+                
+                self.newProblem(ProblemUnsatisfiedRange(self.pomByKey[key], version, backRefs, available))
+    
+    @check('cycles', ('poms', 'graph'), 'Artifacts which depend on each other')
+    def checkDependencyCycles(self):
+        '''Check for artifacts which depend on each other'''
+        for cycle in self.graph.cycles():
+            self.newProblem(ProblemDependencyCycle(self.pomByKey[cycle[0]], cycle))
+    
+    @check('orphans', ('poms', 'graph'), 'Artifacts which no other artifact depends on', default=False)
+    def checkOrphanedArtifacts(self):
+        '''Check for artifacts which no other artifact depends on'''
+        graph = self.graph
+        
+        keys = self.pomByKey.keys()
+        keys.sort()
+        
+        for key in keys:
+            if not graph.dependentIds(graph.id(key)):
+                self.newProblem(ProblemOrphanedArtifact(self.pomByKey[key]))
+    
+    @check('path-mismatch', (), "POMs whose coordinates don't match their path in the repository")
+    def checkPathMismatches(self):
+        for pom in self.pomFiles:
+            if pom.mismatches:
+                self.newProblem(ProblemPathMismatch(pom))
+    
+    def scan(self):
+        loader = PomLoader(self.readThreads, cache=pomCache)
+        for pom in loader.loadMany(self.findPoms(self.repoDir), self.repoDir, verify=True):
+            self.analyzePOM(pom)
+    
+    def findPoms(self, root):
         for name in os.listdir(root):
             path = os.path.join(root, name)
             
             if os.path.isdir(path):
-                self.process(path)
+                for pomFile in self.findPoms(path):
+                    yield pomFile
             elif path.endswith('.pom'):
-                self.analyzePOM(path)
+                yield path
     
-    def analyzePOM(self, pomFile):
-        pom = Pom(pomFile)
+    def analyzePOM(self, pom):
         self.pomFiles.append( pom )
-        log.debug('Analyzing %s %s' % (pomFile, pom.key()))
-        
-        shortKey = pom.shortKey()
-        other = self.pomByKey.get(shortKey, None)
-        if other is not None:
-            self.newProblem(ProblemSameKeyDifferentVersion(pom, other))
-        self.pomByKey[shortKey] = pom
-        
-        for d in pom.dependencies():
-            key = d.groupId + ":" + d.artifactId
-            dependencies = self.dependencies.setdefault(key, [])
-            dependencies.append( pom )
-            
-            if not d.version or d.version == '[0,)':
-                self.newProblem(ProblemWithDependency(pom, d))
-            
-            versions = self.versions.setdefault(key, set())
-            versions.add( d.version )
-
-            versionBackRefs = self.versionBackRefs.setdefault(key, {})
-            backRefs = versionBackRefs.setdefault(d.version, [])
-            backRefs.append( pom )
+        log.debug('Analyzing %s %s', pom.pomFile, pom.key())
 
     def newProblem(self, problem):
-        self.problems.append(problem)
+        self.problemCount += 1
+        kind = problem.__class__.__name__
+        self.problemCountByKind[kind] = self.problemCountByKind.get(kind, 0) + 1
+        
+        if self.jsonReport:
+            self.jsonReport.problem(problem)
+        
+        if self.keepProblems:
+            self.problems.append(problem)
 
     def report(self):
         print "Found %d POM files" % len(self.pomFiles)
-        print "Found %d problems" % len(self.problems)
+        print "Found %d problems" % self.problemCount
         
         for p in self.problems:
             print p
         
-        self.htmlReport()
+        if not self.htmlReportEnabled:
+            return
+        
+        if self.shardBy:
+            self.shardedHtmlReport()
+        else:
+            self.htmlReport()
+    
+    def reportTitle(self):
+        ts = time.strftime('%Y.%m.%d %H:%M:%S', self.timestamp)
+        return 'Analysis of %s (%s)' % (self.repoDir, ts)
     
     def htmlReport(self):
-        log.info('Writing HTML report to %s' % self.htmlReportPath)
-        with open(self.htmlReportPath, 'w') as out:
+        out, path = openOutput(self.htmlReportPath, self.compression, self.compressionLevel, self.compressionFlushBytes)
+        log.info('Writing HTML report to %s', path)
+        with out:
             html = HtmlCanvas(out)
             
-            ts = time.strftime('%Y.%m.%d %H:%M:%S', self.timestamp)
-            title = 'Analysis of %s (%s)' % (self.repoDir, ts)
-            html.html().head().title().write( title )._title().write('\n')
-            
-            self.styles(html)
-            
-            html._head().write('\n').body().write('\n')
+            title = self.reportTitle()
+            self.renderHead(html, title)
             
             html.h1().write( title )._h1()
             
             html.p().write( "Found %d POM files" % len(self.pomFiles) )._p()
             html.p().write( "Found %d problems" % len(self.problems) )._p()
             
+            self.renderCheckStatsAsHtml(html)
+            
             self.renderProblemsAsHtml(html)
             
             self.renderRepoAsHtml(html)
             
-            html._body().write('\n')._html().write('\n')
+            self.renderFoot(html)
+
+    def renderHead(self, html, title):
+        html.html().head().title().write( title )._title().write('\n')
+        
+        reportStyles(html)
+        
+        html._head().write('\n').body().write('\n')
+    
+    def renderFoot(self, html):
+        html._body().write('\n')._html().write('\n')
+        html.close()
+    
+    def shardedHtmlReport(self):
+        '''Write an index page plus one page per groupId or problem category.
+        
+        The pages are rendered by a pool of worker processes. Pages
+        which didn't change are not written again.'''
+        self.shards = self.collectShards()
+        
+        keys = self.shards.keys()
+        keys.sort()
+        
+        todo = keys
+        if self.onlyShards:
+            for key in self.onlyShards:
+                if key not in self.shards:
+                    log.warning('There is no report page for %s', key)
+            
+            todo = [key for key in keys if key in self.onlyShards]
+        
+        if not os.path.exists(self.shardReportDir):
+            os.makedirs(self.shardReportDir)
+        
+        log.info('Writing %d of %d report pages to %s', len(todo), len(keys), self.shardReportDir)
+        
+        global _shardOwner
+        _shardOwner = self
+        try:
+            if self.processes == 1 or len(todo) < 2:
+                changed = map(_renderShard, todo)
+            else:
+                pool = multiprocessing.Pool(self.processes, configWorkerLogger)
+                try:
+                    changed = pool.map(_renderShard, todo)
+                finally:
+                    pool.close()
+                    pool.join()
+        finally:
+            _shardOwner = None
+        
+        log.info('%d report pages changed', changed.count(True))
+        
+        self.renderIndex(keys)
+    
+    def collectShards(self):
+        '''Distribute the problems and POMs over the pages of a sharded report'''
+        shards = {}
+        
+        def shard(key, title=None):
+            result = shards.get(key, None)
+            if result is None:
+                if title is None:
+                    title = key
+                
+                result = ReportShard(key, title, '%s.html' % key)
+                shards[key] = result
+            
+            return result
+        
+        if self.shardBy == 'group':
+            for p in self.problems:
+                shard(p.groupId()).problems.append(p)
+            
+            for shortKey in self.pomByKey:
+                shard(substringBefore(shortKey, ':')).pomShortKeys.append(shortKey)
+        elif self.shardBy == 'category':
+            for p in self.problems:
+                key = re.sub(r'[^a-z0-9]+', '-', p.htmlTitle.lower()).strip('-')
+                shard(key, p.htmlTitle).problems.append(p)
+            
+            shard('poms', 'POMs in the repository').pomShortKeys.extend(self.pomByKey.keys())
+        else:
+            raise RuntimeError('Unknown shard type %s' % self.shardBy)
+        
+        return shards
+    
+    def renderShard(self, shard):
+        '''Render one page of a sharded report.
+        
+        Returns True if the file on disk was changed.'''
+        buffer = StringIO.StringIO()
+        html = HtmlCanvas(buffer)
+        
+        # No timestamp here, so unchanged pages stay the same
+        self.renderHead(html, '%s - Analysis of %s' % (shard.title, self.repoDir))
+        
+        html.p().a(A().href('index.html')).write('Back to the index')._a()._p()
+        html.h1().write( shard.title )._h1()
+        html.p().write( "Found %d POM files" % len(shard.pomShortKeys) )._p()
+        html.p().write( "Found %d problems" % len(shard.problems) )._p()
+        
+        self.renderProblemsAsHtml(html, shard.problems, bool(shard.pomShortKeys))
+        
+        if shard.pomShortKeys:
+            self.renderRepoAsHtml(html, shard.pomShortKeys)
+        
+        self.renderFoot(html)
+        
+        path = os.path.join(self.shardReportDir, shard.fileName)
+        return writeIfChanged(path, buffer.getvalue())
+    
+    def renderIndex(self, keys):
+        path = os.path.join(self.shardReportDir, 'index.html')
+        log.info('Writing HTML report index to %s', path)
+        
+        with open(path, 'w') as out:
+            html = HtmlCanvas(out)
+            
+            title = self.reportTitle()
+            self.renderHead(html, title)
+            
+            html.h1().write( title )._h1()
+            
+            html.p().write( "Found %d POM files" % len(self.pomFiles) )._p()
+            html.p().write( "Found %d problems" % len(self.problems) )._p()
+            
+            self.renderCheckStatsAsHtml(html)
+            
+            html.h2().write( 'Report Pages' )._h2()
+            
+            html.table(A().border('0').cellspacing('0').cellpadding('0'))
+            html.tr().td().write('Page')._td() \
+            .td(A().class_('padLeft')).write('Problems')._td() \
+            .td(A().class_('padLeft')).write('POMs')._td()._tr()
+            
+            for key in keys:
+                shard = self.shards[key]
+                
+                html.tr().td().a(A().href(shard.fileName)).write(shard.title)._a()._td() \
+                .td(A().class_('padLeft')).write('%d' % len(shard.problems))._td() \
+                .td(A().class_('padLeft')).write('%d' % len(shard.pomShortKeys))._td() \
+                ._tr()
+            
+            html._table()
+            
+            self.renderFoot(html)
 
-    def renderRepoAsHtml(self, html):
+    def renderCheckStatsAsHtml(self, html):
+        html.h2().write( 'Checks' )._h2()
+        
+        html.table(A().border('0').cellspacing('0').cellpadding('0'))
+        html.tr().td().write('Check')._td() \
+        .td(A().class_('padLeft')).write('Problems')._td() \
+        .td(A().class_('padLeft')).write('Time')._td()._tr()
+        
+        for stats in self.checkStats:
+            html.tr().td().write(stats['name'])._td() \
+            .td(A().class_('padLeft')).write('%d' % stats['problems'])._td() \
+            .td(A().class_('padLeft')).write('%.3fs' % stats['seconds'])._td() \
+            ._tr()
+        
+        html._table()
+    
+    def renderRepoAsHtml(self, html, pomShortKeys=None):
         html.h2().a(A().name('poms')).write("POMs in the repository")._a()._h2()
         
-        pomShortKeys = list(self.pomByKey.keys())
+        if pomShortKeys is None:
+            pomShortKeys = self.pomByKey.keys()
+        
+        pomShortKeys = list(pomShortKeys)
         pomShortKeys.sort()
         
         html.table(A().border('0').cellspacing('0').cellpadding('0'))
@@ -325,11 +945,14 @@ class Analyzer(object):
 
         html._table()
 
-    def renderProblemsAsHtml(self, html):
+    def renderProblemsAsHtml(self, html, problems=None, withPoms=True):
+        
+        if problems is None:
+            problems = self.problems
         
         map = {}
         
-        for p in self.problems:
+        for p in problems:
             key = p.htmlTitle
             
             l = map.setdefault(key, [])
@@ -345,7 +968,8 @@ class Analyzer(object):
         for key in keys:
             html.li().a(A().href('#toc%d' % index)).write(key)._a()._li()
             index += 1
-        html.li().a(A().href('#poms')).write("POMs in the repository")._a()._li()
+        if withPoms:
+            html.li().a(A().href('#poms')).write("POMs in the repository")._a()._li()
         html._ul()
         
         index = 1
@@ -357,35 +981,95 @@ class Analyzer(object):
             
             for p in l:
                 p.renderOn(html)
-        
 
-    def styles(self, html):
-        html.style( A().type('text/css') ).write('\n')
-        
-        html.write( '.pom { font-weight: bold; color: #7F0055; font-family: monospace; }\n' )
-        html.write( '.dependency { font-weight: bold; color: #55007F; font-family: monospace; }\n' )
-        html.write( '.version { font-weight: bold; color: #007F55; font-family: monospace; }\n' )
-        html.write( '.files { font-style: italic; }\n' )
-        html.write( '.padLeft { padding-left: 10px; }\n' )
-        html.write( 'tr:hover { background-color: #DFDEF7; }\n' )
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--shard-by', choices=('group', 'category'),
+                      help='Split the HTML report into one page per groupId (group) or per kind of problem (category)')
+    parser.add_option('--only-shard', action='append', metavar='KEY',
+                      help='Only write the page for this groupId or category (and the index). Can be repeated.')
+    parser.add_option('--jobs', type='int', metavar='N',
+                      help='Number of processes to render the report pages (default: number of CPUs)')
+    parser.add_option('--json', metavar='FILE',
+                      help='Write the problems to FILE as they are found, one JSON object per line, followed by a summary')
+    parser.add_option('--no-html', action='store_false', dest='html', default=True,
+                      help="Don't write an HTML report. Together with --json, this keeps memory usage flat.")
+    parser.add_option('--compress', choices=compressionMethods(),
+                      help='Compress the HTML report while it is written: %s' % ', '.join(compressionMethods()))
+    parser.add_option('--compress-level', type='int', metavar='N',
+                      help='Compression level (default: 6 for gzip, 3 for zstd)')
+    parser.add_option('--compress-flush', type='int', default=0, metavar='BYTES',
+                      help='Flush the compressed report every BYTES bytes, so it can be read while it is written (default: only at the end)')
+    parser.add_option('--enable', metavar='CHECKS',
+                      help='Comma separated list of the checks to run (default: all which aren\'t optional)')
+    parser.add_option('--disable', metavar='CHECKS',
+                      help="Comma separated list of checks which shouldn't run")
+    parser.add_option('--list-checks', action='store_true',
+                      help='List all checks and exit')
+    addLogLevelOption(parser)
+    addProfileOption(parser)
+    return parser
+
+def checkNames(value):
+    '''Convert the argument of --enable or --disable into a set of check names'''
+    if value is None:
+        return None
+    
+    known = set([check.name for check in CHECKS])
+    
+    result = set()
+    for name in value.split(','):
+        name = name.strip()
+        if name not in known:
+            raise RuntimeError('Unknown check "%s". Use --list-checks to see all checks.' % name)
         
-        html._style().write('\n')
+        result.add(name)
+    
+    return result
 
 def main(name, argv):
+    parser = optionParser()
+    
     if userNeedsHelp(argv):
         print('%s %s' % (name, VERSION))
-        print('Usage: %s <m2repo>')
+        print('Usage: %s [options] <m2repo>')
         print('')
         print('Move the sources of Eclipse plugins to the right place')
         print('so Maven 2 can find them.')
+        print('')
+        print(parser.format_option_help())
         return
 
+    options, argv = parser.parse_args(argv)
+    
+    if options.compress and options.shard_by:
+        raise RuntimeError("--compress can't be used with --shard-by")
+    
+    if options.list_checks:
+        for check in CHECKS:
+            print('%-20s %s%s' % (check.name, check.description, '' if check.default else ' (optional)'))
+        return
+    
     repoDir = mustBeDirectory(argv[0])
 
-    configLogger(repoDir + "-analyze.log")
-    log.info('%s %s' % (name, VERSION))
+    configLogger(repoDir + "-analyze.log", level=options.log_level)
+    log.info('%s %s', name, VERSION)
+    
+    if options.profile:
+        instrumentation.startProfiling(repoDir + '-analyze.prof')
 
     tool = Analyzer(repoDir)
+    tool.shardBy = options.shard_by
+    tool.onlyShards = options.only_shard
+    tool.processes = options.jobs
+    tool.jsonReportPath = options.json
+    tool.htmlReportEnabled = options.html
+    tool.compression = options.compress
+    tool.compressionLevel = options.compress_level
+    tool.compressionFlushBytes = options.compress_flush
+    tool.keepProblems = options.html
+    tool.enabled = checkNames(options.enable)
+    tool.disabled = checkNames(options.disable) or set()
     tool.run()
     
     log.info('Done.')
@@ -394,5 +1078,5 @@ if __name__ == '__main__':
     try:
         main(sys.argv[0], sys.argv[1:])
     except Exception as e:
-        log.error('%s' % e)
+        log.error('%s', e)
         raise
@@ -22,21 +22,41 @@ import os
 import sys
 import time
 import logging
-from m4e.common import configLogger, mustBeDirectory, userNeedsHelp
+from optparse import OptionParser
+from m4e.common import addLogLevelOption, addProfileOption, instrumentation, phase, configLogger, mustBeDirectory, userNeedsHelp
 from m4e.patches import PatchLoader, PatchTool
 from m4e.pom import Pom
+from m4e.savequeue import SaveQueue, BACKUP_POLICIES
 
 VERSION = '0.9 (13.05.2011)'
 
 log = logging.getLogger('m4e.apply_patches')
 
 class ApplyPatches(object):
+    def __init__(self):
+        # Options for saving the patched POMs
+        self.backup = 'bak'
+        self.fsync = False
+        self.saveThreads = 2
+        
+        self.pomCount = 0
+        self.patchedCount = 0
     
     def run(self, patchDir, repoDir):
-        log.info('Applying patches from %s to M2 repository in %s' % (patchDir, repoDir))
+        log.info('Applying patches from %s to M2 repository in %s', patchDir, repoDir)
+        
+        with phase('load patches'):
+            self.loadPatches(patchDir)
+        
+        self.saveQueue = SaveQueue(repoDir, self.saveThreads, self.backup, self.fsync)
+        try:
+            self.process(repoDir)
+        finally:
+            with phase('save'):
+                self.saveQueue.close()
         
-        self.loadPatches(patchDir)
-        self.process(repoDir)
+        instrumentation.metric('poms_scanned', self.pomCount)
+        instrumentation.metric('poms_patched', self.patchedCount)
         
         log.info('Done.')
     
@@ -57,40 +77,76 @@ class ApplyPatches(object):
                 self.applyPatches(path)
 
     def applyPatches(self, pomFile):
-        pom = Pom(pomFile)
+        self.pomCount += 1
         
-        before = repr(pom)
-        self.patchTool.apply(pom)
-        after = repr(pom)
+        with phase('parse') as parsing:
+            pom = Pom(pomFile)
+            parsing.count()
+        
+        with phase('patch') as patching:
+            before = repr(pom)
+            self.patchTool.apply(pom)
+            after = repr(pom)
+            patching.count()
         
         if before == after:
-            log.debug('No changes in %s' % pomFile)
+            log.debug('No changes in %s', pomFile)
             return
         
-        log.info('Patching %s' % pomFile)
-        pom.save()
+        log.info('Patching %s', pomFile)
+        self.patchedCount += 1
+        with phase('save') as saving:
+            self.saveQueue.save(pom)
+            saving.count()
+
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--backup', type='choice', choices=BACKUP_POLICIES, default='bak',
+                      help='What to do with the original POMs: none, bak (rename to *.bak) or archive (one .tar.gz next to the repository). Default: bak')
+    parser.add_option('--fsync', action='store_true',
+                      help='Flush all changed files to disk at the end')
+    parser.add_option('--save-threads', type='int', default=2, metavar='N',
+                      help='Number of threads which save the patched POMs; 0 saves them in the main thread (default: 2)')
+    addLogLevelOption(parser)
+    addProfileOption(parser)
+    return parser
 
 def main(name, argv):
+    parser = optionParser()
+    
     if userNeedsHelp(argv):
         print('%s %s' % (name, VERSION))
-        print('Usage: %s <directory-with-patches> <m2repo>')
+        print('Usage: %s [options] <directory-with-patches> <m2repo>')
         print('')
         print('Apply the patches in <directory-with-patches> to the')
         print('Maven 2 Repository located at <m2repo>')
+        print('')
+        print(parser.format_option_help())
         return
+    
+    options, argv = parser.parse_args(argv)
+    
+    if options.save_threads < 0:
+        raise RuntimeError('--save-threads must not be negative')
 
     patchDir = mustBeDirectory(argv[0])
     repoDir = mustBeDirectory(argv[1])
 
-    configLogger(repoDir + ".log")
-    log.info('%s %s' % (name, VERSION))
+    configLogger(repoDir + ".log", level=options.log_level)
+    log.info('%s %s', name, VERSION)
+    
+    if options.profile:
+        instrumentation.startProfiling(repoDir + '.prof')
 
     tool = ApplyPatches()
+    tool.backup = options.backup
+    tool.fsync = options.fsync
+    tool.saveThreads = options.save_threads
     tool.run(patchDir, repoDir)
 
 if __name__ == '__main__':
     try:
         main(sys.argv[0], sys.argv[1:])
     except Exception as e:
-        log.error('%s' % e)
+        log.error('%s', e)
         raise
@@ -26,7 +26,8 @@ import os
 import sys
 import time
 import logging
-from m4e.common import configLogger, userNeedsHelp
+from optparse import OptionParser
+from m4e.common import addLogLevelOption, addProfileOption, configLogger, instrumentation, phase, userNeedsHelp
 
 VERSION = '1.2 (13.05.2011)'
 
@@ -37,9 +38,12 @@ class AttachSources(object):
         self.count = 0
         
     def run(self, root):
-        log.info('Attaching sources in %s' % root)
-        self.process(root)
-        log.info('Found %d source JARs' % self.count)
+        log.info('Attaching sources in %s', root)
+        with phase('attach') as attaching:
+            self.process(root)
+            attaching.count(self.count)
+        log.info('Found %d source JARs', self.count)
+        instrumentation.metric('source_jars_attached', self.count)
 
     def process(self, root):
         for name in os.listdir(root):
@@ -55,7 +59,7 @@ class AttachSources(object):
         binPath = srcPath[:-7] 
         
         if not os.path.exists(binPath):
-            log.warning('Missing %s' % binPath)
+            log.warning('Missing %s', binPath)
             return
         
         versions = os.listdir(srcPath)
@@ -73,7 +77,7 @@ class AttachSources(object):
         binPath = os.path.join(binPath, version)
         
         if not os.path.exists(binPath):
-            log.warning('Missing %s' % binPath)
+            log.warning('Missing %s', binPath)
             return
         
         sources = os.listdir(srcPath)
@@ -81,7 +85,7 @@ class AttachSources(object):
         for name in sources:
             if name.endswith('.pom'):
                 pom = os.path.join(srcPath, name)
-                log.debug('Deleting source POM %s' % pom)
+                log.debug('Deleting source POM %s', pom)
                 os.remove(pom)
                 continue
             
@@ -89,11 +93,11 @@ class AttachSources(object):
                 self.moveSource(srcPath, binPath, name)
                 continue
             
-            log.warning('Unexpected file %s' % os.path.join(srcPath, name))
+            log.warning('Unexpected file %s', os.path.join(srcPath, name))
             canDelete = False
         
         if canDelete:
-            log.debug('%s is empty -> deleting' % srcPath)
+            log.debug('%s is empty -> deleting', srcPath)
             os.rmdir(srcPath)
         
         return canDelete
@@ -120,19 +124,31 @@ class AttachSources(object):
         
         src = os.path.join(srcPath, name)
         target = os.path.join(binPath, target)
-        log.debug('Moving %s to %s' % (src, target))
+        log.debug('Moving %s to %s', src, target)
         os.rename(src, target)
         
         self.count += 1
 
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    addLogLevelOption(parser)
+    addProfileOption(parser)
+    return parser
+
 def main(name, argv):
+    parser = optionParser()
+    
     if userNeedsHelp(argv):
         print('%s %s' % (name, VERSION))
-        print('Usage: %s <m2repo>')
+        print('Usage: %s [options] <m2repo>')
         print('')
         print('Move the sources of Eclipse plugins to the right place')
         print('so Maven 2 can find them.')
+        print('')
+        print(parser.format_option_help())
         return
+    
+    options, argv = parser.parse_args(argv)
 
     root = argv[0]
     if not os.path.exists(root):
@@ -141,8 +157,11 @@ def main(name, argv):
     if not os.path.isdir(root):
         raise RuntimeError('%s is not a directory' % root)
 
-    configLogger(root + ".log")
-    log.info('%s %s' % (name, VERSION))
+    configLogger(root + ".log", level=options.log_level)
+    log.info('%s %s', name, VERSION)
+    
+    if options.profile:
+        instrumentation.startProfiling(root + '.prof')
 
     tool = AttachSources()
     tool.run(root)
@@ -151,5 +170,5 @@ if __name__ == '__main__':
     try:
         main(sys.argv[0], sys.argv[1:])
     except Exception as e:
-        log.error('%s' % e)
+        log.error('%s', e)
         raise
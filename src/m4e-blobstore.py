@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+"""Tool to share the JARs of several Maven 2 repositories in a content addressed store.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+"""
+import os
+import sys
+import logging
+from optparse import OptionParser
+from m4e.common import addLogLevelOption, addProfileOption, configLogger, instrumentation, mustBeDirectory, phase, userNeedsHelp
+from m4e.blobstore import BlobStore, Deduplicator
+
+VERSION = '0.1 (19.10.2026)'
+
+log = logging.getLogger('m4e.blobstore')
+
+def dedupe(store, repoDirs, options):
+    repoDirs = [mustBeDirectory(repoDir) for repoDir in repoDirs]
+    if not repoDirs:
+        raise RuntimeError('Missing repositories')
+    
+    tool = Deduplicator(store)
+    tool.processes = options.jobs
+    
+    with phase('dedupe') as deduping:
+        tool.run(repoDirs)
+        deduping.count(tool.hashedCount)
+    
+    instrumentation.metric('files', tool.fileCount)
+    instrumentation.metric('files_hashed', tool.hashedCount)
+    instrumentation.metric('files_linked', tool.linkedCount)
+    instrumentation.metric('bytes_reclaimed', tool.reclaimedBytes)
+
+def verify(store, repoDirs, options):
+    mustBeDirectory(store.root)
+    
+    with phase('verify') as verifying:
+        blobCount, corrupt = store.verify(options.jobs)
+        verifying.count(blobCount)
+    
+    instrumentation.metric('blobs', blobCount)
+    instrumentation.metric('blobs_corrupt', len(corrupt))
+    
+    if corrupt:
+        raise RuntimeError('%d blobs in %s are corrupt' % (len(corrupt), store.root))
+
+COMMANDS = {
+    'dedupe': dedupe,
+    'verify': verify,
+}
+
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--jobs', type='int', metavar='N',
+                      help='Number of processes which hash the files (default: number of CPUs)')
+    addLogLevelOption(parser)
+    addProfileOption(parser)
+    return parser
+
+def main(name, argv):
+    parser = optionParser()
+    
+    if userNeedsHelp(argv):
+        print('%s %s' % (name, VERSION))
+        print('Usage: %s [options] dedupe <store> <m2repos...>')
+        print('       %s [options] verify <store>')
+        print('')
+        print('dedupe moves the JARs of the repositories into the store and')
+        print('replaces them with hard links. verify checks the checksums of')
+        print('all files in the store.')
+        print('')
+        print(parser.format_option_help())
+        return
+    
+    options, argv = parser.parse_args(argv)
+    
+    if len(argv) < 2 or argv[0] not in COMMANDS:
+        raise RuntimeError('Expected dedupe or verify and the path to the store')
+    
+    command, root = argv[0], os.path.abspath(argv[1])
+    
+    configLogger(root + ".log", level=options.log_level)
+    log.info('%s %s', name, VERSION)
+    
+    if options.profile:
+        instrumentation.startProfiling(root + '.prof')
+    
+    COMMANDS[command](BlobStore(root), argv[2:], options)
+    
+    log.info('Done.')
+
+if __name__ == '__main__':
+    try:
+        main(sys.argv[0], sys.argv[1:])
+    except Exception as e:
+        log.error('%s', e)
+        raise
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+"""Tool to create the *.md5 and *.sha1 files which Nexus needs.
+
+The files are hashed in parallel. The checksums are cached next to the
+repository; files which didn't change since the last run (same inode,
+mtime and size) aren't read again.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+"""
+import sys
+import logging
+import itertools
+import multiprocessing
+from optparse import OptionParser
+from m4e.common import addLogLevelOption, addProfileOption, configLogger, instrumentation, mustBeDirectory, phase, userNeedsHelp, writeIfChanged
+from m4e.checksums import ALGORITHMS, findFiles, hashFile, loadCache, statKey
+
+VERSION = '0.1 (19.10.2026)'
+
+log = logging.getLogger('m4e.checksums')
+
+class ChecksumTool(object):
+    def __init__(self, repoDir, cacheFile):
+        self.repoDir = repoDir
+        self.cacheFile = cacheFile
+        
+        # Number of processes which hash the files (default: number of CPUs)
+        self.processes = None
+        # Ignore the cache and hash all files
+        self.rebuild = False
+        
+        self.fileCount = 0
+        self.hashedCount = 0
+        self.hashedBytes = 0
+        self.writtenCount = 0
+    
+    def run(self):
+        log.info('Creating checksums for %s', self.repoDir)
+        
+        self.cache = loadCache(self.cacheFile)
+        if self.rebuild:
+            self.cache.entries = {}
+        
+        with phase('scan') as scanning:
+            todo = self.scan()
+            scanning.count(self.fileCount)
+        
+        log.info('Found %d files; %d need to be hashed', self.fileCount, len(todo))
+        
+        with phase('hash') as hashing:
+            self.hash(todo)
+            hashing.count(self.hashedCount)
+        
+        self.cache.prune()
+        self.cache.save(self.cacheFile)
+        
+        log.info('Hashed %d files (%d bytes), wrote %d checksum files', self.hashedCount, self.hashedBytes, self.writtenCount)
+        
+        instrumentation.metric('files', self.fileCount)
+        instrumentation.metric('files_hashed', self.hashedCount)
+        instrumentation.metric('bytes_hashed', self.hashedBytes)
+        instrumentation.metric('checksum_files_written', self.writtenCount)
+    
+    def scan(self):
+        '''Write the checksums of all files which are in the cache.
+        
+        Returns the files which have to be hashed as a dict
+        statKey -> [paths]; paths with the same key are hard links.'''
+        todo = {}
+        for path, st in findFiles(self.repoDir):
+            self.fileCount += 1
+            
+            key = statKey(st)
+            digests = self.cache.get(key)
+            if digests is None:
+                todo.setdefault(key, []).append(path)
+            else:
+                self.writeChecksums(path, digests)
+        
+        return todo
+    
+    def hash(self, todo):
+        '''Hash each file once and write the checksums for all its paths'''
+        tasks = [(key, paths[0]) for key, paths in todo.iteritems()]
+        
+        if self.processes == 1 or len(tasks) < 2:
+            self.saveResults(itertools.imap(hashFile, tasks), todo)
+            return
+        
+        pool = multiprocessing.Pool(self.processes)
+        try:
+            self.saveResults(pool.imap_unordered(hashFile, tasks, 16), todo)
+        finally:
+            pool.close()
+            pool.join()
+    
+    def saveResults(self, results, todo):
+        for key, path, digests in results:
+            log.debug('Hashed %s', path)
+            
+            self.cache.put(key, digests)
+            self.hashedCount += 1
+            self.hashedBytes += key[-1]
+            
+            for path in todo[key]:
+                self.writeChecksums(path, digests)
+    
+    def writeChecksums(self, path, digests):
+        for algorithm, digest in zip(ALGORITHMS, digests):
+            if writeIfChanged('%s.%s' % (path, algorithm), digest):
+                self.writtenCount += 1
+
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--jobs', type='int', metavar='N',
+                      help='Number of processes which hash the files (default: number of CPUs)')
+    parser.add_option('--cache', metavar='FILE',
+                      help='Where to save the checksums of the files (default: <m2repo>-checksums.pickle)')
+    parser.add_option('--rebuild', action='store_true',
+                      help='Hash all files even if they are in the cache')
+    addLogLevelOption(parser)
+    addProfileOption(parser)
+    return parser
+
+def main(name, argv):
+    parser = optionParser()
+    
+    if userNeedsHelp(argv):
+        print('%s %s' % (name, VERSION))
+        print('Usage: %s [options] <m2repo>')
+        print('')
+        print('Create %s files for all files in a Maven 2 repository.' % ' and '.join(['*.%s' % a for a in ALGORITHMS]))
+        print('')
+        print(parser.format_option_help())
+        return
+    
+    options, argv = parser.parse_args(argv)
+    
+    repoDir = mustBeDirectory(argv[0])
+    
+    configLogger(repoDir + "-checksums.log", level=options.log_level)
+    log.info('%s %s', name, VERSION)
+    
+    if options.profile:
+        instrumentation.startProfiling(repoDir + '-checksums.prof')
+    
+    tool = ChecksumTool(repoDir, options.cache or repoDir + '-checksums.pickle')
+    tool.processes = options.jobs
+    tool.rebuild = options.rebuild
+    tool.run()
+    
+    log.info('Done.')
+
+if __name__ == '__main__':
+    try:
+        main(sys.argv[0], sys.argv[1:])
+    except Exception as e:
+        log.error('%s', e)
+        raise
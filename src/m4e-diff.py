@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+"""Tool to compare two Maven 2 Repositories.
+
+Lists the artifacts which were added, removed or which changed their
+version plus the dependencies which were added, removed or changed.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+"""
+import os
+import sys
+import json
+import time
+import logging
+from optparse import OptionParser
+from m4e.common import addLogLevelOption, addProfileOption, instrumentation, phase, configLogger, mustBeDirectory, userNeedsHelp
+from m4e.pom import PomLoader
+from m4e.pomcache import pomCache
+from m4e.version import versionKey, versionSpecKey
+from m4e.rendersnake import *
+
+VERSION = '0.1 (19.10.2026)'
+
+log = logging.getLogger('m4e.diff')
+
+class RepoSummary(object):
+    '''The coordinates and dependencies of all POMs in a repository'''
+    def __init__(self, repoDir):
+        self.repoDir = repoDir
+        
+        # groupId:artifactId -> set of versions
+        self.versions = {}
+        # (groupId:artifactId, groupId:artifactId of dependency) -> set of versions
+        self.dependencies = {}
+        self.pomCount = 0
+        
+        self.loader = PomLoader(cache=pomCache)
+    
+    def run(self):
+        log.info('Reading %s...', self.repoDir)
+        with phase('scan') as scanning:
+            self.process(self.repoDir)
+            scanning.count(self.pomCount)
+        log.info('Found %d POMs, %d artifacts and %d dependencies', self.pomCount, len(self.versions), len(self.dependencies))
+    
+    def process(self, root):
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            
+            if os.path.isdir(path):
+                self.process(path)
+            elif path.endswith('.pom'):
+                self.addPom(path)
+    
+    def addPom(self, path):
+        log.debug('Reading %s', path)
+        pom = self.loader.load(path)
+        self.pomCount += 1
+        
+        # Intern the keys; they show up over and over again
+        shortKey = intern(pom.shortKey())
+        version = pom.key()[len(shortKey)+1:]
+        self.versions.setdefault(shortKey, set()).add(version)
+        
+        for d in pom.dependencies():
+            key = (shortKey, intern('%s:%s' % (d.groupId, d.artifactId)))
+            self.dependencies.setdefault(key, set()).add(d.version)
+
+def sortedVersions(versions, key=versionKey):
+    result = list(versions)
+    result.sort(key=key)
+    return result
+
+def diffMaps(old, new, sortKey):
+    '''Compare two maps key -> set of versions.
+    
+    Returns three sorted lists: added [(key, versions)],
+    removed [(key, versions)] and changed [(key, oldVersions, newVersions)]'''
+    added = []
+    removed = []
+    changed = []
+    
+    for key, versions in new.iteritems():
+        oldVersions = old.get(key, None)
+        if oldVersions is None:
+            added.append((key, sortedVersions(versions, sortKey)))
+        elif oldVersions != versions:
+            changed.append((key, sortedVersions(oldVersions, sortKey), sortedVersions(versions, sortKey)))
+    
+    for key, versions in old.iteritems():
+        if key not in new:
+            removed.append((key, sortedVersions(versions, sortKey)))
+    
+    added.sort()
+    removed.sort()
+    changed.sort()
+    
+    return added, removed, changed
+
+class RepoDiff(object):
+    '''Compare two repositories'''
+    def __init__(self, oldRepoDir, newRepoDir):
+        self.old = RepoSummary(oldRepoDir)
+        self.new = RepoSummary(newRepoDir)
+        
+        self.timestamp = time.localtime()
+        self.htmlReportPath = newRepoDir + '-diff-%s.html' % time.strftime('%Y%m%d-%H%M%S', self.timestamp)
+        self.jsonReportPath = None
+    
+    def run(self):
+        self.old.run()
+        self.new.run()
+        
+        with phase('compare') as comparing:
+            self.addedArtifacts, self.removedArtifacts, self.changedArtifacts = \
+                diffMaps(self.old.versions, self.new.versions, versionKey)
+            self.addedDependencies, self.removedDependencies, self.changedDependencies = \
+                diffMaps(self.old.dependencies, self.new.dependencies, versionSpecKey)
+            comparing.count(len(self.new.versions) + len(self.new.dependencies))
+        
+        log.info('Artifacts: %d added, %d removed, %d changed',
+            len(self.addedArtifacts), len(self.removedArtifacts), len(self.changedArtifacts))
+        log.info('Dependencies: %d added, %d removed, %d changed',
+            len(self.addedDependencies), len(self.removedDependencies), len(self.changedDependencies))
+        self.saveMetrics()
+        
+        with phase('report'):
+            if self.htmlReportPath:
+                self.htmlReport()
+            if self.jsonReportPath:
+                self.jsonReport()
+    
+    def saveMetrics(self):
+        instrumentation.metric('poms_scanned', self.old.pomCount + self.new.pomCount)
+        for change, l in (('added', self.addedArtifacts), ('removed', self.removedArtifacts), ('changed', self.changedArtifacts)):
+            instrumentation.metric('artifacts', len(l), change=change)
+        for change, l in (('added', self.addedDependencies), ('removed', self.removedDependencies), ('changed', self.changedDependencies)):
+            instrumentation.metric('dependencies', len(l), change=change)
+    
+    def jsonReport(self):
+        log.info('Writing JSON report to %s', self.jsonReportPath)
+        
+        def artifacts(l):
+            return [{ 'artifact': key, 'versions': versions } for key, versions in l]
+        
+        def dependencies(l):
+            return [{ 'artifact': key[0], 'dependency': key[1], 'versions': versions } for key, versions in l]
+        
+        report = {
+            'old': self.old.repoDir,
+            'new': self.new.repoDir,
+            'artifacts': {
+                'added': artifacts(self.addedArtifacts),
+                'removed': artifacts(self.removedArtifacts),
+                'changed': [{ 'artifact': key, 'oldVersions': old, 'newVersions': new }
+                            for key, old, new in self.changedArtifacts],
+            },
+            'dependencies': {
+                'added': dependencies(self.addedDependencies),
+                'removed': dependencies(self.removedDependencies),
+                'changed': [{ 'artifact': key[0], 'dependency': key[1], 'oldVersions': old, 'newVersions': new }
+                            for key, old, new in self.changedDependencies],
+            },
+        }
+        
+        with open(self.jsonReportPath, 'w') as out:
+            json.dump(report, out, sort_keys=True, indent=1)
+            out.write('\n')
+    
+    def htmlReport(self):
+        log.info('Writing HTML report to %s', self.htmlReportPath)
+        with open(self.htmlReportPath, 'w') as out:
+            html = HtmlCanvas(out)
+            
+            ts = time.strftime('%Y.%m.%d %H:%M:%S', self.timestamp)
+            title = 'Differences between %s and %s (%s)' % (self.old.repoDir, self.new.repoDir, ts)
+            html.html().head().title().write( title )._title().write('\n')
+            
+            reportStyles(html)
+            
+            html._head().write('\n').body().write('\n')
+            
+            html.h1().write( title )._h1()
+            
+            sections = (
+                ('Added artifacts', self.addedArtifacts, self.renderArtifact),
+                ('Removed artifacts', self.removedArtifacts, self.renderArtifact),
+                ('Artifacts with different versions', self.changedArtifacts, self.renderArtifact),
+                ('Added dependencies', self.addedDependencies, self.renderDependency),
+                ('Removed dependencies', self.removedDependencies, self.renderDependency),
+                ('Dependencies with different versions', self.changedDependencies, self.renderDependency),
+            )
+            
+            html.h2().write( 'Table of Contents' )._h2()
+            
+            html.ul()
+            index = 1
+            for title, items, renderer in sections:
+                html.li().a(A().href('#toc%d' % index)).write('%s (%d)' % (title, len(items)))._a()._li()
+                index += 1
+            html._ul()
+            
+            index = 1
+            for title, items, renderer in sections:
+                html.h2().a(A().name('toc%d' % index)).write(title)._a()._h2()
+                index += 1
+                
+                html.table(A().border('0').cellspacing('0').cellpadding('0'))
+                for item in items:
+                    html.tr()
+                    renderer(html, item[0])
+                    
+                    for versions in item[1:]:
+                        html.td(A().class_('padLeft'))
+                        self.renderVersions(html, versions)
+                        html._td()
+                    
+                    html._tr()
+                html._table()
+            
+            html._body().write('\n')._html().write('\n')
+            html.close()
+    
+    def renderArtifact(self, html, key):
+        html.td().span(A().class_('pom')).write(key)._span()._td()
+    
+    def renderDependency(self, html, key):
+        html.td().span(A().class_('pom')).write(key[0])._span()._td() \
+        .td(A().class_('padLeft')).span(A().class_('dependency')).write(key[1])._span()._td()
+    
+    def renderVersions(self, html, versions):
+        for index, version in enumerate(versions):
+            if index:
+                html.write(', ')
+            html.span(A().class_('version')).write('%s' % version)._span()
+
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--json', metavar='FILE',
+                      help='Also write the differences to FILE as JSON')
+    parser.add_option('--no-html', action='store_false', dest='html', default=True,
+                      help="Don't write an HTML report")
+    addLogLevelOption(parser)
+    addProfileOption(parser)
+    return parser
+
+def main(name, argv):
+    parser = optionParser()
+    
+    if userNeedsHelp(argv):
+        print('%s %s' % (name, VERSION))
+        print('Usage: %s [options] <old-m2repo> <new-m2repo>')
+        print('')
+        print('Compare two Maven 2 repositories and list the artifacts')
+        print('and dependencies which were added, removed or changed.')
+        print('')
+        print(parser.format_option_help())
+        return
+    
+    options, argv = parser.parse_args(argv)
+    if len(argv) != 2:
+        raise RuntimeError('Expected two repositories but got %d arguments: %s' % (len(argv), argv))
+    
+    oldRepoDir = mustBeDirectory(argv[0])
+    newRepoDir = mustBeDirectory(argv[1])
+    
+    configLogger(newRepoDir + "-diff.log", level=options.log_level)
+    log.info('%s %s', name, VERSION)
+    
+    if options.profile:
+        instrumentation.startProfiling(newRepoDir + '-diff.prof')
+    
+    tool = RepoDiff(oldRepoDir, newRepoDir)
+    tool.jsonReportPath = options.json
+    if not options.html:
+        tool.htmlReportPath = None
+    tool.run()
+    
+    log.info('Done.')
+
+if __name__ == '__main__':
+    try:
+        main(sys.argv[0], sys.argv[1:])
+    except Exception as e:
+        log.error('%s', e)
+        raise
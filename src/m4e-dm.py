@@ -22,28 +22,197 @@ import os
 import sys
 import time
 import logging
-from m4e.common import configLogger, mustBeDirectory, userNeedsHelp
-from m4e.pom import Pom, createPom, getOrCreate, setOptionalText, POM_NS_PREFIX
+import StringIO
+import multiprocessing
+from optparse import OptionParser
+from m4e.common import addLogLevelOption, addProfileOption, instrumentation, phase, configLogger, configWorkerLogger, mustBeDirectory, userNeedsHelp, writeIfChanged
+from m4e.pom import Pom, PomLoader, pomPath, POM_NS, POM_NS_PREFIX
+from m4e.pomcache import pomCache
+from m4e.version import versionKey
 from lxml import etree
 
-VERSION = '0.1 (12.05.2011)'
+VERSION = '0.2 (19.10.2026)'
 
 log = logging.getLogger('m4e.dm')
 
+XSI_NS = 'http://www.w3.org/2001/XMLSchema-instance'
+NSMAP = { None: POM_NS, 'xsi': XSI_NS }
+PROJECT_ATTRIBUTES = {
+    '{%s}schemaLocation' % XSI_NS: 'http://maven.apache.org/POM/4.0.0 http://maven.apache.org/xsd/maven-4.0.0.xsd',
+}
+
+PROJECT = POM_NS_PREFIX + 'project'
+DEPENDENCY_MANAGEMENT = POM_NS_PREFIX + 'dependencyManagement'
+DEPENDENCIES = POM_NS_PREFIX + 'dependencies'
+DEPENDENCY = POM_NS_PREFIX + 'dependency'
+
+# Indentation for each level of the POM
+INDENT = ['\n' + '  ' * level for level in range(6)]
+
+def writeTextElement(xf, level, name, value):
+    xf.write(INDENT[level])
+    with xf.element(POM_NS_PREFIX + name):
+        xf.write(value)
+
+def coordinatesKey(coordinates):
+    '''Sort key for (groupId, artifactId, version)'''
+    return (coordinates[0], coordinates[1], versionKey(coordinates[2]))
+
+def writeBom(fh, artifact, dependencies):
+    '''Write a POM with a dependencyManagement element to the open file fh.
+    
+    artifact is (groupId, artifactId, version) of the new POM.
+    
+    dependencies is a sorted list of (groupId, artifactId, version)
+    tuples, optionally followed by (name, value) pairs for more
+    elements like type or scope.
+    
+    The POM is written element by element, so no XML tree is built
+    in memory.'''
+    with etree.xmlfile(fh, encoding='UTF-8') as xf:
+        with xf.element(PROJECT, PROJECT_ATTRIBUTES, nsmap=NSMAP):
+            writeTextElement(xf, 1, 'modelVersion', '4.0.0')
+            writeTextElement(xf, 1, 'groupId', artifact[0])
+            writeTextElement(xf, 1, 'artifactId', artifact[1])
+            writeTextElement(xf, 1, 'version', artifact[2])
+            
+            xf.write(INDENT[1])
+            with xf.element(DEPENDENCY_MANAGEMENT):
+                xf.write(INDENT[2])
+                with xf.element(DEPENDENCIES):
+                    for dependency in dependencies:
+                        xf.write(INDENT[3])
+                        with xf.element(DEPENDENCY):
+                            writeTextElement(xf, 4, 'groupId', dependency[0])
+                            writeTextElement(xf, 4, 'artifactId', dependency[1])
+                            writeTextElement(xf, 4, 'version', dependency[2])
+                            
+                            for name, value in dependency[3:]:
+                                writeTextElement(xf, 4, name, value)
+                            
+                            xf.write(INDENT[3])
+                    
+                    xf.write(INDENT[2])
+                
+                xf.write(INDENT[1])
+            
+            xf.write(INDENT[0])
+    
+    fh.write('\n')
+
+def writeBomIfChanged(task):
+    '''Write a POM with a dependencyManagement element unless the file
+    already has the same content. The old file is kept as .bak.
+    
+    task is (path, artifact, dependencies); see writeBom().
+    
+    Returns True if the file was written.'''
+    path, artifact, dependencies = task
+    
+    buffer = StringIO.StringIO()
+    writeBom(buffer, artifact, dependencies)
+    
+    dir = os.path.dirname(path)
+    if not os.path.exists(dir):
+        os.makedirs(dir)
+    
+    return writeIfChanged(path, buffer.getvalue(), backup=True)
+
+def topLevelGroupId(groupId, depth):
+    '''The first depth parts of a groupId, for example org.eclipse.core
+    for org.eclipse.core.runtime and depth 3'''
+    return '.'.join(groupId.split('.')[:depth])
+
 class DependencyManagementTool(object):
     def __init__(self, repoDir, artifact):
         self.repoDir = repoDir
         self.groupId, self.artifactId, self.version = artifact.split(':')
+        self.pomFile = pomPath(self.repoDir, self.groupId, self.artifactId, self.version)
+        self.dependencies = []
+        
+        # Create one POM per top-level groupId plus one which imports them all
+        self.split = False
+        # Number of parts of the groupId which make it top-level
+        self.splitDepth = 3
+        self.processes = None
+        
+        # Parse the POMs to check that their coordinates match the path
+        self.verify = False
+        
+        # Number of POMs which were written
+        self.writtenCount = 0
+        
+        self.loader = PomLoader(cache=pomCache)
     
     def run(self):
-        self.pom = createPom(self.repoDir, self.groupId, self.artifactId, self.version)
+        with phase('scan') as scanning:
+            self.process(self.repoDir)
+            self.dependencies = self.withoutGenerated(self.dependencies)
+            scanning.count(len(self.dependencies))
         
-        dependencyManagement = getOrCreate(self.pom.project, 'dependencyManagement')
-        self.dependencies = getOrCreate(dependencyManagement, 'dependencies')
+        with phase('sort') as sorting:
+            self.dependencies.sort(key=coordinatesKey)
+            sorting.count(len(self.dependencies))
         
-        self.process(self.repoDir)
+        with phase('save') as saving:
+            if self.split:
+                self.saveSplit()
+            else:
+                self.save()
+            saving.count(len(self.dependencies))
         
-        self.pom.save()
+        instrumentation.metric('poms_scanned', len(self.dependencies))
+        instrumentation.metric('poms_written', self.writtenCount)
+    
+    def save(self):
+        log.info('Writing %d dependencies to %s', len(self.dependencies), self.pomFile)
+        
+        if writeBomIfChanged((self.pomFile, (self.groupId, self.artifactId, self.version), self.dependencies)):
+            self.writtenCount = 1
+        else:
+            log.info('%s is unchanged', self.pomFile)
+    
+    def saveSplit(self):
+        '''Write one POM per top-level groupId in parallel plus a POM which
+        imports them all.
+        
+        Files are only written when their content changes.'''
+        groups = {}
+        for dependency in self.dependencies:
+            groups.setdefault(topLevelGroupId(dependency[0], self.splitDepth), []).append(dependency)
+        
+        groupIds = groups.keys()
+        groupIds.sort()
+        
+        tasks = []
+        imports = []
+        for groupId in groupIds:
+            artifact = (self.groupId, '%s-%s' % (self.artifactId, groupId), self.version)
+            path = pomPath(self.repoDir, *artifact)
+            
+            tasks.append((path, artifact, groups[groupId]))
+            imports.append(artifact + (('type', 'pom'), ('scope', 'import')))
+        
+        log.info('Writing %d POMs for %d dependencies', len(tasks), len(self.dependencies))
+        
+        if self.processes == 1 or len(tasks) < 2:
+            changed = map(writeBomIfChanged, tasks)
+        else:
+            pool = multiprocessing.Pool(self.processes, configWorkerLogger)
+            try:
+                changed = pool.map(writeBomIfChanged, tasks)
+            finally:
+                pool.close()
+                pool.join()
+        
+        log.info('%d POMs changed', changed.count(True))
+        self.writtenCount = changed.count(True)
+        
+        if writeBomIfChanged((self.pomFile, (self.groupId, self.artifactId, self.version), imports)):
+            log.info('Wrote %s', self.pomFile)
+            self.writtenCount += 1
+        else:
+            log.info('%s is unchanged', self.pomFile)
     
     def process(self, root):
         for name in os.listdir(root):
@@ -54,33 +223,98 @@ class DependencyManagementTool(object):
             elif path.endswith('.pom'):
                 self.processPom(path)
     
+    def generatedArtifactIds(self, dependencies):
+        '''The artifactIds of all POMs which this tool creates (in self.groupId).
+        
+        All depths are included, so the POMs of an earlier run with a
+        different --split-depth are recognized, too.'''
+        result = set([self.artifactId])
+        for dependency in dependencies:
+            parts = dependency[0].split('.')
+            for depth in range(1, len(parts) + 1):
+                result.add('%s-%s' % (self.artifactId, '.'.join(parts[:depth])))
+        return result
+    
+    def withoutGenerated(self, dependencies):
+        '''Remove the POMs which this tool created in an earlier run'''
+        generated = self.generatedArtifactIds(dependencies)
+        return [d for d in dependencies if d[0] != self.groupId or d[1] not in generated]
+    
     def processPom(self, path):
-        log.debug('Reading %s' % (path,))
-        pom = Pom(path)
+        log.debug('Reading %s', path)
+        if self.verify:
+            pom = self.loader.load(path, self.repoDir, True)
+        else:
+            # Lazy: The coordinates are taken from the path
+            pom = Pom(path, self.repoDir)
         
-        dep = etree.SubElement(self.dependencies, POM_NS_PREFIX+'dependency')
+        for message in pom.mismatches:
+            log.warning('%s: %s', path, message)
+        
+        # The path is what Maven uses to locate the artifact
+        coordinates = pom.pathCoordinates or self.xmlCoordinates(pom)
+        if None in coordinates:
+            log.warning("%s: Ignoring POM without groupId, artifactId or version", path)
+            return
+        
+        self.dependencies.append(coordinates)
+    
+    def xmlCoordinates(self, pom):
+        '''The coordinates from the XML; groupId and version can be inherited from the parent POM'''
+        groupId, artifactId, version = pom.coordinates()
         
-        setOptionalText(dep, 'groupId', pom.project.groupId.text)
-        setOptionalText(dep, 'artifactId', pom.project.artifactId.text)
-        setOptionalText(dep, 'version', pom.project.version.text)
+        parent = pom.child(pom.project, 'parent')
+        if groupId is None:
+            groupId = pom.childText(parent, 'groupId')
+        if version is None:
+            version = pom.childText(parent, 'version')
         
+        return (groupId, artifactId, version)
+
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--split', action='store_true',
+                      help='Create one POM per top-level groupId (artifactId-org.eclipse.core) and make <groupId:artifactId:version> import them')
+    parser.add_option('--split-depth', type='int', default=3, metavar='N',
+                      help='Number of parts of the groupId which are top-level for --split (default: %default)')
+    parser.add_option('--jobs', type='int', metavar='N',
+                      help='Number of processes to write the POMs with --split (default: number of CPUs)')
+    parser.add_option('--verify', action='store_true',
+                      help="Parse all POMs and warn when their coordinates don't match their path")
+    addLogLevelOption(parser)
+    addProfileOption(parser)
+    return parser
 
 def main(name, argv):
+    parser = optionParser()
+    
+    if not userNeedsHelp(argv):
+        options, argv = parser.parse_args(argv)
+    
     if userNeedsHelp(argv) or len(argv) != 2:
         print('%s %s' % (name, VERSION))
-        print('Usage: %s <m2repo> <groupId:artifactId:version')
+        print('Usage: %s [options] <m2repo> <groupId:artifactId:version')
         print('')
         print('Create a POM file with the dependencyManagement element')
         print('for all POMs found in the repository.')
+        print('')
+        print(parser.format_option_help())
         return
 
     repoDir = mustBeDirectory(argv[0])
     artifact = argv[1]
 
-    configLogger(repoDir + "-dm.log")
-    log.info('%s %s' % (name, VERSION))
+    configLogger(repoDir + "-dm.log", level=options.log_level)
+    log.info('%s %s', name, VERSION)
+    
+    if options.profile:
+        instrumentation.startProfiling(repoDir + '-dm.prof')
 
     tool = DependencyManagementTool(repoDir, artifact)
+    tool.split = options.split
+    tool.splitDepth = options.split_depth
+    tool.processes = options.jobs
+    tool.verify = options.verify
     tool.run()
     
     log.info('Done.')
@@ -89,6 +323,6 @@ if __name__ == '__main__':
     try:
         main(sys.argv[0], sys.argv[1:])
     except Exception as e:
-        log.info('arguments: %s' % (sys.argv,))
-        log.error('%s' % e)
+        log.info('arguments: %s', sys.argv)
+        log.error('%s', e)
         raise
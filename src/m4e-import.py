@@ -22,7 +22,9 @@ import sys
 import os.path
 import shutil
 import logging
-from m4e.common import configLogger, userNeedsHelp
+from optparse import OptionParser
+from m4e.common import addLogLevelOption, addProfileOption, configLogger, instrumentation, phase, userNeedsHelp
+from m4e.blobstore import BlobStore, Deduplicator
 
 workDir = os.path.abspath('../tmp')
 
@@ -57,7 +59,7 @@ def downloadMaven3():
     '''Download Maven 3 if necessary'''
     path = os.path.join(workDir, m3archive)
     if os.path.exists(path):
-        log.debug('Maven 3 was already downloaded at %s' % path)
+        log.debug('Maven 3 was already downloaded at %s', path)
         return
     
     downloadUrl = 'http://mirror.switch.ch/mirror/apache/dist//maven/binaries/' + m3archive
@@ -73,7 +75,7 @@ def unpackMaven3():
     
     path = os.path.join(workDir, unpackedPath)
     if os.path.exists(path):
-        log.debug('Maven 3 was already unpacked at %s' % path)
+        log.debug('Maven 3 was already unpacked at %s', path)
         return
     
     import tarfile
@@ -90,17 +92,17 @@ def downloadArchive(archive):
     This function returns the name of the downloaded file.
     '''
     if not archive.startswith('http://'):
-        log.debug("Archive URL %s seems to be local" % archive)
+        log.debug("Archive URL %s seems to be local", archive)
         return archive
     
     basename = os.path.basename(archive)
     path = os.path.join(workDir, basename)
     
     if os.path.exists(path):
-        log.debug('Archive %s has already been downloaded' % path)
+        log.debug('Archive %s has already been downloaded', path)
         return path
     
-    log.info('Downloading %s to %s' % (archive, path))
+    log.info('Downloading %s to %s', archive, path)
     download(archive, path)
     log.info('OK')
     
@@ -113,7 +115,7 @@ def unpackArchive(archive):
     
     # If the archive is already unpacked, use the directory
     if os.path.isdir(archive):
-        log.debug('Archive %s is a directory; no need to unpack' % archive)
+        log.debug('Archive %s is a directory; no need to unpack', archive)
         return archive
     
     dirName = os.path.basename(archive)
@@ -124,10 +126,10 @@ def unpackArchive(archive):
     
     path = os.path.join(workDir, dirName)
     if os.path.exists(path):
-        log.debug('Archive %s is already unpacked at %s' % (archive, path))
+        log.debug('Archive %s is already unpacked at %s', archive, path)
         return path
     
-    log.info('Unpacking %s' % (archive,))
+    log.info('Unpacking %s', archive)
     
     if archive.endswith('.zip'):
         unpackZipArchive(archive, path)
@@ -147,9 +149,9 @@ def unpackZipArchive(archive, path):
     archive = zipfile.ZipFile(archive, 'r')
     # For some reason, extractall() doesn't work on maven.eclipse.org
     for info in archive.infolist():
-        log.debug('%s %s %s %s' % (info.filename, info.compress_type, info.extract_version, info.file_size))
+        log.debug('%s %s %s %s', info.filename, info.compress_type, info.extract_version, info.file_size)
         if info.filename[0] == '/' or info.filename.startswith('../') or '/../' in info.filename:
-            log.warning('Skipped suspicious entry "%s"' % info.filename)
+            log.warning('Skipped suspicious entry "%s"', info.filename)
             continue
         
         if info.filename[-1] == '/':
@@ -191,7 +193,7 @@ class ImportTool(object):
         self.m2settings = os.path.join(self.m2dir, 'settings.xml')
 
     def run(self):
-        log.info('Importing plug-ins from %s into %s' % (self.eclipseFolder, self.m2repo))
+        log.info('Importing plug-ins from %s into %s', self.eclipseFolder, self.m2repo)
     
         self.clean()
         self.writeSettings()
@@ -205,8 +207,8 @@ class ImportTool(object):
         args = self.args()
         env = self.env()
         
-        log.debug('Arguments: %s\n' % (args,))
-        log.debug('M2_HOME: %s\n' % env['M2_HOME'])
+        log.debug('Arguments: %s\n', args)
+        log.debug('M2_HOME: %s\n', env['M2_HOME'])
         
         import subprocess
 
@@ -223,8 +225,8 @@ class ImportTool(object):
         
         rc = child.returncode
         if rc != 0:
-            log.error("Arguments: %s" % (args,))
-            log.error("Log file: %s" % self.logFile )
+            log.error("Arguments: %s", args)
+            log.error("Log file: %s", self.logFile)
             raise RuntimeError("Importing the plug-ins from %s failed with RC=%d" % (self.eclipseFolder, rc))
     
     def wait(self, child):
@@ -232,7 +234,7 @@ class ImportTool(object):
         partPattern = re.compile(r'[/\\]')
         
         for line in child.stdout:
-            log.debug( 'child: %s' % line.rstrip())
+            log.debug( 'child: %s', line.rstrip())
             
             if line.startswith('[INFO] Processing '):
                 parts = line.split(' ')
@@ -399,39 +401,80 @@ def deleteMavenFiles(folder):
         elif name in mavenFiles:
             os.remove(path)
 
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--store', metavar='DIR',
+                      help='Move the imported JARs into this blob store (see m4e-blobstore.py)')
+    addLogLevelOption(parser)
+    addProfileOption(parser)
+    return parser
+
 def main(name, argv):
-    logFile = os.path.join(workDir, 'm4e-import.log')
-    configLogger(logFile)
+    parser = optionParser()
+    
+    if not userNeedsHelp(argv):
+        options, argv = parser.parse_args(argv)
     
-    log.info('%s %s' % (name, VERSION))
-    log.debug('workDir=%s' % os.path.abspath(workDir))
     if userNeedsHelp(argv):
-        print('Usage: %s <archives...>')
+        print('%s %s' % (name, VERSION))
+        print('Usage: %s [options] <archives...>')
         print('')
         print('Import the set of archives into Maven 2 repositories in')
         print(workDir)
+        print('')
+        print(parser.format_option_help())
         return
     
-    downloadMaven3()
-    unpackMaven3()
-    loadNecessaryPlugins(logFile)
+    logFile = os.path.join(workDir, 'm4e-import.log')
+    configLogger(logFile, level=options.log_level)
+    
+    log.info('%s %s', name, VERSION)
+    log.debug('workDir=%s', os.path.abspath(workDir))
+    
+    if options.profile:
+        instrumentation.startProfiling(os.path.join(workDir, 'm4e-import.prof'))
+    
+    with phase('maven'):
+        downloadMaven3()
+        unpackMaven3()
+        loadNecessaryPlugins(logFile)
     
     for archive in argv:
-        archive = downloadArchive(archive)
-        path = unpackArchive(archive)
-        tool = importIntoTmpRepo(path, logFile)
+        with phase('download') as downloading:
+            archive = downloadArchive(archive)
+            downloading.count()
+        
+        with phase('unpack') as unpacking:
+            path = unpackArchive(archive)
+            unpacking.count()
+        
+        with phase('import') as importing:
+            tool = importIntoTmpRepo(path, logFile)
+            importing.count()
         
         m2repo = tool.m2repo
-        log.info('Deleting non-Eclipse artifacts...')
-        deleteCommonFiles(m2repo, templateRepo)
-        log.info('OK')
+        with phase('cleanup') as cleaning:
+            log.info('Deleting non-Eclipse artifacts...')
+            deleteCommonFiles(m2repo, templateRepo)
+            log.info('OK')
+            
+            deleteMavenFiles(m2repo)
+            cleaning.count()
+        
+        if options.store:
+            with phase('store') as storing:
+                deduplicator = Deduplicator(BlobStore(os.path.abspath(options.store)))
+                deduplicator.run([m2repo])
+                storing.count(deduplicator.hashedCount)
+            
+            instrumentation.increment('bytes_reclaimed', deduplicator.reclaimedBytes)
         
-        deleteMavenFiles(m2repo)
+        instrumentation.increment('archives_imported')
         
 if __name__ == '__main__':
     try:
         main(sys.argv[0], sys.argv[1:])
     except Exception as e:
-        log.error('%s' % e)
+        log.error('%s', e)
         raise
         
@@ -21,7 +21,9 @@ import os
 import sys
 import filecmp
 import time
-from m4e.common import userNeedsHelp
+from optparse import OptionParser
+from m4e.common import addProfileOption, instrumentation, phase, userNeedsHelp
+from m4e.blobstore import BlobStore, Deduplicator
 
 VERSION = '0.9 (13.05.2011)'
 
@@ -48,18 +50,33 @@ def merge(source, target):
                 equal = filecmp.cmp(srcPath, targetPath)
                 if not equal:
                     log("WARNING %s differs from %s" % (targetPath, srcPath))
+                    instrumentation.increment('conflicts')
                 pass
             else:
                 os.link(srcPath, targetPath)
+                instrumentation.increment('files_linked')
+                instrumentation.increment('bytes_linked', os.path.getsize(srcPath))
+
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--store', metavar='DIR',
+                      help='Link the JARs from this blob store (see m4e-blobstore.py)')
+    addProfileOption(parser)
+    return parser
 
 def main(name, argv):
+    parser = optionParser()
+    
     if userNeedsHelp(argv):
         print('%s %s' % (name, VERSION))
-        print('Usage: %s <m2repos...> <result>')
+        print('Usage: %s [options] <m2repos...> <result>')
         print('')
         print('Merge the files in the various Maven 2 repositories into one repositories')
-        print(workDir)
+        print('')
+        print(parser.format_option_help())
         return
+    
+    options, argv = parser.parse_args(argv)
 
     target = argv[-1]
     if os.path.exists(target):
@@ -72,9 +89,31 @@ def main(name, argv):
     logFile = open(target + ".log", 'a')
     log('%s %s' % (name, VERSION))
     
+    # Save the metrics next to the log
+    instrumentation.metricsFile = target
+    
+    if options.profile:
+        instrumentation.startProfiling(target + '.prof')
+    
     for source in argv[:-1]:
         log('Merging %s' % source)
-        merge(source, target)
+        with phase('merge') as merging:
+            merge(source, target)
+            merging.count()
+    
+    if options.store:
+        # JARs which are already in the store are skipped by their inode; the rest is hashed in parallel
+        log('Linking the JARs to %s' % options.store)
+        with phase('store') as storing:
+            deduplicator = Deduplicator(BlobStore(os.path.abspath(options.store)))
+            deduplicator.run([target])
+            storing.count(deduplicator.hashedCount)
+        
+        instrumentation.metric('files_hashed', deduplicator.hashedCount)
+        instrumentation.metric('bytes_reclaimed', deduplicator.reclaimedBytes)
+    
+    # This tool doesn't configure logging, so the summary must go through log()
+    instrumentation.stopProfiling(log)
 
 logFile = None
 def log(msg):
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+"""Tool to create maven-metadata.xml files for all artifacts in a Maven 2 repository.
+
+The versions of each artifact are saved next to the repository. The
+next run only writes the metadata of artifacts whose versions changed.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+"""
+import os
+import sys
+import time
+import logging
+import multiprocessing
+from optparse import OptionParser
+from m4e.common import addLogLevelOption, addProfileOption, configLogger, instrumentation, mustBeDirectory, phase, userNeedsHelp
+from m4e.metadata import loadState, metadataPath, scanRepository, writeMetadata, METADATA_FILE
+
+VERSION = '0.1 (19.10.2026)'
+
+log = logging.getLogger('m4e.metadata')
+
+class MetadataTool(object):
+    def __init__(self, repoDir, stateFile):
+        self.repoDir = repoDir
+        self.stateFile = stateFile
+        
+        # Number of processes which write the files (default: number of CPUs)
+        self.processes = None
+        # Write the metadata of all artifacts
+        self.rebuild = False
+        
+        self.writtenCount = 0
+        self.removedCount = 0
+    
+    def run(self):
+        log.info('Creating %s files for %s', METADATA_FILE, self.repoDir)
+        
+        with phase('scan') as scanning:
+            artifacts = scanRepository(self.repoDir)
+            scanning.count(len(artifacts))
+        
+        state = loadState(self.stateFile)
+        if self.rebuild:
+            state.versions = {}
+        
+        tasks = self.changedArtifacts(artifacts, state.versions)
+        log.info('Found %d artifacts; %d changed', len(artifacts), len(tasks))
+        
+        with phase('write') as writing:
+            self.write(tasks)
+            self.removeMetadata(artifacts, state.versions)
+            writing.count(len(tasks))
+        
+        state.versions = artifacts
+        state.save(self.stateFile)
+        
+        log.info('Wrote %d files, removed %d', self.writtenCount, self.removedCount)
+        
+        instrumentation.metric('artifacts', len(artifacts))
+        instrumentation.metric('metadata_written', self.writtenCount)
+        instrumentation.metric('metadata_removed', self.removedCount)
+    
+    def changedArtifacts(self, artifacts, oldVersions):
+        '''Get the tasks for writeMetadata() for all artifacts whose
+        versions changed or which have no metadata file'''
+        lastUpdated = time.strftime('%Y%m%d%H%M%S', time.gmtime())
+        
+        tasks = []
+        for (groupId, artifactId), versions in artifacts.iteritems():
+            path = metadataPath(self.repoDir, groupId, artifactId)
+            if oldVersions.get((groupId, artifactId)) == versions and os.path.exists(path):
+                continue
+            
+            tasks.append((path, groupId, artifactId, versions, lastUpdated))
+        
+        tasks.sort()
+        return tasks
+    
+    def write(self, tasks):
+        if self.processes == 1 or len(tasks) < 2:
+            changed = map(writeMetadata, tasks)
+        else:
+            pool = multiprocessing.Pool(self.processes)
+            try:
+                changed = pool.map(writeMetadata, tasks, 64)
+            finally:
+                pool.close()
+                pool.join()
+        
+        self.writtenCount = changed.count(True)
+    
+    def removeMetadata(self, artifacts, oldVersions):
+        '''Delete the metadata of artifacts which are gone'''
+        for groupId, artifactId in oldVersions:
+            if (groupId, artifactId) in artifacts:
+                continue
+            
+            path = metadataPath(self.repoDir, groupId, artifactId)
+            if os.path.exists(path):
+                log.debug('Removing %s', path)
+                os.remove(path)
+                self.removedCount += 1
+
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--jobs', type='int', metavar='N',
+                      help='Number of processes which write the files (default: number of CPUs)')
+    parser.add_option('--state', metavar='FILE',
+                      help='Where to save the versions of the artifacts (default: <m2repo>-metadata.pickle)')
+    parser.add_option('--rebuild', action='store_true',
+                      help='Write the metadata of all artifacts')
+    addLogLevelOption(parser)
+    addProfileOption(parser)
+    return parser
+
+def main(name, argv):
+    parser = optionParser()
+    
+    if userNeedsHelp(argv):
+        print('%s %s' % (name, VERSION))
+        print('Usage: %s [options] <m2repo>')
+        print('')
+        print('Create the %s files for all artifacts in a' % METADATA_FILE)
+        print('Maven 2 repository.')
+        print('')
+        print(parser.format_option_help())
+        return
+    
+    options, argv = parser.parse_args(argv)
+    
+    repoDir = mustBeDirectory(argv[0])
+    
+    configLogger(repoDir + "-metadata.log", level=options.log_level)
+    log.info('%s %s', name, VERSION)
+    
+    if options.profile:
+        instrumentation.startProfiling(repoDir + '-metadata.prof')
+    
+    tool = MetadataTool(repoDir, options.state or repoDir + '-metadata.pickle')
+    tool.processes = options.jobs
+    tool.rebuild = options.rebuild
+    tool.run()
+    
+    log.info('Done.')
+
+if __name__ == '__main__':
+    try:
+        main(sys.argv[0], sys.argv[1:])
+    except Exception as e:
+        log.error('%s', e)
+        raise
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+"""Tool to package a Maven 2 repository as tar.gz or zip archive.
+
+The files are read from the repository and written straight into the
+archive. Big JARs are stored, everything else is compressed in parallel.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+"""
+import os
+import sys
+import logging
+import tarfile
+import zipfile
+import itertools
+import multiprocessing
+from optparse import OptionParser
+from m4e.common import addLogLevelOption, addProfileOption, configLogger, instrumentation, mustBeDirectory, phase, userNeedsHelp
+from m4e.package import COMPRESS_LEVEL, STORE_THRESHOLD, GzipWriter, StoredPayload, deflateFile, findFiles, isStored, writeDeflated, zipInfo
+
+VERSION = '0.1 (19.10.2026)'
+
+log = logging.getLogger('m4e.package')
+
+FORMATS = ('tar.gz', 'tar', 'zip')
+
+def formatFromName(fileName):
+    for format in FORMATS:
+        if fileName.endswith('.' + format):
+            return format
+    
+    if fileName.endswith('.tgz'):
+        return 'tar.gz'
+    
+    return None
+
+def deflateTask(path):
+    '''Pool worker: Compress everything except the files which are stored'''
+    if isStored(path):
+        return None
+    return deflateFile(path)
+
+class PackageTool(object):
+    def __init__(self, repoDir, prefix):
+        self.repoDir = repoDir
+        # Name of the root folder in the archive
+        self.prefix = prefix
+        
+        # Number of processes which compress the files (default: number of CPUs)
+        self.processes = None
+        
+        self.fileCount = 0
+        self.bytesIn = 0
+        self.bytesOut = 0
+    
+    def arcname(self, path):
+        name = os.path.relpath(path, self.repoDir).replace(os.sep, '/')
+        if self.prefix:
+            name = '%s/%s' % (self.prefix, name)
+        return name
+    
+    def run(self, format, fileobj):
+        log.info('Packaging %s as %s', self.repoDir, format)
+        
+        with phase('package') as packaging:
+            if format == 'zip':
+                self.writeZip(fileobj)
+            else:
+                self.writeTar(fileobj, format == 'tar.gz')
+            packaging.count(self.fileCount)
+        
+        log.info('Packaged %d files; %d bytes -> %d bytes', self.fileCount, self.bytesIn, self.bytesOut)
+        
+        instrumentation.metric('files', self.fileCount)
+        instrumentation.metric('bytes_in', self.bytesIn)
+        instrumentation.metric('bytes_out', self.bytesOut)
+    
+    def writeTar(self, fileobj, compress):
+        # Without compression, use stream mode which doesn't need tell()
+        writer = GzipWriter(fileobj, self.processes) if compress else fileobj
+        
+        try:
+            archive = tarfile.open(mode='w' if compress else 'w|', fileobj=writer)
+            for path in findFiles(self.repoDir):
+                log.debug('Adding %s', path)
+                info = archive.gettarinfo(path, self.arcname(path))
+                with open(path, 'rb') as fh:
+                    if compress and isStored(path) and info.size >= STORE_THRESHOLD:
+                        archive.addfile(info, StoredPayload(fh, writer))
+                        writer.level = COMPRESS_LEVEL
+                    else:
+                        archive.addfile(info, fh)
+                
+                self.fileCount += 1
+                self.bytesIn += info.size
+            
+            archive.close()
+        finally:
+            if compress:
+                writer.close()
+        
+        self.bytesOut = writer.compressedSize if compress else archive.offset
+    
+    def writeZip(self, fileobj):
+        paths = list(findFiles(self.repoDir))
+        
+        if self.processes == 1 or len(paths) < 2:
+            pool = None
+            results = itertools.imap(deflateTask, paths)
+        else:
+            pool = multiprocessing.Pool(self.processes)
+            results = pool.imap(deflateTask, paths, 16)
+        
+        try:
+            archive = zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED, allowZip64=True)
+            for path, result in itertools.izip(paths, results):
+                log.debug('Adding %s', path)
+                
+                if result is None:
+                    archive.write(path, self.arcname(path), zipfile.ZIP_STORED)
+                    self.bytesIn += os.path.getsize(path)
+                else:
+                    crc, size, data = result
+                    writeDeflated(archive, zipInfo(path, self.arcname(path), zipfile.ZIP_DEFLATED), crc, size, data)
+                    self.bytesIn += size
+                
+                self.fileCount += 1
+            
+            archive.close()
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        
+        self.bytesOut = fileobj.tell()
+
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--format', choices=FORMATS,
+                      help='One of %s. Default: From the name of the archive' % ', '.join(FORMATS))
+    parser.add_option('--prefix', metavar='DIR',
+                      help='Name of the root folder in the archive (default: the name of the repository)')
+    parser.add_option('--jobs', type='int', metavar='N',
+                      help='Number of processes which compress the files (default: number of CPUs)')
+    addLogLevelOption(parser)
+    addProfileOption(parser)
+    return parser
+
+def main(name, argv):
+    parser = optionParser()
+    
+    if userNeedsHelp(argv):
+        print('%s %s' % (name, VERSION))
+        print('Usage: %s [options] <m2repo> <archive>')
+        print('')
+        print('Write a Maven 2 repository into an archive. Use - to write')
+        print('the archive to stdout (not for zip).')
+        print('')
+        print(parser.format_option_help())
+        return
+    
+    options, argv = parser.parse_args(argv)
+    
+    repoDir = mustBeDirectory(argv[0])
+    archive = argv[1]
+    
+    format = options.format or formatFromName(archive)
+    if format is None:
+        raise RuntimeError("Can't determine the format of %s; use --format" % archive)
+    if format == 'zip' and archive == '-':
+        raise RuntimeError("zip archives can't be written to stdout")
+    
+    configLogger(repoDir + "-package.log", consoleStream=sys.stderr, level=options.log_level)
+    log.info('%s %s', name, VERSION)
+    
+    if options.profile:
+        instrumentation.startProfiling(repoDir + '-package.prof')
+    
+    prefix = os.path.basename(repoDir) if options.prefix is None else options.prefix.strip('/')
+    tool = PackageTool(repoDir, prefix)
+    tool.processes = options.jobs
+    
+    if archive == '-':
+        tool.run(format, sys.stdout)
+        sys.stdout.flush()
+    else:
+        tmp = '%s.tmp' % archive
+        with open(tmp, 'wb') as fh:
+            tool.run(format, fh)
+        os.rename(tmp, archive)
+    
+    log.info('Done.')
+
+if __name__ == '__main__':
+    try:
+        main(sys.argv[0], sys.argv[1:])
+    except Exception as e:
+        log.error('%s', e)
+        raise
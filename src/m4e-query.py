@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+"""Tool to query the artifacts and dependencies in a Maven 2 Repository.
+
+The first run builds an index of the repository and saves it next to
+the repository. Later runs load the index unless the repository was
+changed.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+"""
+import sys
+import logging
+from optparse import OptionParser
+from m4e.common import addLogLevelOption, addProfileOption, instrumentation, phase, configLogger, mustBeDirectory, userNeedsHelp
+from m4e.index import getIndex
+
+VERSION = '0.1 (19.10.2026)'
+
+log = logging.getLogger('m4e.query')
+
+QUERY_HELP = '''\
+Queries (the output columns are separated by tabs):
+
+  coord <groupId:artifactId>          All versions and the path of their POM
+  deps <groupId:artifactId[:version]> Dependencies with version range and scope
+  rdeps <groupId:artifactId>          Which POMs depend on the artifact and with which version range
+  files <groupId:artifactId[:version]> Files which exist for the artifact (jar, pom, sources, ...)
+'''
+
+class QueryTool(object):
+    def __init__(self, index, out):
+        self.index = index
+        self.out = out
+        self.queryCount = 0
+    
+    def query(self, line):
+        '''Run a single query. Errors are written to the output, too.'''
+        parts = line.split()
+        if not parts:
+            return
+        
+        if len(parts) != 2:
+            self.error('Expected "<query> <coordinate>" but got [%s]' % line)
+            return
+        
+        command, coordinate = parts
+        self.queryCount += 1
+        method = getattr(self, 'query_%s' % command, None)
+        if method is None:
+            self.error('Unknown query "%s"' % command)
+            return
+        
+        try:
+            method(coordinate)
+        except ValueError as e:
+            self.error('%s' % e)
+    
+    def error(self, message):
+        self.out.write('ERROR\t%s\n' % message)
+    
+    def row(self, *columns):
+        self.out.write('\t'.join([('' if c is None else c) for c in columns]))
+        self.out.write('\n')
+    
+    def query_coord(self, coordinate):
+        index = self.index
+        paths = index.coordinates.get(coordinate, {})
+        for version in index.versions(coordinate):
+            self.row('%s:%s' % (coordinate, version), paths[version])
+    
+    def query_deps(self, coordinate):
+        for key in self.index.keys(coordinate):
+            for dependency, version, scope in self.index.dependencies[key]:
+                self.row(key, dependency, version, scope)
+    
+    def query_rdeps(self, coordinate):
+        for key, version in self.index.dependents.get(coordinate, []):
+            self.row(key, version)
+    
+    def query_files(self, coordinate):
+        for key in self.index.keys(coordinate):
+            self.row(key, ' '.join(self.index.files[key]))
+    
+    def batch(self, input):
+        '''Read queries from input, one per line. The results of each
+        query are followed by an empty line.'''
+        for line in input:
+            self.query(line)
+            self.out.write('\n')
+            self.out.flush()
+
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--rebuild', action='store_true',
+                      help='Build the index again even if it is up to date')
+    parser.add_option('--index', metavar='FILE',
+                      help='Where to save the index (default: <m2repo>-index.pickle)')
+    addLogLevelOption(parser)
+    addProfileOption(parser)
+    return parser
+
+def main(name, argv):
+    parser = optionParser()
+    
+    if userNeedsHelp(argv):
+        print('%s %s' % (name, VERSION))
+        print('Usage: %s [options] <m2repo> [<query> <coordinate>]')
+        print('')
+        print('Query the artifacts and dependencies in a Maven 2 repository.')
+        print('Without a query on the command line, queries are read from')
+        print('stdin, one per line.')
+        print('')
+        print(QUERY_HELP)
+        print(parser.format_option_help())
+        return
+    
+    options, argv = parser.parse_args(argv)
+    
+    repoDir = mustBeDirectory(argv[0])
+    
+    # Keep stdout clean for the results
+    configLogger(repoDir + "-query.log", sys.stderr, level=options.log_level)
+    log.debug('%s %s', name, VERSION)
+    
+    if options.profile:
+        instrumentation.startProfiling(repoDir + '-query.prof')
+    
+    with phase('index') as indexing:
+        index = getIndex(repoDir, options.index, options.rebuild)
+        indexing.count(len(index.files))
+    
+    tool = QueryTool(index, sys.stdout)
+    with phase('query') as querying:
+        if len(argv) > 1:
+            tool.query(' '.join(argv[1:]))
+        else:
+            tool.batch(sys.stdin)
+        querying.count(tool.queryCount)
+    
+    instrumentation.metric('artifacts', len(index.files))
+    instrumentation.metric('queries', tool.queryCount)
+
+if __name__ == '__main__':
+    try:
+        main(sys.argv[0], sys.argv[1:])
+    except Exception as e:
+        log.error('%s', e)
+        raise
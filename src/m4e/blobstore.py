@@ -0,0 +1,183 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+A content addressed store for the JARs of several Maven 2 repositories
+
+Each file is saved once under its SHA-256 checksum; the files in the
+repositories are hard links to the blobs in the store. This means the
+store and the repositories must be on the same file system.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import errno
+import logging
+import itertools
+import multiprocessing
+from checksums import digestFile, findFiles
+
+log = logging.getLogger('m4e.blobstore')
+
+ALGORITHM = 'sha256'
+
+# Only these files are moved into the store. POMs are small and the
+# tools change them, so they stay in the repositories.
+STORED_SUFFIXES = ('.jar', '.zip')
+
+def hashBlob(path):
+    '''Returns (path, SHA-256 of the file)'''
+    return path, digestFile(path, (ALGORITHM,))[0]
+
+def isStored(path):
+    return path.endswith(STORED_SUFFIXES)
+
+def inodeKey(st):
+    return (st.st_dev, st.st_ino)
+
+def hashAll(paths, processes):
+    '''Yield (path, digest) for all paths; the files are hashed in parallel'''
+    if processes == 1 or len(paths) < 2:
+        for result in itertools.imap(hashBlob, paths):
+            yield result
+        return
+    
+    pool = multiprocessing.Pool(processes)
+    try:
+        for result in pool.imap_unordered(hashBlob, paths, 16):
+            yield result
+    finally:
+        pool.close()
+        pool.join()
+
+def hardLink(source, target):
+    try:
+        os.link(source, target)
+    except OSError as e:
+        if e.errno == errno.EXDEV:
+            raise RuntimeError("Can't link %s to %s: The store must be on the same file system as the repositories" % (source, target))
+        raise
+
+class BlobStore(object):
+    def __init__(self, root):
+        self.root = root
+    
+    def blobPath(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+    
+    def blobs(self):
+        '''Yield (digest, path, os.lstat()) for all blobs in the store'''
+        if not os.path.exists(self.root):
+            return
+        
+        for path, st in findFiles(self.root):
+            name = os.path.basename(path)
+            if name.endswith('.tmp'):
+                continue
+            
+            yield name, path, st
+    
+    def inodes(self):
+        '''The inodes of all blobs. Files with one of these inodes are already in the store.'''
+        return set([inodeKey(st) for digest, path, st in self.blobs()])
+    
+    def add(self, path, digest):
+        '''Move a file into the store and replace it with a hard link to the blob.
+        
+        Returns True if path was replaced with a link to an existing blob.'''
+        blob = self.blobPath(digest)
+        
+        if not os.path.exists(blob):
+            dirName = os.path.dirname(blob)
+            if not os.path.exists(dirName):
+                os.makedirs(dirName)
+            
+            hardLink(path, blob)
+            return False
+        
+        if os.path.samefile(path, blob):
+            return False
+        
+        if os.path.getsize(path) != os.path.getsize(blob):
+            raise RuntimeError('%s and %s have the same checksum but a different size' % (path, blob))
+        
+        tmp = '%s.tmp' % path
+        hardLink(blob, tmp)
+        os.rename(tmp, path)
+        return True
+    
+    def verify(self, processes=None):
+        '''Check the checksum of all blobs.
+        
+        Returns the number of blobs and the paths of all blobs which are corrupt.'''
+        paths = [path for digest, path, st in self.blobs()]
+        
+        corrupt = []
+        for path, digest in hashAll(paths, processes):
+            if digest != os.path.basename(path):
+                log.error('%s is corrupt; the checksum is %s', path, digest)
+                corrupt.append(path)
+        
+        log.info('Verified %d blobs; %d are corrupt', len(paths), len(corrupt))
+        return len(paths), corrupt
+
+class Deduplicator(object):
+    '''Move the JARs of several repositories into a BlobStore'''
+    def __init__(self, store):
+        self.store = store
+        
+        # Number of processes which hash the files (default: number of CPUs)
+        self.processes = None
+        
+        self.fileCount = 0
+        self.hashedCount = 0
+        self.linkedCount = 0
+        self.reclaimedBytes = 0
+    
+    def run(self, repoDirs):
+        inStore = self.store.inodes()
+        
+        todo = []
+        for repoDir in repoDirs:
+            log.info('Scanning %s', repoDir)
+            for path, st in findFiles(repoDir):
+                if not isStored(path):
+                    continue
+                
+                self.fileCount += 1
+                if inodeKey(st) not in inStore:
+                    todo.append(path)
+        
+        log.info('Found %d files; %d are not in the store', self.fileCount, len(todo))
+        
+        # inodeKey -> [links, size, links which were replaced]
+        replaced = {}
+        for path, digest in hashAll(todo, self.processes):
+            self.hashedCount += 1
+            
+            st = os.lstat(path)
+            if not self.store.add(path, digest):
+                continue
+            
+            log.debug('Linked %s to %s', path, digest)
+            self.linkedCount += 1
+            
+            info = replaced.setdefault(inodeKey(st), [st.st_nlink, st.st_size, 0])
+            info[2] += 1
+        
+        # A file only frees space when all its links were replaced
+        for links, size, count in replaced.itervalues():
+            if count >= links:
+                self.reclaimedBytes += size
+        
+        log.info('Hashed %d files, linked %d to the store; %d bytes reclaimed', self.hashedCount, self.linkedCount, self.reclaimedBytes)
@@ -0,0 +1,130 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Checksums (*.md5 and *.sha1) for the files in a Maven 2 repository
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import mmap
+import stat
+import hashlib
+import logging
+from common import loadPickle, savePickle
+
+log = logging.getLogger('m4e.checksums')
+
+ALGORITHMS = ('md5', 'sha1')
+
+# Files which never get checksums
+IGNORED_SUFFIXES = ('.md5', '.sha1', '.asc', '.tmp', '.bak')
+
+# Files which are at least this big are read with mmap
+MMAP_THRESHOLD = 1024 * 1024
+BLOCK_SIZE = 1024 * 1024
+
+def digestFile(path, algorithms):
+    '''Compute several checksums of a file in a single pass.
+    
+    Returns a tuple with the hex digests in the order of algorithms.'''
+    digests = [hashlib.new(name) for name in algorithms]
+    
+    with open(path, 'rb') as fh:
+        size = os.fstat(fh.fileno()).st_size
+        
+        if size >= MMAP_THRESHOLD:
+            data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for start in xrange(0, size, BLOCK_SIZE):
+                    block = buffer(data, start, BLOCK_SIZE)
+                    for digest in digests:
+                        digest.update(block)
+            finally:
+                data.close()
+        else:
+            while True:
+                block = fh.read(BLOCK_SIZE)
+                if not block:
+                    break
+                
+                for digest in digests:
+                    digest.update(block)
+    
+    return tuple([digest.hexdigest() for digest in digests])
+
+def hashFile(task):
+    '''Compute all checksums of a file.
+    
+    task is (key, path); returns (key, path, digests) where digests is
+    a tuple with the hex digests in the order of ALGORITHMS.'''
+    key, path = task
+    return key, path, digestFile(path, ALGORITHMS)
+
+def statKey(st):
+    '''The checksums of a file are cached under this key'''
+    return (st.st_dev, st.st_ino, st.st_mtime, st.st_size)
+
+def needsChecksum(name):
+    return not name.endswith(IGNORED_SUFFIXES)
+
+def findFiles(root):
+    '''Yield (path, os.stat()) for all files in root which need checksums'''
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        st = os.lstat(path)
+        
+        if stat.S_ISDIR(st.st_mode):
+            for result in findFiles(path):
+                yield result
+        elif stat.S_ISREG(st.st_mode) and needsChecksum(name):
+            yield path, st
+
+class ChecksumCache(object):
+    '''The checksums of all files by statKey()
+    
+    Hard linked files (see m4e-merge.py) share the same entry.'''
+    FORMAT = 1
+    
+    def __init__(self):
+        self.entries = {}
+        # Keys which were used since the cache was loaded
+        self.used = set()
+    
+    def get(self, key):
+        digests = self.entries.get(key)
+        if digests is not None:
+            self.used.add(key)
+        return digests
+    
+    def put(self, key, digests):
+        self.entries[key] = digests
+        self.used.add(key)
+    
+    def prune(self):
+        '''Forget all files which weren't used'''
+        for key in set(self.entries) - self.used:
+            del self.entries[key]
+    
+    def save(self, fileName):
+        savePickle(fileName, self.FORMAT, self.entries)
+
+def loadCache(fileName):
+    '''Load the cache from a file. Returns an empty cache if the file can't be used.'''
+    cache = ChecksumCache()
+    
+    entries = loadPickle(fileName, ChecksumCache.FORMAT, 'checksum cache')
+    if entries is not None:
+        cache.entries = entries
+    
+    return cache
@@ -19,6 +19,18 @@ Created on Apr 7, 2011
 import logging.handlers
 import sys
 import os.path
+import json
+import Queue
+import cPickle
+import time
+import atexit
+import cProfile
+import threading
+
+try:
+    import resource
+except ImportError:
+    resource = None
 
 def substringBefore( s, pattern ):
     '''Get the substring before a pattern.
@@ -35,37 +47,397 @@ def userNeedsHelp(argv):
     
     return not argv or set(argv) & helpOptions
 
-def configLogger(fileName):
-    '''Configure the logger.'''
+LOG_LEVELS = ('debug', 'info', 'warning', 'error')
+
+def addLogLevelOption(parser):
+    parser.add_option('--log-level', metavar='LEVEL', default='debug', choices=LOG_LEVELS,
+                      help='Drop log messages below this level; one of %s (default: %%default)' % ', '.join(LOG_LEVELS))
+
+# Python 2 doesn't have logging.handlers.QueueHandler and QueueListener
+
+# Log arguments of these types can be formatted later
+IMMUTABLE_TYPES = (basestring, int, long, float, bool, type(None))
+
+class QueueHandler(logging.Handler):
+    '''Put log records into a queue instead of writing them'''
+    def __init__(self, queue):
+        logging.Handler.__init__(self)
+        self.queue = queue
+    
+    def prepare(self, record):
+        # The handlers format the message in the background thread.
+        # Other arguments might change before the listener gets to
+        # see them, so these messages are formatted now.
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(arg, IMMUTABLE_TYPES) for arg in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+    
+    def emit(self, record):
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+class QueueListener(object):
+    '''Pass the log records in a queue to handlers in a background thread'''
+    def __init__(self, queue, *handlers):
+        self.queue = queue
+        self.handlers = handlers
+        self.thread = None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.monitor, name='QueueListener')
+        self.thread.daemon = True
+        self.thread.start()
+    
+    def handle(self, record):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+    
+    def monitor(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                break
+            self.handle(record)
+    
+    def stop(self):
+        self.queue.put_nowait(None)
+        self.thread.join()
+        self.thread = None
+
+logListener = None
+
+def stopLogger():
+    '''Write all queued log records and stop the background thread'''
+    global logListener
+    if logListener is None:
+        return
+    
+    logListener.stop()
+    for handler in logListener.handlers:
+        handler.close()
+    logListener = None
+
+atexit.register(stopLogger)
+
+def configWorkerLogger():
+    '''Initializer for multiprocessing.Pool: Worker processes write
+    their log records directly.
+    
+    A forked worker inherits the QueueHandler from configLogger() but
+    not the thread of the QueueListener, so its records would never be
+    written. The log file is opened for appending, so the processes can
+    share it.'''
+    global logListener
+    if logListener is None:
+        return
+    
+    handlers = logListener.handlers
+    logListener = None
+    
+    for handler in handlers:
+        # The listener thread of the parent process might have held the lock during the fork
+        handler.createLock()
+    
+    logging.getLogger().handlers = list(handlers)
+
+def configLogger(fileName, consoleStream=None, level='debug'):
+    '''Configure the logger.
+    
+    Messages with level INFO and above also go to consoleStream
+    (default: stdout). Messages below level are dropped before they
+    are formatted.
+    
+    The handlers run in a background thread; stopLogger() (called
+    at exit) waits until everything is written.'''
     #logging.basicConfig(level=logging.INFO, format='%(message)s')
     
+    stopLogger()
+    
     path = os.path.abspath(fileName)
     dir = os.path.dirname(path)
     if not os.path.exists(dir):
         os.makedirs(dir)
     
     root = logging.getLogger()
-    root.setLevel(logging.DEBUG)
+    root.setLevel(getattr(logging, level.upper()))
     root.handlers = []
     
     doRollover = os.path.exists(fileName) and os.stat(fileName).st_size > 0
     
-    handler = logging.handlers.RotatingFileHandler(fileName, 
+    fileHandler = logging.handlers.RotatingFileHandler(fileName, 
                                                    maxBytes=0, backupCount=5, encoding='UTF-8')
-    handler.setFormatter(logging.Formatter(fmt='%(asctime)s %(levelname)s %(name)s %(message)s'))
-    handler.setLevel(logging.DEBUG)
+    fileHandler.setFormatter(logging.Formatter(fmt='%(asctime)s %(levelname)s %(name)s %(message)s'))
+    fileHandler.setLevel(logging.DEBUG)
     
     # Create a new log file each time the script is run
     if doRollover:
-        handler.doRollover()
+        fileHandler.doRollover()
+    
+    consoleHandler = logging.StreamHandler(consoleStream or sys.stdout)
+    consoleHandler.setLevel(logging.INFO)
+    consoleHandler.setFormatter(logging.Formatter(fmt='%(message)s'))
+    
+    # The metrics of the run are saved next to the log
+    instrumentation.metricsFile = os.path.splitext(path)[0]
+    
+    global logListener
+    queue = Queue.Queue()
+    logListener = QueueListener(queue, fileHandler, consoleHandler)
+    logListener.start()
+    
+    root.addHandler(QueueHandler(queue))
+
+def peakRss():
+    '''Get the peak resident set size of this process in bytes (0 if unknown)'''
+    if resource is None:
+        return 0
+    
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, Mac OS X bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+class Phase(object):
+    '''Time, number of items and peak memory of one phase of a run.
+    
+    Use it as a context manager; entering a phase again adds to the
+    totals. Phases can contain other phases but a phase must not be
+    entered while it's running. Phases aren't thread safe.'''
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.items = 0
+        self.peakRss = 0
+        self.start = None
+    
+    def __enter__(self):
+        self.start = time.time()
+        return self
+    
+    def __exit__(self, type, value, traceback):
+        self.seconds += time.time() - self.start
+        self.peakRss = peakRss()
+    
+    def count(self, items=1):
+        self.items += items
     
-    root.addHandler(handler)
+    def itemsPerSecond(self):
+        return self.items / self.seconds if self.seconds else 0.0
     
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(logging.INFO)
-    handler.setFormatter(logging.Formatter(fmt='%(message)s'))
+    def __repr__(self):
+        return 'Phase(%s, %.3fs, %d items)' % (self.name, self.seconds, self.items)
 
-    root.addHandler(handler)
+class Instrumentation(object):
+    '''Collects the phases and metrics of a run and optionally profiles
+    it with cProfile'''
+    def __init__(self):
+        self.phases = []
+        self.phaseByName = {}
+        self.profile = None
+        self.profileFile = None
+        
+        self.start = time.time()
+        self.tool = toolName(sys.argv[0])
+        # (name, sorted label items) -> value
+        self.metrics = {}
+        # Where to write the metrics at exit (without the tool name and the extension); see configLogger()
+        self.metricsFile = None
+    
+    def phase(self, name):
+        '''Get a phase by name; new phases are created on the fly'''
+        phase = self.phaseByName.get(name)
+        if phase is None:
+            phase = Phase(name)
+            self.phaseByName[name] = phase
+            self.phases.append(phase)
+        return phase
+    
+    def count(self, name, items=1):
+        self.phase(name).count(items)
+    
+    def metric(self, name, value, **labels):
+        '''Set the value of a metric'''
+        self.metrics[(name, tuple(sorted(labels.items())))] = value
+    
+    def increment(self, name, value=1, **labels):
+        '''Add to the value of a metric'''
+        key = (name, tuple(sorted(labels.items())))
+        self.metrics[key] = self.metrics.get(key, 0) + value
+    
+    def allMetrics(self):
+        '''Get a sorted list of (name, labels, value) with the metrics of
+        the tool plus the phases, the duration and the peak RSS of the run'''
+        result = [(name, labels, value) for (name, labels), value in self.metrics.items()]
+        
+        for phase in self.phases:
+            labels = (('phase', phase.name),)
+            result.append(('phase_seconds', labels, phase.seconds))
+            result.append(('phase_items', labels, phase.items))
+        
+        result.append(('run_seconds', (), time.time() - self.start))
+        result.append(('peak_rss_bytes', (), peakRss()))
+        result.append(('last_run_timestamp_seconds', (), int(time.time())))
+        
+        result.sort()
+        return result
+    
+    def metricsAsJson(self):
+        metrics = [{'name': name, 'labels': dict(labels), 'value': value} for name, labels, value in self.allMetrics()]
+        data = {
+            'tool': self.tool,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.start)),
+            'metrics': metrics,
+        }
+        return json.dumps(data, indent=2, sort_keys=True, separators=(',', ': '))
+    
+    def metricsAsPrometheus(self):
+        '''Format the metrics for the textfile collector of the Prometheus node exporter'''
+        lines = []
+        lastName = None
+        for name, labels, value in self.allMetrics():
+            name = 'm4e_' + name
+            if name != lastName:
+                lines.append('# TYPE %s gauge' % name)
+                lastName = name
+            
+            labels = (('tool', self.tool),) + labels
+            labels = ','.join(['%s="%s"' % (key, escapeLabel(v)) for key, v in labels])
+            lines.append('%s{%s} %s' % (name, labels, formatValue(value)))
+        
+        lines.append('')
+        return '\n'.join(lines)
+    
+    def metricsPath(self, suffix):
+        '''The tool name is part of the file name since several tools
+        log next to the same repository'''
+        return '%s-%s%s' % (self.metricsFile, self.tool, suffix)
+    
+    def writeMetrics(self):
+        '''Write the metrics as <log>-<tool>.metrics.json and <log>-<tool>.prom next to the log file'''
+        if not self.metricsFile:
+            return
+        
+        for suffix, data in (('.metrics.json', self.metricsAsJson()), ('.prom', self.metricsAsPrometheus())):
+            writeIfChanged(self.metricsPath(suffix), data.encode('utf-8'))
+        
+        logging.getLogger('m4e.common').debug('Metrics saved in %s and %s', self.metricsPath('.prom'), self.metricsPath('.metrics.json'))
+    
+    def summary(self):
+        '''Get a table of all phases as a list of lines'''
+        lines = ['%-20s %10s %10s %12s %10s' % ('Phase', 'Seconds', 'Items', 'Items/s', 'Peak RSS')]
+        for phase in self.phases:
+            lines.append('%-20s %10.3f %10d %12.1f %8.1fMB' % (
+                phase.name, phase.seconds, phase.items, phase.itemsPerSecond(), phase.peakRss / 1048576.0))
+        return lines
+    
+    def startProfiling(self, fileName):
+        '''Run cProfile until the program exits. Then the stats are saved
+        in fileName and the phases are logged.'''
+        self.profileFile = fileName
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        
+        # Runs before stopLogger() because it's registered later
+        atexit.register(self.stopProfiling)
+    
+    def stopProfiling(self, log=None):
+        '''Stop the profiler and report the summary. log is a function
+        which gets each line; the default is the logging module.'''
+        if self.profile is None:
+            return
+        
+        self.profile.disable()
+        self.profile.dump_stats(self.profileFile)
+        self.profile = None
+        
+        if log is None:
+            log = logging.getLogger('m4e.common').info
+        
+        for line in self.summary():
+            log(line)
+        log('Peak RSS of the process: %.1fMB' % (peakRss() / 1048576.0))
+        log('Profile saved in %s; use "python -m pstats %s" to examine it' % (self.profileFile, self.profileFile))
+
+def toolName(path):
+    '''Get the name of a tool from the path of the script: .../m4e-analyze.py -> analyze'''
+    name = os.path.splitext(os.path.basename(path))[0]
+    if name.startswith('m4e-'):
+        name = name[4:]
+    return name
+
+def escapeLabel(value):
+    return unicode(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def formatValue(value):
+    if isinstance(value, float):
+        return '%.6g' % value
+    return '%d' % value
+
+instrumentation = Instrumentation()
+
+# Runs before stopLogger() because it's registered later
+atexit.register(instrumentation.writeMetrics)
+
+def phase(name):
+    '''Shortcut for instrumentation.phase()'''
+    return instrumentation.phase(name)
+
+def addProfileOption(parser):
+    parser.add_option('--profile', action='store_true',
+                      help='Profile the run with cProfile and log how long each phase took')
+
+def writeIfChanged(path, data, backup=False):
+    '''Write data to a file unless the file already contains exactly this data.
+    
+    With backup, the old file is kept as path.bak.
+    
+    Returns True if the file was written.'''
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, 'rb') as fh:
+            if fh.read() == data:
+                return False
+    
+    tmp = '%s.tmp' % path
+    with open(tmp, 'wb') as fh:
+        fh.write(data)
+    
+    if backup and os.path.exists(path):
+        os.rename(path, '%s.bak' % path)
+    
+    os.rename(tmp, path)
+    return True
+
+def savePickle(fileName, format, data):
+    '''Save data together with the version of its format; see loadPickle()'''
+    tmp = '%s.tmp' % fileName
+    with open(tmp, 'wb') as fh:
+        cPickle.dump((format, data), fh, cPickle.HIGHEST_PROTOCOL)
+    
+    os.rename(tmp, fileName)
+
+def loadPickle(fileName, format, description):
+    '''Load data which was saved by savePickle().
+    
+    Returns None if the file doesn't exist, can't be read or contains
+    another format. description names the file in the warning.'''
+    if not os.path.exists(fileName):
+        return None
+    
+    try:
+        with open(fileName, 'rb') as fh:
+            fileFormat, data = cPickle.load(fh)
+    except Exception as e:
+        logging.getLogger('m4e.common').warning('Error loading %s %s: %s', description, fileName, e)
+        return None
+    
+    if fileFormat != format:
+        return None
+    
+    return data
 
 def mustBeDirectory(path):
     '''Raise an exception if path is not a directory.'''
@@ -0,0 +1,108 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Write compressed files as a stream
+
+gzip is always available; zstd needs the zstandard module.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import gzip
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SUFFIXES = {
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+DEFAULT_LEVELS = {
+    'gzip': 6,
+    'zstd': 3,
+}
+
+def compressionMethods():
+    '''Get the names of the compression methods which are available'''
+    result = ['gzip']
+    if zstandard is not None:
+        result.append('zstd')
+    return result
+
+class CompressedOutput(object):
+    '''A file-like object which compresses everything written to it.
+    
+    With flushBytes, the compressor is flushed after that many
+    (uncompressed) bytes, so the file can be read while it's being
+    written. Each flush makes the compression a little bit worse.'''
+    def __init__(self, path, method='gzip', level=None, flushBytes=0):
+        if method not in SUFFIXES:
+            raise ValueError('Unknown compression method "%s"' % method)
+        if method not in compressionMethods():
+            raise RuntimeError('Compression method "%s" needs the Python module zstandard' % method)
+        
+        if level is None:
+            level = DEFAULT_LEVELS[method]
+        
+        self.path = path
+        self.flushBytes = flushBytes
+        self.unflushed = 0
+        
+        self.fh = open(path, 'wb')
+        if method == 'gzip':
+            self.stream = gzip.GzipFile(path, 'wb', level, self.fh)
+        else:
+            self.stream = zstandard.ZstdCompressor(level=level).stream_writer(self.fh)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, type, value, traceback):
+        self.close()
+    
+    def write(self, data):
+        if isinstance(data, unicode):
+            data = data.encode('utf-8')
+        
+        self.stream.write(data)
+        
+        if self.flushBytes:
+            self.unflushed += len(data)
+            if self.unflushed >= self.flushBytes:
+                self.flush()
+    
+    def flush(self):
+        self.stream.flush()
+        self.unflushed = 0
+    
+    def close(self):
+        try:
+            self.stream.close()
+        finally:
+            # GzipFile doesn't close a file object which was passed in
+            if not self.fh.closed:
+                self.fh.close()
+
+def openOutput(path, method=None, level=None, flushBytes=0):
+    '''Open path for writing. With a compression method, the suffix of
+    the method is added to the path.
+    
+    Returns the file object and the path.'''
+    if method is None:
+        return open(path, 'w'), path
+    
+    path += SUFFIXES[method]
+    return CompressedOutput(path, method, level, flushBytes), path
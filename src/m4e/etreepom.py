@@ -0,0 +1,201 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+POMs on plain lxml.etree
+
+Same API as Pom, Dependency and Profile in m4e.pom but without the
+overhead of lxml.objectify: Elements are located with find() and
+namespaced paths which are built once.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import StringIO
+from lxml import etree
+import pom
+from pom import POM_NS_PREFIX, NEW_POM, removeElement, siblingPositions
+from pomcache import PomCache
+from version import memoize
+
+@memoize
+def tag(name):
+    return '%s%s' % (POM_NS_PREFIX, name)
+
+DEPENDENCIES = tag('dependencies')
+DEPENDENCY_PATH = '%s/%s' % (DEPENDENCIES, tag('dependency'))
+PROFILES = tag('profiles')
+PROFILE = tag('profile')
+ID = tag('id')
+
+def findText(elem, name):
+    '''Get the text of the child name of elem or None if elem or the child don't exist'''
+    if elem is None:
+        return None
+    
+    child = elem.find(tag(name))
+    return None if child is None else child.text
+
+def getOrCreate(elem, childName):
+    '''Get a child node by name. Create the child node if it doesn't exist.'''
+    child = elem.find(tag(childName))
+    if child is None:
+        child = etree.SubElement(elem, tag(childName))
+        siblingPositions.clear()
+    return child
+
+def createElementAfter(parent, previousName, name):
+    '''Add an element after a sibling or append it if the sibling doesn't exist'''
+    siblingPositions.clear()
+    
+    previous = None if previousName is None else parent.find(tag(previousName))
+    if previous is None:
+        return etree.SubElement(parent, tag(name))
+    
+    element = etree.Element(tag(name))
+    element.tail = previous.tail
+    previous.tail = parent.text
+    previous.addnext(element)
+    return element
+
+def setOptionalText(parent, elemName, value, previousName=None):
+    '''Create, change or delete (if value is None) a text element.
+    
+    New elements are inserted after the sibling previousName'''
+    child = parent.find(tag(elemName))
+    if value:
+        if child is None:
+            child = createElementAfter(parent, previousName, elemName)
+        
+        child.text = unicode(value)
+    elif child is not None:
+        removeElement(child)
+
+def addFields(cls, *fields):
+    '''Add property access for text elements in a DOM to a class'''
+    for field in fields:
+        def getter(self, field=field):
+            return findText(self.xml(), field)
+        
+        def setter(self, value, field=field):
+            getOrCreate(self.writable(), field).text = value
+        
+        setattr(cls, field, property(getter, setter))
+
+class Dependency(pom.Dependency):
+    '''A Maven 2 dependency'''
+    def get_optional(self):
+        return findText(self._pomElement, 'optional') == 'true'
+    
+    def set_optional(self, value):
+        value = 'true' if value else None
+        setOptionalText(self.writable(), 'optional', value, 'version')
+    
+    optional = property(get_optional, set_optional)
+    
+    def get_scope(self):
+        return findText(self._pomElement, 'scope')
+    
+    def set_scope(self, value):
+        setOptionalText(self.writable(), 'scope', value, 'version')
+    
+    scope = property(get_scope, set_scope)
+
+addFields(Dependency, 'groupId', 'artifactId', 'version')
+
+class Profile(pom.Profile):
+    '''A Maven 2 profile'''
+    def activeByDefault(self, bool):
+        activation = getOrCreate(self.writable(), 'activation')
+        getOrCreate(activation, 'activeByDefault').text = 'true' if bool else 'false'
+    
+    def dependencies(self):
+        return [Dependency(d, self._owner) for d in self._pomElement.iterfind(DEPENDENCY_PATH)]
+    
+    def addDependency(self, d):
+        if isinstance(d, pom.Dependency):
+            d = d._pomElement
+        
+        getOrCreate(self.writable(), 'dependencies').append(d)
+        siblingPositions.clear()
+
+addFields(Profile, 'id')
+
+class EtreePomLoader(pom.PomLoader):
+    '''Loads POMs with plain lxml.etree parsers'''
+    def makeParser(self):
+        # Same whitespace handling as objectify so save() creates the same output
+        return etree.XMLParser(resolve_entities=False, recover=True, remove_blank_text=True)
+
+class Pom(pom.Pom):
+    '''A POM file on plain lxml.etree'''
+    def child(self, elem, name):
+        return None if elem is None else elem.find(tag(name))
+    
+    def childText(self, elem, name):
+        return findText(elem, name)
+    
+    def createNew(self):
+        self.xml = etree.parse(StringIO.StringIO(NEW_POM), defaultLoader.parser())
+        self.project = self.xml.getroot()
+    
+    def load(self):
+        self.xml = defaultLoader.parse(self.pomFile)
+    
+    def dependencies(self):
+        '''Get a list of dependencies of this POM'''
+        return [Dependency(d, self) for d in self.project.iterfind(DEPENDENCY_PATH)]
+    
+    def profile(self, profileId):
+        '''Get a Profile instance by ID'''
+        self.makeWritable()
+        profiles = getOrCreate(self.project, 'profiles')
+        
+        for profile in profiles.iterfind(PROFILE):
+            if findText(profile, 'id') == profileId:
+                return Profile(profile, self)
+        
+        return self.createNewProfile(profiles, profileId)
+    
+    def profiles(self):
+        profiles = self.project.find(PROFILES)
+        if profiles is None:
+            return []
+        
+        return [Profile(p, self) for p in profiles.iterfind(PROFILE)]
+    
+    def createNewProfile(self, profiles, profileId):
+        xml = etree.SubElement(profiles, PROFILE)
+        etree.SubElement(xml, ID)
+        
+        profile = Profile(xml, self)
+        profile.id = profileId
+        profile.activeByDefault(False)
+        
+        etree.SubElement(xml, DEPENDENCIES)
+        siblingPositions.clear()
+        
+        return profile
+    
+    def cleanup(self):
+        deps = self.project.find(DEPENDENCIES)
+        if deps is not None and len(deps) == 0:
+            self.project.remove(deps)
+        
+        siblingPositions.clear()
+
+EtreePomLoader.pomClass = Pom
+
+defaultLoader = EtreePomLoader()
+
+# The POMs of this module can't share the XML with the ones of m4e.pom
+pomCache = PomCache(loader=defaultLoader)
@@ -0,0 +1,258 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Dependency graph of the artifacts in a Maven 2 repository
+
+Every groupId:artifactId is mapped to an integer ID. The edges are kept
+in two compressed sparse row (CSR) structures, one for the dependencies
+and one for the reverse direction, both backed by arrays of ints.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+from array import array
+from itertools import izip
+
+class DependencyGraph(object):
+    '''A directed graph "artifact -> dependency".
+    
+    Add nodes and edges, then call freeze() before running any queries.'''
+    def __init__(self):
+        self.ids = {}
+        self.keys = []
+        
+        self._sources = array('l')
+        self._targets = array('l')
+        
+        self.frozen = False
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def __repr__(self):
+        return 'DependencyGraph(%d nodes, %d edges)' % (len(self.keys), self.edgeCount())
+    
+    def intern(self, key):
+        '''Get the ID for a key. Unknown keys get a new ID.'''
+        id = self.ids.get(key, None)
+        if id is None:
+            if self.frozen:
+                raise RuntimeError("Can't add node %s to a frozen graph" % key)
+            
+            id = len(self.keys)
+            self.ids[key] = id
+            self.keys.append(key)
+        
+        return id
+    
+    def id(self, key):
+        '''Get the ID of a key or None if the key isn't part of the graph'''
+        return self.ids.get(key, None)
+    
+    def addEdge(self, fromKey, toKey):
+        '''Add the edge "fromKey depends on toKey". Duplicate edges are ignored.'''
+        if self.frozen:
+            raise RuntimeError("Can't add edge %s -> %s to a frozen graph" % (fromKey, toKey))
+        
+        self._sources.append(self.intern(fromKey))
+        self._targets.append(self.intern(toKey))
+    
+    def freeze(self):
+        '''Build the CSR arrays from the edges added so far'''
+        n = len(self.keys)
+        
+        self.forwardOffsets, self.forwardTargets = buildCSR(n, self._sources, self._targets)
+        self.reverseOffsets, self.reverseTargets = buildCSR(n, self._targets, self._sources)
+        
+        self._sources = None
+        self._targets = None
+        self.frozen = True
+    
+    def edgeCount(self):
+        if not self.frozen:
+            return len(self._sources)
+        
+        return len(self.forwardTargets)
+    
+    def dependencyIds(self, id):
+        return self.forwardTargets[self.forwardOffsets[id]:self.forwardOffsets[id+1]]
+    
+    def dependentIds(self, id):
+        return self.reverseTargets[self.reverseOffsets[id]:self.reverseOffsets[id+1]]
+    
+    def dependencies(self, key):
+        '''Get the keys of all direct dependencies of key'''
+        return self._toKeys(key, self.dependencyIds)
+    
+    def dependents(self, key):
+        '''Get the keys of all artifacts which directly depend on key'''
+        return self._toKeys(key, self.dependentIds)
+    
+    def transitiveDependencies(self, key):
+        '''Get the keys of all direct and indirect dependencies of key'''
+        return self._toKeys(key, lambda id: self.reachable(id, self.forwardOffsets, self.forwardTargets))
+    
+    def transitiveDependents(self, key):
+        '''Get the keys of all artifacts which directly or indirectly depend on key'''
+        return self._toKeys(key, lambda id: self.reachable(id, self.reverseOffsets, self.reverseTargets))
+    
+    def _toKeys(self, key, func):
+        id = self.ids.get(key, None)
+        if id is None:
+            return []
+        
+        keys = self.keys
+        result = [keys[i] for i in func(id)]
+        result.sort()
+        return result
+    
+    def reachable(self, start, offsets, targets):
+        '''Get the IDs of all nodes which can be reached from start.
+        
+        start itself is only part of the result when it's part of a cycle.'''
+        seen = bytearray(len(self.keys))
+        result = []
+        stack = [start]
+        
+        while stack:
+            id = stack.pop()
+            for i in xrange(offsets[id], offsets[id+1]):
+                target = targets[i]
+                if seen[target]:
+                    continue
+                
+                seen[target] = 1
+                result.append(target)
+                stack.append(target)
+        
+        return result
+    
+    def stronglyConnectedComponents(self):
+        '''Get the strongly connected components of the graph as lists of IDs.
+        
+        This is an iterative version of Tarjan's algorithm, so deep graphs
+        can't overflow the Python stack.'''
+        n = len(self.keys)
+        offsets = self.forwardOffsets
+        targets = self.forwardTargets
+        
+        UNVISITED = -1
+        index = array('l', [UNVISITED]) * n
+        lowlink = array('l', [0]) * n
+        onStack = bytearray(n)
+        stack = []
+        result = []
+        counter = 0
+        
+        for root in xrange(n):
+            if index[root] != UNVISITED:
+                continue
+            
+            # Each work item is a node plus the position of the next edge to follow
+            work = [(root, offsets[root])]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            onStack[root] = 1
+            
+            while work:
+                id, pos = work[-1]
+                end = offsets[id+1]
+                
+                while pos < end:
+                    target = targets[pos]
+                    pos += 1
+                    
+                    if index[target] == UNVISITED:
+                        break
+                    
+                    if onStack[target] and index[target] < lowlink[id]:
+                        lowlink[id] = index[target]
+                else:
+                    target = None
+                
+                if target is not None:
+                    work[-1] = (id, pos)
+                    
+                    index[target] = lowlink[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    onStack[target] = 1
+                    work.append((target, offsets[target]))
+                    continue
+                
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[id] < lowlink[parent]:
+                        lowlink[parent] = lowlink[id]
+                
+                if lowlink[id] == index[id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        onStack[member] = 0
+                        component.append(member)
+                        if member == id:
+                            break
+                    
+                    result.append(component)
+        
+        return result
+    
+    def cycles(self):
+        '''Get all dependency cycles as sorted lists of keys.
+        
+        An artifact which depends on itself is a cycle, too.'''
+        keys = self.keys
+        result = []
+        
+        for component in self.stronglyConnectedComponents():
+            if len(component) == 1:
+                id = component[0]
+                if id not in self.dependencyIds(id):
+                    continue
+            
+            cycle = [keys[id] for id in component]
+            cycle.sort()
+            result.append(cycle)
+        
+        result.sort()
+        return result
+
+def buildCSR(n, sources, targets):
+    '''Build the offset and target arrays for the edges sources[i] -> targets[i].
+    
+    The targets of each node are sorted and duplicates are removed.'''
+    counts = array('l', [0]) * (n + 1)
+    for source in sources:
+        counts[source + 1] += 1
+    
+    for i in xrange(n):
+        counts[i + 1] += counts[i]
+    
+    unsorted = array('l', [0]) * len(sources)
+    pos = counts[:n]
+    for source, target in izip(sources, targets):
+        unsorted[pos[source]] = target
+        pos[source] += 1
+    
+    offsets = array('l', [0]) * (n + 1)
+    result = array('l')
+    for i in xrange(n):
+        row = list(set(unsorted[counts[i]:counts[i+1]]))
+        row.sort()
+        result.extend(row)
+        offsets[i + 1] = len(result)
+    
+    return offsets, result
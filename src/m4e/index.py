@@ -0,0 +1,161 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+A compact index of the artifacts and dependencies in a Maven 2 repository
+
+The index can be saved next to the repository. It remembers the
+modification times of all directories of the repository; when one of
+them changes, the cached index is stale and must be built again.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import logging
+from common import loadPickle, savePickle
+from pom import PomLoader
+from pomcache import pomCache
+from version import versionKey
+
+log = logging.getLogger('m4e.index')
+
+class RepoIndex(object):
+    '''Coordinates, dependencies and files of all POMs in a repository'''
+    
+    # Increment when the layout of the data changes
+    FORMAT = 1
+    
+    # Number of threads which read the POMs while they are parsed
+    readThreads = 4
+    
+    def __init__(self, repoDir):
+        self.repoDir = repoDir
+        
+        # groupId:artifactId -> { version: path of POM relative to repoDir }
+        self.coordinates = {}
+        # groupId:artifactId:version -> [(groupId:artifactId, version, scope)]
+        self.dependencies = {}
+        # groupId:artifactId -> [(groupId:artifactId:version, version)]
+        self.dependents = {}
+        # groupId:artifactId:version -> [file types]
+        self.files = {}
+        # path of directory relative to repoDir -> mtime
+        self.dirMTimes = {}
+    
+    def __repr__(self):
+        return 'RepoIndex(%s, %d artifacts)' % (self.repoDir, len(self.files))
+    
+    def build(self):
+        '''Build the index by reading all POMs in the repository'''
+        log.info('Building index of %s...', self.repoDir)
+        loader = PomLoader(self.readThreads, cache=pomCache)
+        for pom in loader.loadMany(self.findPoms(self.repoDir, '')):
+            self.addPom(pom, os.path.relpath(pom.pomFile, self.repoDir))
+        
+        for l in self.dependents.itervalues():
+            l.sort()
+        
+        log.info('Found %d artifacts', len(self.files))
+    
+    def findPoms(self, root, relPath):
+        self.dirMTimes[relPath] = os.stat(root).st_mtime
+        
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            
+            if os.path.isdir(path):
+                for pomFile in self.findPoms(path, os.path.join(relPath, name)):
+                    yield pomFile
+            elif path.endswith('.pom'):
+                yield path
+    
+    def addPom(self, pom, relPath):
+        log.debug('Indexing %s', pom.pomFile)
+        
+        key = intern(pom.key())
+        shortKey = intern(pom.shortKey())
+        version = key[len(shortKey)+1:]
+        
+        self.coordinates.setdefault(shortKey, {})[version] = relPath
+        self.files[key] = pom.files()
+        
+        dependencies = []
+        for d in pom.dependencies():
+            dependencyKey = intern('%s:%s' % (d.groupId, d.artifactId))
+            dependencies.append((dependencyKey, d.version, d.scope))
+            self.dependents.setdefault(dependencyKey, []).append((key, d.version))
+        
+        self.dependencies[key] = dependencies
+    
+    def isStale(self):
+        '''Check whether any directory of the repository was changed since the index was built'''
+        for relPath, mtime in self.dirMTimes.iteritems():
+            try:
+                if os.stat(os.path.join(self.repoDir, relPath)).st_mtime != mtime:
+                    return True
+            except OSError:
+                return True
+        
+        return False
+    
+    def save(self, fileName):
+        savePickle(fileName, self.FORMAT, self.__dict__)
+    
+    def versions(self, shortKey):
+        '''Get all versions of an artifact, sorted'''
+        result = self.coordinates.get(shortKey, {}).keys()
+        result.sort(key=versionKey)
+        return result
+    
+    def keys(self, coordinate):
+        '''Expand groupId:artifactId or groupId:artifactId:version into
+        a list of groupId:artifactId:version'''
+        parts = coordinate.split(':')
+        if len(parts) == 3:
+            return [coordinate] if coordinate in self.files else []
+        
+        if len(parts) != 2:
+            raise ValueError('Expected groupId:artifactId or groupId:artifactId:version: [%s]' % coordinate)
+        
+        return ['%s:%s' % (coordinate, version) for version in self.versions(coordinate)]
+
+def loadIndex(repoDir, fileName):
+    '''Load a cached index. Returns None if there is no usable index in the file.'''
+    data = loadPickle(fileName, RepoIndex.FORMAT, 'index')
+    if data is None:
+        return None
+    
+    index = RepoIndex(repoDir)
+    index.__dict__.update(data)
+    
+    if index.repoDir != repoDir or index.isStale():
+        return None
+    
+    return index
+
+def getIndex(repoDir, fileName=None, rebuild=False):
+    '''Load the cached index of a repository. If it's missing or stale,
+    build a new index and save it.'''
+    if fileName is None:
+        fileName = repoDir + '-index.pickle'
+    
+    index = None if rebuild else loadIndex(repoDir, fileName)
+    if index is not None:
+        log.debug('Loaded %r from %s', index, fileName)
+        return index
+    
+    index = RepoIndex(repoDir)
+    index.build()
+    index.save(fileName)
+    
+    return index
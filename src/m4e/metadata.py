@@ -0,0 +1,117 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+maven-metadata.xml files for the artifacts in a Maven 2 repository
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import logging
+from lxml import etree
+from common import loadPickle, savePickle, writeIfChanged
+from pom import coordinatesFromPath
+from version import mavenVersionKey
+
+log = logging.getLogger('m4e.metadata')
+
+METADATA_FILE = 'maven-metadata.xml'
+
+def findPoms(root):
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        
+        if os.path.isdir(path):
+            for pomFile in findPoms(path):
+                yield pomFile
+        elif name.endswith('.pom'):
+            yield path
+
+def scanRepository(repoDir):
+    '''Get the versions of all artifacts in a repository from the paths of the POMs.
+    
+    Returns a dict (groupId, artifactId) -> sorted tuple of versions.'''
+    artifacts = {}
+    for path in findPoms(repoDir):
+        coordinates = coordinatesFromPath(repoDir, path)
+        if coordinates is None:
+            log.warning("Ignoring %s: The path doesn't match groupId/artifactId/version", path)
+            continue
+        
+        groupId, artifactId, version = coordinates
+        artifacts.setdefault((groupId, artifactId), set()).add(version)
+    
+    result = {}
+    for key, versions in artifacts.iteritems():
+        result[key] = tuple(sorted(versions, key=mavenVersionKey))
+    return result
+
+def metadataPath(repoDir, groupId, artifactId):
+    return os.path.join(repoDir, groupId.replace('.', os.sep), artifactId, METADATA_FILE)
+
+def isRelease(version):
+    return not version.upper().endswith('SNAPSHOT')
+
+def addTextElement(parent, name, value):
+    etree.SubElement(parent, name).text = value
+
+def renderMetadata(groupId, artifactId, versions, lastUpdated):
+    '''Create the content of a maven-metadata.xml file.
+    
+    versions must be sorted; lastUpdated is a timestamp like 20261019153000.'''
+    metadata = etree.Element('metadata')
+    addTextElement(metadata, 'groupId', groupId)
+    addTextElement(metadata, 'artifactId', artifactId)
+    
+    versioning = etree.SubElement(metadata, 'versioning')
+    addTextElement(versioning, 'latest', versions[-1])
+    
+    releases = [v for v in versions if isRelease(v)]
+    if releases:
+        addTextElement(versioning, 'release', releases[-1])
+    
+    elem = etree.SubElement(versioning, 'versions')
+    for version in versions:
+        addTextElement(elem, 'version', version)
+    
+    addTextElement(versioning, 'lastUpdated', lastUpdated)
+    
+    return etree.tostring(metadata, xml_declaration=True, encoding='UTF-8', pretty_print=True)
+
+def writeMetadata(task):
+    '''Write one maven-metadata.xml file.
+    
+    task is (path, groupId, artifactId, versions, lastUpdated); see renderMetadata().'''
+    path = task[0]
+    return writeIfChanged(path, renderMetadata(*task[1:]))
+
+class MetadataState(object):
+    '''The versions of all artifacts when the metadata was written the last time'''
+    FORMAT = 1
+    
+    def __init__(self):
+        # (groupId, artifactId) -> sorted tuple of versions
+        self.versions = {}
+    
+    def save(self, fileName):
+        savePickle(fileName, self.FORMAT, self.versions)
+
+def loadState(fileName):
+    '''Load the state of the last run. Returns an empty state if the file can't be used.'''
+    state = MetadataState()
+    
+    versions = loadPickle(fileName, MetadataState.FORMAT, 'metadata state')
+    if versions is not None:
+        state.versions = versions
+    
+    return state
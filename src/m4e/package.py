@@ -0,0 +1,229 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Write a Maven 2 repository into a tar.gz or zip archive
+
+JARs are already compressed, so they are stored as they are. Everything
+else (POMs, metadata, checksums) is compressed by several processes.
+
+A .tar.gz is written as a series of gzip members (one per chunk of the
+tar stream) which gunzip and tar read like a single one. Inside of a
+member, the data of big JARs is stored while everything else, including
+the tar headers of the JARs, is compressed.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import re
+import time
+import zlib
+import inspect
+import struct
+import zipfile
+import multiprocessing
+
+# Files which are never put into the archive, including rotated logs like x.log.1
+IGNORED_PATTERN = re.compile(r'\.(bak|tmp|log(\.\d+)?)$')
+
+# Files which are already compressed
+STORED_SUFFIXES = ('.jar', '.zip', '.gz', '.tgz')
+
+COMPRESS_LEVEL = 6
+
+# Smaller JARs are compressed with the rest; this isn't worth a stored segment
+STORE_THRESHOLD = 64 * 1024
+
+# The tar stream is compressed in chunks of this size
+CHUNK_SIZE = 1024 * 1024
+
+def isIgnored(name):
+    return IGNORED_PATTERN.search(name) is not None
+
+def isStored(name):
+    return name.endswith(STORED_SUFFIXES)
+
+def findFiles(root):
+    '''Yield all files in root which belong into the archive in a stable order'''
+    names = os.listdir(root)
+    names.sort()
+    
+    for name in names:
+        path = os.path.join(root, name)
+        
+        if os.path.isdir(path):
+            for result in findFiles(path):
+                yield result
+        elif not isIgnored(name):
+            yield path
+
+def deflate(data, level):
+    '''Compress data without zlib header and trailer (as in gzip and zip files)'''
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+def gzipMember(task):
+    '''Compress one chunk into a complete gzip member.
+    
+    task is a list of segments (data, level); level 0 stores the data.
+    Each segment is compressed on its own; a sync flush ends all but the
+    last one, so the results can be concatenated into one deflate stream.'''
+    result = ['\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff']
+    crc = 0
+    size = 0
+    
+    last = len(task) - 1
+    for i, (data, level) in enumerate(task):
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        result.append(compressor.compress(data))
+        result.append(compressor.flush(zlib.Z_FINISH if i == last else zlib.Z_SYNC_FLUSH))
+        
+        crc = zlib.crc32(data, crc)
+        size += len(data)
+    
+    result.append(struct.pack('<II', crc & 0xffffffff, size & 0xffffffff))
+    return ''.join(result)
+
+def deflateFile(path):
+    '''Returns (CRC, size, compressed data) of a file for a zip archive'''
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    
+    return zlib.crc32(data) & 0xffffffff, len(data), deflate(data, COMPRESS_LEVEL)
+
+class GzipWriter(object):
+    '''A file object which compresses everything written to it into gzip members.
+    
+    Chunks are compressed by a pool of processes; the results are written
+    to fileobj in order. Change level to store or compress the data which
+    is written next; this doesn't start a new chunk.'''
+    def __init__(self, fileobj, processes=None):
+        self.fileobj = fileobj
+        self.level = COMPRESS_LEVEL
+        
+        self.pool = multiprocessing.Pool(processes)
+        # At most this many chunks wait for the pool
+        self.maxPending = 2 * (processes or multiprocessing.cpu_count())
+        self.pending = []
+        
+        # [([data], level)] of the next chunk
+        self.segments = []
+        self.bufferSize = 0
+        
+        # Bytes before and after compression
+        self.size = 0
+        self.compressedSize = 0
+    
+    def tell(self):
+        return self.size
+    
+    def write(self, data):
+        segments = self.segments
+        if segments and segments[-1][1] == self.level:
+            segments[-1][0].append(data)
+        else:
+            segments.append(([data], self.level))
+        
+        self.bufferSize += len(data)
+        self.size += len(data)
+        
+        if self.bufferSize >= CHUNK_SIZE:
+            self.flushBuffer()
+    
+    def flushBuffer(self):
+        if not self.segments:
+            return
+        
+        task = [(''.join(parts), level) for parts, level in self.segments]
+        self.segments = []
+        self.bufferSize = 0
+        
+        self.pending.append(self.pool.apply_async(gzipMember, (task,)))
+        while len(self.pending) > self.maxPending:
+            self.writeResult()
+    
+    def writeResult(self):
+        data = self.pending.pop(0).get()
+        self.fileobj.write(data)
+        self.compressedSize += len(data)
+    
+    def close(self):
+        try:
+            self.flushBuffer()
+            while self.pending:
+                self.writeResult()
+        finally:
+            self.pool.close()
+            self.pool.join()
+
+class StoredPayload(object):
+    '''Wraps a file for TarFile.addfile() to store its data in a GzipWriter.
+    
+    addfile() writes the tar header before it reads the file, so the
+    header is still compressed. Set the level of the writer back after
+    addfile().'''
+    def __init__(self, fileobj, writer):
+        self.fileobj = fileobj
+        self.writer = writer
+    
+    def read(self, size=-1):
+        self.writer.level = 0
+        return self.fileobj.read(size)
+
+def zipInfo(path, arcname, compressType):
+    st = os.stat(path)
+    
+    info = zipfile.ZipInfo(arcname, time.localtime(st.st_mtime)[:6])
+    info.compress_type = compressType
+    info.external_attr = (st.st_mode & 0xFFFF) << 16
+    return info
+
+def hasZipfileInternals():
+    '''Check that zipfile.ZipFile has the internals which writeDeflated() uses.
+    
+    They are the same in all releases of Python 2.7 which have the zip64
+    argument of ZipInfo.FileHeader(); zipfile of Python 2 won't change
+    anymore.'''
+    try:
+        args = inspect.getargspec(zipfile.ZipInfo.FileHeader)[0]
+    except TypeError:
+        return False
+    
+    return 'zip64' in args and hasattr(zipfile.ZipFile, '_writecheck')
+
+ZIPFILE_INTERNALS = hasZipfileInternals()
+
+def writeDeflated(archive, info, crc, size, data):
+    '''Add a file to a zipfile.ZipFile which was compressed by deflateFile().
+    
+    This is what ZipFile.writestr() does without compressing the data again.
+    Without the internals of zipfile (see hasZipfileInternals()), the data
+    is decompressed and added with writestr().'''
+    if not ZIPFILE_INTERNALS:
+        archive.writestr(info, zlib.decompress(data, -zlib.MAX_WBITS))
+        return
+    
+    info.file_size = size
+    info.CRC = crc
+    info.compress_size = len(data)
+    info.header_offset = archive.fp.tell()
+    
+    archive._writecheck(info)
+    archive._didModify = True
+    
+    zip64 = info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+    archive.fp.write(info.FileHeader(zip64))
+    archive.fp.write(data)
+    
+    archive.filelist.append(info)
+    archive.NameToInfo[info.filename] = info
@@ -18,9 +18,9 @@ Created on Apr 7, 2011
 
 import os.path
 import logging
-import re
 from lxml import etree, objectify
-from pom import removeElement
+from pom import removeElement, siblingPositions
+from version import VERSION_RANGE_PATTERN
 
 log = logging.getLogger("m4e.patches")
 
@@ -200,7 +200,7 @@ class DependencyPatcher(object):
             if r is None:
                 continue
             
-            log.debug('Found %s in %s' % (key, pom.pomFile))
+            log.debug('Found %s in %s', key, pom.pomFile)
             
             tool.replaceDependency(dependency, r.replacement)
         
@@ -213,13 +213,23 @@ class DependencyPatcher(object):
 class StripQualifiers(object):
     '''Strip Eclipse qualifiers from versions'''
     def __init__(self):
-        self.versionRangePattern = re.compile('^([\[\]()])([^,]*),([^,]*)([\[\]()])$')
+        self.versionRangePattern = VERSION_RANGE_PATTERN
+        
+        # The same versions show up in many POMs
+        self.cache = {}
     
     def run(self, pom):
         for d in pom.dependencies():
             d.version = self.stripQualifier(d.version)
 
     def stripQualifier(self, version):
+        try:
+            return self.cache[version]
+        except KeyError:
+            result = self.cache[version] = self.stripQualifier1(version)
+            return result
+
+    def stripQualifier1(self, version):
         m = self.versionRangePattern.match(version)
         if m is None:
             return self.stripQualifier2(version)
@@ -307,5 +317,11 @@ class PatchTool(object):
         self.patches = patches
     
     def apply(self, pom):
+        # The patches change the XML directly
+        pom.makeWritable()
+        siblingPositions.clear()
+        
         for patch in self.patches:
             patch.run(pom)
+        
+        siblingPositions.clear()
@@ -17,7 +17,12 @@ Created on Apr 7, 2011
 '''
 
 import os.path
+import copy
+import weakref
 import StringIO
+import threading
+from collections import deque
+from multiprocessing.pool import ThreadPool
 from lxml import etree, objectify
 
 POM_NS = 'http://maven.apache.org/POM/4.0.0'
@@ -26,36 +31,119 @@ NAMESPACES = {
     'pom': POM_NS,
 }
 
+# Template for new POMs
+NEW_POM = '''<project xmlns="http://maven.apache.org/POM/4.0.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 http://maven.apache.org/xsd/maven-4.0.0.xsd">
+  <modelVersion>4.0.0</modelVersion>
+  <groupId/>
+  <artifactId/>
+  <version/>
+</project>
+'''
+
 def xmlPath(element):
     '''Return a simple, unambiguous path for an XML element'''
     path = []
     
     while True:
         parent = element.getparent()
-        name = element.tag
+        tag = element.tag
+        name = tag
         if name.startswith(POM_NS_PREFIX):
             name = name[len(POM_NS_PREFIX):]
         
         if parent is None:
-            path.insert(0, '/%s' % name)
+            path.append('/%s' % name)
             break
         
-        expr = etree.ETXPath(element.tag)
-        children = expr(parent)
-        #print 'xmlPath',element.tag,children
-        index = children.index(element)
-        
-        if len(children) == 1:
+        index, count = siblingPositions.lookup(parent, element)
+        if count == 1:
             item = '/%s' % name
         else:
             item = '/%s[%d]' % (name, index)
         
-        path.insert(0, item)
+        path.append(item)
         
         element = parent
     
+    path.reverse()
     return ''.join(path)
 
+class SiblingPositions(object):
+    '''Positions of elements among their siblings with the same tag.
+    
+    The positions of all children of a parent are computed in a single
+    pass and kept for the most recently used parents. Before an entry is
+    used, lookup() checks that the parent still has the same last child
+    and that the element still has the same neighbours; otherwise the
+    positions are computed again. That catches most code which changes
+    the XML directly without making every lookup O(n). Call clear() after
+    other changes; the functions and classes in this module do it
+    themselves.'''
+    def __init__(self, size=8):
+        self.size = size
+        self.clear()
+    
+    def clear(self):
+        # [(parent, children, {id(child): (position, index)}, {tag: count})], the most recently used last
+        self.entries = []
+    
+    def lookup(self, parent, element):
+        '''Returns the index of element among the siblings with the same
+        tag and the number of these siblings'''
+        entry = self.entry(parent)
+        if entry is not None:
+            found = entry[2].get(id(element))
+            if found is not None and self.isValid(parent, entry[1], found[0], element):
+                return found[1], entry[3][element.tag]
+            
+            self.entries.remove(entry)
+        
+        entry = self.compute(parent)
+        return entry[2][id(element)][1], entry[3][element.tag]
+    
+    def entry(self, parent):
+        entries = self.entries
+        for i in range(len(entries) - 1, -1, -1):
+            entry = entries[i]
+            if entry[0] is parent:
+                del entries[i]
+                entries.append(entry)
+                return entry
+        
+        return None
+    
+    def isValid(self, parent, children, position, element):
+        previous = children[position - 1] if position > 0 else None
+        next = children[position + 1] if position + 1 < len(children) else None
+        return element.getprevious() is previous \
+            and element.getnext() is next \
+            and lastChild(parent) is children[-1]
+    
+    def compute(self, parent):
+        # objectify elements compare and hash by their text, so the key is the id().
+        # Keeping the children in the entry keeps their proxies alive, so the ids
+        # can't be reused by other objects while the entry exists.
+        children = list(parent.iterchildren())
+        positions = {}
+        counts = {}
+        for position, child in enumerate(children):
+            tag = child.tag
+            index = counts.get(tag, 0)
+            positions[id(child)] = (position, index)
+            counts[tag] = index + 1
+        
+        entry = (parent, children, positions, counts)
+        self.entries.append(entry)
+        del self.entries[:-self.size]
+        
+        return entry
+
+def lastChild(parent):
+    # objectify's [] only looks at the siblings with the same tag
+    return etree._Element.__getitem__(parent, -1)
+
+siblingPositions = SiblingPositions()
+
 #objectify.Element.__repr__ = lambda self: xmlPath(self)
 
 def removeElement(element):
@@ -67,23 +155,25 @@ def removeElement(element):
         previous.tail = element.tail
     
     parent.remove(element)
+    siblingPositions.clear()
 
 def createElementAfter(parent, previousName, tag):
     '''Add an element after a sibling or append it if the sibling doesn't exist'''
+    siblingPositions.clear()
+    
     if previousName is None:
         return etree.SubElement(parent, '%s%s' % (POM_NS_PREFIX, tag))
     
     previous = getattr(parent, previousName, None)
     if previous is None:
-        index = len(parent)
-        previous = parent[index-1]
-    else:
-        index = parent.index(previous) + 1
+        previous = parent[-1]
     
-    element = etree.Element('%s%s' % (POM_NS_PREFIX, tag))
+    # SubElement() makes objectify pick the right class for a text element
+    element = etree.SubElement(parent, '%s%s' % (POM_NS_PREFIX, tag))
     element.tail = previous.tail
     previous.tail = parent.text
-    parent.insert(index, element)
+    previous.addnext(element)
+    return element
 
 def addFields(cls, *fields):
     '''Add property access for text elements in a DOM to a class'''
@@ -92,7 +182,7 @@ def addFields(cls, *fields):
             return text(self.xml(), field)
         
         def setter(self, value, field=field):
-            elem = getattr(self.xml(), field)
+            elem = getattr(self.writable(), field)
             elem._setText(value)
         
         setattr(cls, 'get_%s' + field, getter)
@@ -129,11 +219,31 @@ def setOptionalText(parent, elemName, value, previousName=None):
         if child is not None:
             removeElement(child)
 
-class Dependency(object):
-    '''This class maps the standard fields of a Maven 2 dependency between Python and XML'''
-    def __init__(self, pomElement):
+class PomElement(object):
+    '''Base class for wrappers of XML elements of a Pom.
+    
+    owner is the Pom which the element belongs to. As long as its XML is
+    shared (see PomCache), the wrapper registers itself with the owner;
+    the first change copies the XML and moves the wrapper to the copy.'''
+    def __init__(self, pomElement, owner=None):
         self._pomElement = pomElement
+        self._owner = owner
+        
+        if owner is not None and owner.shared:
+            owner.views[id(self)] = self
+    
+    def xml(self):
+        return self._pomElement
     
+    def writable(self):
+        '''Get the element for a change; see Pom.makeWritable()'''
+        if self._owner is not None:
+            self._owner.makeWritable()
+        
+        return self._pomElement
+
+class Dependency(PomElement):
+    '''This class maps the standard fields of a Maven 2 dependency between Python and XML'''
     def __repr__(self):
         return '%s:%s:%s' % (self.groupId, self.artifactId, self.version)
     
@@ -144,18 +254,15 @@ class Dependency(object):
         return ((self.groupId, self.artifactId, self.version) ==
                 (other.groupId, other.artifactId, other.version))
     
-    def xml(self):
-        return self._pomElement
-    
     def remove(self):
-        removeElement(self._pomElement)
+        removeElement(self.writable())
     
     def get_optional(self):
         return text(self._pomElement, 'optional') == 'true'
 
     def set_optional(self, value):
         value = 'true' if value else None
-        setOptionalText(self._pomElement, 'optional', value, 'version')
+        setOptionalText(self.writable(), 'optional', value, 'version')
         
     optional = property(get_optional, set_optional)
 
@@ -163,18 +270,15 @@ class Dependency(object):
         return text(self._pomElement, 'scope')
 
     def set_scope(self, value):
-        setOptionalText(self._pomElement, 'scope', value, 'version')
+        setOptionalText(self.writable(), 'scope', value, 'version')
         
     scope = property(get_scope, set_scope)
 
 # Add the standard cases
 addFields(Dependency, 'groupId', 'artifactId', 'version')
 
-class Profile(object):
+class Profile(PomElement):
     '''This class offers support for Maven 2 profile elements'''
-    def __init__(self, pomElement):
-        self._pomElement = pomElement
-    
     def __repr__(self):
         return 'profile<%s>' % (self.id,)
     
@@ -184,11 +288,8 @@ class Profile(object):
     def __eq__(self, other):
         return self.id == other.id
     
-    def xml(self):
-        return self._pomElement
-    
     def activeByDefault(self, bool):
-        activation = getOrCreate(self._pomElement, 'activation')
+        activation = getOrCreate(self.writable(), 'activation')
         activeByDefault = getOrCreate(activation, 'activeByDefault')
         activeByDefault._setText( 'true' if bool else 'false' )
 
@@ -202,7 +303,7 @@ class Profile(object):
         if result is None:
             return []
         
-        return [Dependency(d) for d in result]
+        return [Dependency(d, self._owner) for d in result]
 
     def addDependency(self, d):
         if isinstance(d, Dependency):
@@ -211,7 +312,8 @@ class Profile(object):
         objectify.deannotate(d)
         etree.cleanup_namespaces(d)
 
-        self._pomElement.dependencies.append(d)
+        self.writable().dependencies.append(d)
+        siblingPositions.clear()
 
 addFields(Profile, 'id')
 
@@ -223,54 +325,142 @@ def getOrCreate(elem, childName):
         #print 'Create child',childName,'in',elem
         #print elem.getchildren()
         child = etree.SubElement(elem, POM_NS_PREFIX+childName)
+        siblingPositions.clear()
     return child
 
 class Pom(object):
-    '''Helper class to work with POM files'''
-    def __init__(self, pomFile=None):
+    '''Helper class to work with POM files
+    
+    With repoDir, the POM is loaded lazily: The coordinates are taken from
+    the path of the file and the XML is only parsed when it's needed, for
+    example to get the dependencies or to modify the POM.
+    
+    With verify, the XML is parsed immediately and the coordinates in the
+    XML are compared to the path; the differences end up in mismatches.'''
+    def __init__(self, pomFile=None, repoDir=None, verify=False, xml=None):
         self.pomFile = pomFile
+        self.pathCoordinates = None
+        self.verify = verify
+        self.mismatches = []
         
-        if self.pomFile:
-            self.load()
+        # True if the XML is shared with other instances (see PomCache)
+        self.shared = False
+        # Wrappers for elements of the shared XML; makeWritable() moves them to the copy
+        self.views = weakref.WeakValueDictionary()
+        
+        if not self.pomFile:
+            return
+        
+        if repoDir:
+            self.pathCoordinates = coordinatesFromPath(repoDir, pomFile)
+        
+        if xml is not None:
+            self.parse(xml)
+        elif self.pathCoordinates is None or verify:
+            self.parse()
+    
+    def __getattr__(self, name):
+        # Only called when the attribute doesn't exist, i.e. for lazy POMs
+        # which haven't been parsed, yet
+        if name in ('xml', 'project') and self.__dict__.get('pomFile'):
+            self.parse()
+            return self.__dict__[name]
+        
+        raise AttributeError(name)
+    
+    def isLoaded(self):
+        return 'xml' in self.__dict__
     
+    def makeWritable(self):
+        '''Copy the XML if it's shared with other instances.
+        
+        Call this before modifying the XML directly; the methods of
+        this class and of Dependency and Profile do it themselves.'''
+        if self.pomFile and not self.isLoaded():
+            self.parse()
+        
+        if self.shared:
+            shared = self.xml
+            self.xml = copy.deepcopy(shared)
             self.project = self.xml.getroot()
-            #print type(self.xml)
-            #print dir(self.project)
-            #print(isinstance(self.project, objectify.ObjectifiedElement))
-            assert self.project.tag == POM_NS_PREFIX+'project', '%s: Expected <project> as root element but was %s' % (self.pomFile, self.project.tag,)
+            self.shared = False
+            
+            for view in self.views.values():
+                view._pomElement = self.xml.xpath(shared.getpath(view._pomElement))[0]
+            self.views.clear()
+            siblingPositions.clear()
+        
+        return self
+    
+    def parse(self, xml=None):
+        if xml is None:
+            self.load()
+        else:
+            self.xml = xml
+        
+        self.project = self.xml.getroot()
+        assert self.project.tag == POM_NS_PREFIX+'project', '%s: Expected <project> as root element but was %s' % (self.pomFile, self.project.tag,)
         
-            #print self.project.groupId
+        if self.verify and self.pathCoordinates is not None:
+            self.verifyPath()
+    
+    def verifyPath(self):
+        '''Compare the coordinates in the XML with the ones from the path.
+        
+        Returns the list of differences. groupId and version can be
+        inherited from the parent POM.'''
+        project = self.project
+        parent = self.child(project, 'parent')
+        
+        self.mismatches = []
+        for field, expected in zip(('groupId', 'artifactId', 'version'), self.pathCoordinates):
+            value = self.childText(project, field)
+            if value is None and field != 'artifactId':
+                value = self.childText(parent, field)
+            
+            if value != expected:
+                self.mismatches.append('%s is "%s" but the path says "%s"' % (field, value, expected))
+        
+        return self.mismatches
+    
+    def child(self, elem, name):
+        '''Get the child name of elem or None'''
+        return None if elem is None else getattr(elem, name, None)
+    
+    def childText(self, elem, name):
+        '''Get the text of the child name of elem or None'''
+        return text(elem, name)
     
     def createNew(self):
-        self.xml = objectify.parse(StringIO.StringIO('''<project xmlns="http://maven.apache.org/POM/4.0.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 http://maven.apache.org/xsd/maven-4.0.0.xsd">
-  <modelVersion>4.0.0</modelVersion>
-  <groupId/>
-  <artifactId/>
-  <version/>
-</project>
-'''))
+        self.xml = objectify.parse(StringIO.StringIO(NEW_POM))
         self.project = self.xml.getroot()
     
     def load(self):
-        try:
-            # This is necessary to parse POM files with HTML entities
-            parser = objectify.makeparser(resolve_entities=False, recover=True)
-            self.xml = objectify.parse(self.pomFile, parser=parser)
-        except:
-            print 'Error parsing %s' % self.pomFile
-            raise
+        self.xml = defaultLoader.parse(self.pomFile)
+        
+    def coordinates(self):
+        '''(groupId, artifactId, version)
         
+        Lazy POMs which haven't been parsed, yet, return the coordinates
+        from the path. After parsing, the XML wins since it might have
+        been changed.'''
+        if self.pathCoordinates is not None and not self.isLoaded():
+            return self.pathCoordinates
+        
+        project = self.project
+        return (self.childText(project, 'groupId'), self.childText(project, 'artifactId'), self.childText(project, 'version'))
+    
     def key(self):
         '''groupId:artifactId:version'''
-        return '%s:%s:%s' % (text(self.project.groupId), text(self.project.artifactId), text(self.project.version))
+        return '%s:%s:%s' % self.coordinates()
     
     def artifactIdVersion(self):
         '''artifactId:version (without groupId)'''
-        return '%s:%s' % (text(self.project.artifactId), text(self.project.version))
+        return '%s:%s' % self.coordinates()[1:]
     
     def shortKey(self):
         '''groupId:artifactId (without version)'''
-        return '%s:%s' % (text(self.project.groupId), text(self.project.artifactId))
+        return '%s:%s' % self.coordinates()[:2]
     
     def files(self):
         '''Get a list of file types that are available for this artifact. This is usually [jar, pom] or [jar, pom, sources].'''
@@ -278,7 +468,7 @@ class Pom(object):
         l = os.listdir(path)
         
         files = []
-        prefix = '%s-%s' % (text(self.project.artifactId), text(self.project.version))
+        prefix = '%s-%s' % self.coordinates()[1:]
         for item in l:
             if not item.startswith(prefix) or item.endswith('.bak'):
                 continue
@@ -304,16 +494,17 @@ class Pom(object):
         if result is None:
             return []
         
-        return [Dependency(d) for d in result]
+        return [Dependency(d, self) for d in result]
 
     def profile(self, profileId):
         '''Get a Profile instance by ID'''
+        self.makeWritable()
         profiles = getOrCreate(self.project, 'profiles')
         
         l = getattr(profiles, 'profile', [])
         for profile in l:
             if profile.id.text == profileId:
-                return Profile(profile)
+                return Profile(profile, self)
         
         return self.createNewProfile(profiles, profileId)
 
@@ -322,17 +513,18 @@ class Pom(object):
         if profiles is None:
             return []
         
-        return [Profile(p) for p in profiles]
+        return [Profile(p, self) for p in getattr(profiles, 'profile', [])]
 
     def createNewProfile(self, profiles, profileId):
         xml = etree.SubElement(profiles, POM_NS_PREFIX+'profile')
         etree.SubElement(xml, POM_NS_PREFIX+'id')
         
-        profile = Profile(xml)
+        profile = Profile(xml, self)
         profile.id = profileId
         profile.activeByDefault(False)
     
         etree.SubElement(xml, POM_NS_PREFIX+'dependencies')
+        siblingPositions.clear()
         
         return profile
 
@@ -346,8 +538,9 @@ class Pom(object):
         if not fileName:
             fileName = self.pomFile
         
+        self.makeWritable()
+        
         tmp = '%s.tmp' % fileName
-        bak = '%s.bak' % fileName
         
         dir = os.path.dirname(tmp)
         if not os.path.exists(dir):
@@ -356,6 +549,14 @@ class Pom(object):
         if os.path.exists(tmp):
             os.remove(tmp)
         
+        self.cleanup()
+        
+        self.xml.write(tmp, encoding="UTF-8", pretty_print=True)
+        
+        replaceWithBackup(tmp, fileName)
+    
+    def cleanup(self):
+        '''Prepare the XML for saving'''
         objectify.deannotate(self.xml)
         etree.cleanup_namespaces(self.xml)
         
@@ -363,19 +564,124 @@ class Pom(object):
         if deps is not None and len(deps) == 0:
             self.project.dependencies.remove()
         
-        self.xml.write(tmp, encoding="UTF-8", pretty_print=True)
+        siblingPositions.clear()
+
+def readFile(path):
+    '''Read the whole file. path can also be a file-like object.'''
+    if hasattr(path, 'read'):
+        return path.read()
+    
+    with open(path, 'rb') as fh:
+        return fh.read()
+
+class PomLoader(object):
+    '''Load many POMs
+    
+    Each thread gets its own parser which is reused for all files.
+    loadMany() can read the files in background threads while the
+    POMs are parsed.'''
+    
+    # The class of the POMs which load() creates
+    pomClass = Pom
+    
+    def __init__(self, threads=0, prefetch=32, cache=None):
+        # Number of threads which read files for loadMany(); 0 means read them in the caller's thread
+        self.threads = threads
+        # Maximum number of files which loadMany() keeps in memory
+        self.prefetch = prefetch
+        # Optional PomCache; the POMs share the XML with the cache
+        self.cache = cache
         
-        if os.path.exists(fileName):
-            os.rename(fileName, bak)
+        self.local = threading.local()
+    
+    def parser(self):
+        parser = getattr(self.local, 'parser', None)
+        if parser is None:
+            parser = self.local.parser = self.makeParser()
+        
+        return parser
+    
+    def makeParser(self):
+        # This is necessary to parse POM files with HTML entities
+        return objectify.makeparser(resolve_entities=False, recover=True)
+    
+    def parse(self, path, data=None):
+        '''Parse a POM into an ElementTree. If data is None, the file is read first.'''
+        try:
+            if data is None:
+                data = readFile(path)
             
-        os.rename(tmp, fileName)
+            baseUrl = path if isinstance(path, basestring) else None
+            return etree.fromstring(data, self.parser(), base_url=baseUrl).getroottree()
+        except:
+            print 'Error parsing %s' % path
+            raise
     
-def createPom(repoDir, groupId, artifactId, version):
+    def load(self, path, repoDir=None, verify=False, data=None):
+        if self.cache is not None:
+            return self.cache.get(path, repoDir, verify, data)
+        
+        return self.pomClass(path, repoDir, verify, self.parse(path, data))
+    
+    def loadMany(self, paths, repoDir=None, verify=False):
+        '''Generator which returns a Pom for each path, in the same order'''
+        if not self.threads:
+            for path in paths:
+                yield self.load(path, repoDir, verify)
+            return
+        
+        pool = ThreadPool(self.threads)
+        try:
+            pending = deque()
+            for path in paths:
+                pending.append((path, pool.apply_async(readFile, (path,))))
+                
+                if len(pending) >= self.prefetch:
+                    path, result = pending.popleft()
+                    yield self.load(path, repoDir, verify, result.get())
+            
+            while pending:
+                path, result = pending.popleft()
+                yield self.load(path, repoDir, verify, result.get())
+        finally:
+            pool.terminate()
+            pool.join()
+
+defaultLoader = PomLoader()
+
+def replaceWithBackup(tmp, fileName):
+    '''Rename tmp to fileName. If fileName already exists, it's renamed to fileName.bak first.'''
+    if os.path.exists(fileName):
+        os.rename(fileName, '%s.bak' % fileName)
+        
+    os.rename(tmp, fileName)
+
+def pomPath(repoDir, groupId, artifactId, version):
+    '''Get the path of a POM in a Maven 2 repository'''
     path = os.path.join(*groupId.split('.'))
     path = os.path.join(repoDir, path, artifactId, version)
     
     fileName = '%s-%s.pom' % (artifactId, version)
-    path = os.path.join(path, fileName)
+    return os.path.join(path, fileName)
+
+def coordinatesFromPath(repoDir, path):
+    '''Get (groupId, artifactId, version) from the path of a POM in a Maven 2 repository.
+    
+    This is the reverse of pomPath(). Returns None if the path doesn't
+    follow the layout of a Maven 2 repository.'''
+    relPath = os.path.relpath(path, repoDir)
+    parts = relPath.split(os.sep)
+    if len(parts) < 4 or parts[0] == os.pardir:
+        return None
+    
+    artifactId, version, fileName = parts[-3:]
+    if fileName != '%s-%s.pom' % (artifactId, version):
+        return None
+    
+    return ('.'.join(parts[:-3]), artifactId, version)
+
+def createPom(repoDir, groupId, artifactId, version):
+    path = pomPath(repoDir, groupId, artifactId, version)
     
     pom = Pom()
     pom.createNew()
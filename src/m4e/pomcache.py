@@ -0,0 +1,154 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Cache for parsed POMs
+
+The cache is keyed by the path of the POM; an entry is only used when
+the modification time and the size of the file didn't change. When the
+cache is full, the least recently used entries are dropped.
+
+All Pom instances returned by the cache share the parsed XML. The XML
+in the cache is never changed: The Pom and its Dependency and Profile
+wrappers copy it before the first change; see Pom.makeWritable().
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import logging
+import threading
+from pom import defaultLoader
+
+log = logging.getLogger('m4e.pomcache')
+
+# Fields of the links in the LRU list
+PREVIOUS, NEXT, PATH, STAT, SIZE, XML = range(6)
+
+class PomCache(object):
+    '''LRU cache of parsed POMs.
+    
+    maxEntries limits the number of POMs in the cache, maxBytes the sum
+    of their file sizes. None means no limit.'''
+    def __init__(self, maxEntries=1000, maxBytes=None, loader=None):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.loader = loader or defaultLoader
+        
+        self.lock = threading.Lock()
+        self.clear()
+    
+    def __repr__(self):
+        return 'PomCache(%d entries, %d bytes)' % (len(self.links), self.bytes)
+    
+    def __len__(self):
+        return len(self.links)
+    
+    def clear(self):
+        with self.lock:
+            # path -> link in a circular, doubly linked list. root[NEXT] is the least recently used entry.
+            self.links = {}
+            self.root = root = []
+            root[:] = [root, root, None, None, 0, None]
+            self.bytes = 0
+            
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def stats(self):
+        return {
+            'entries': len(self.links),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+    
+    def get(self, path, repoDir=None, verify=False, data=None):
+        '''Get a Pom for path which shares the parsed XML with the cache.
+        
+        The Pom copies the XML before it's changed.'''
+        pom = self.loader.pomClass(path, repoDir, verify, self.xml(path, data))
+        pom.shared = True
+        return pom
+    
+    def xml(self, path, data=None):
+        '''Get the parsed XML of path. Don't modify it.
+        
+        data is the content of the file if the caller already read it.'''
+        stat = os.stat(path)
+        key = (stat.st_mtime, stat.st_size)
+        
+        xml = self.lookup(path, key)
+        if xml is None:
+            xml = self.loader.parse(path, data)
+            self.add(path, key, stat.st_size, xml)
+        
+        return xml
+    
+    def lookup(self, path, key):
+        with self.lock:
+            link = self.links.get(path, None)
+            if link is None or link[STAT] != key:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            
+            self.unlink(link)
+            self.append(link)
+            return link[XML]
+    
+    def add(self, path, key, size, xml):
+        with self.lock:
+            link = self.links.pop(path, None)
+            if link is not None:
+                self.unlink(link)
+                self.bytes -= link[SIZE]
+            
+            link = [None, None, path, key, size, xml]
+            self.links[path] = link
+            self.append(link)
+            self.bytes += size
+            
+            self.evict()
+    
+    def evict(self):
+        root = self.root
+        
+        while self.links and (
+            (self.maxEntries is not None and len(self.links) > self.maxEntries) or
+            (self.maxBytes is not None and self.bytes > self.maxBytes)
+        ):
+            link = root[NEXT]
+            self.unlink(link)
+            del self.links[link[PATH]]
+            self.bytes -= link[SIZE]
+            self.evictions += 1
+            
+            log.debug('Evicted %s', link[PATH])
+    
+    def unlink(self, link):
+        link[PREVIOUS][NEXT] = link[NEXT]
+        link[NEXT][PREVIOUS] = link[PREVIOUS]
+    
+    def append(self, link):
+        '''Make link the most recently used entry'''
+        root = self.root
+        last = root[PREVIOUS]
+        link[PREVIOUS] = last
+        link[NEXT] = root
+        last[NEXT] = link
+        root[PREVIOUS] = link
+
+pomCache = PomCache()
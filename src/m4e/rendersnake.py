@@ -18,76 +18,154 @@ Created on May 5, 2011
 
 import cgi
 
-__all__ = [ 'HtmlCanvas', 'A' ]
+__all__ = [ 'HtmlCanvas', 'A', 'reportStyles' ]
+
+def escape(text):
+    return cgi.escape(text)
 
 class HtmlCanvas(object):
-    '''A renderer for HTML'''
+    '''A renderer for HTML
+    
+    The output is collected in a buffer. It's written to out when the
+    buffer is full, when the outermost element is closed and by flush()
+    and close(). Use the canvas in a with statement or call close() when
+    the output isn't a complete document.'''
+    
+    # Maximum number of fragments in the buffer
+    bufferSize = 4096
+    
     def __init__(self, out):
         self.out = out
         self.stack = []
+        self.buffer = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, type, value, traceback):
+        self.close()
     
     def write(self, text, escapeNeeded=True):
         if escapeNeeded:
-            text = self.escape(text)
+            text = cgi.escape(text)
+        
+        buffer = self.buffer
+        buffer.append(text)
         
-        self.out.write(text)
+        if not self.stack or len(buffer) >= self.bufferSize:
+            self.flush()
         
         return self
     
+    def flush(self):
+        if self.buffer:
+            self.out.write(''.join(self.buffer))
+            self.buffer = []
+        
+        return self
+    
+    def close(self):
+        '''Write the rest of the buffer. out stays open.'''
+        self.flush()
+    
     def escape(self, text):
-        return cgi.escape(text)
+        return escape(text)
     
     def html_begin(self, tag, attrs=None):
-        self.out.write('<')
-        self.out.write(tag)
-        
+        return self.begin('<%s' % tag, '</%s>' % tag, attrs)
+    
+    def html_end(self, tag):
+        return self.end('</%s>' % tag)
+    
+    def begin(self, openTag, closeTag, attrs):
+        buffer = self.buffer
+        buffer.append(openTag)
         if attrs:
-            attrs.write(self.out)
-            
-        self.out.write('>')
-        
-        self.stack.append('</%s>' % tag)
+            buffer.append(attrs.attrs)
+        buffer.append('>')
         
+        self.stack.append(closeTag)
         return self
     
-    def html_end(self, tag):
-        s = '</%s>' % tag
-        expected = self.stack.pop()
-        if s != expected:
-            raise RuntimeError('Tried to close %s but %s was open' % (expected, s))
-        self.out.write(s)
+    def end(self, closeTag):
+        stack = self.stack
+        expected = stack.pop()
+        if closeTag != expected:
+            raise RuntimeError('Tried to close %s but %s was open' % (expected, closeTag))
+        
+        buffer = self.buffer
+        buffer.append(closeTag)
+        
+        if not stack or len(buffer) >= self.bufferSize:
+            self.flush()
         
         return self
 
 def defineTags(*names):
     '''Add methods in HtmlCanvas to handle all known HTML elements'''
     for name in names:
-        def f(self, attrs=None, name=name):
-            return self.html_begin(name, attrs)
+        # Same as begin() and end() but with precomputed tags and without the extra method call
+        def f(self, attrs=None, openTag='<%s' % name, startTag='<%s>' % name, closeTag='</%s>' % name):
+            if attrs:
+                self.buffer.extend((openTag, attrs.attrs, '>'))
+            else:
+                self.buffer.append(startTag)
+            
+            self.stack.append(closeTag)
+            return self
         
         setattr(HtmlCanvas, name, f)
 
-        def f(self, attrs=None, name=name):
-            return self.html_end(name)
+        def f(self, attrs=None, closeTag='</%s>' % name):
+            stack = self.stack
+            expected = stack.pop()
+            if closeTag != expected:
+                raise RuntimeError('Tried to close %s but %s was open' % (expected, closeTag))
+            
+            buffer = self.buffer
+            buffer.append(closeTag)
+            
+            if not stack or len(buffer) >= self.bufferSize:
+                self.flush()
+            
+            return self
         
         name2 = '_%s' % name
         setattr(HtmlCanvas, name2, f)
 
 defineTags('a', 'br', 'p', 'div', 'h1', 'h2', 'h3', 'h4', 'html', 'head', 'title', 'body', 'span', 'ul', 'li', 'ol', 'style', 'table', 'tr', 'td')
 
+# The values of these attributes are constants in the code, so they are
+# escaped once and the results are kept; see HtmlAttrs.add_attr().
+CONSTANT_ATTRS = frozenset(('class', 'type', 'style', 'border', 'cellpadding', 'cellspacing'))
+constantAttrs = {}
+
 class HtmlAttrs(object):
-    '''Collect all HTML attributes for this element in a list'''
+    '''Collect all HTML attributes for this element.
+    
+    The values of the attributes in CONSTANT_ATTRS are escaped only
+    once; others like href and id are escaped every time.'''
     def __init__(self):
-        self.attrs = []
+        self.attrs = ''
     
     def add_attr(self, name, value):
-        self.attrs.append('%s="%s"' % (name, cgi.escape(value, True)))
+        if name in CONSTANT_ATTRS:
+            key = (name, value)
+            try:
+                text = constantAttrs[key]
+            except KeyError:
+                text = constantAttrs[key] = attr(name, value)
+        else:
+            text = attr(name, value)
+        
+        self.attrs += text
         return self
     
+    def text(self):
+        return self.attrs
+    
     def write(self, out):
-        for attr in self.attrs:
-            out.write(' ')
-            out.write(attr)
+        out.write(self.text())
 
 def defineAttrs(*names):
     '''Add methods in HtmlAttrs to handle all known HTML attributes'''
@@ -101,8 +179,26 @@ def defineAttrs(*names):
         
         setattr(HtmlAttrs, name, f)
 
+def attr(name, value):
+    return ' %s="%s"' % (name, cgi.escape(value, True))
+
 def A():
     '''Helper function to build attribute lists'''
     return HtmlAttrs()
 
 defineAttrs('class_', 'id', 'style', 'href', 'type', 'onclick', 'name', 'border', 'cellpadding', 'cellspacing')
+
+# The style sheet of the reports. It's constant and contains nothing which needs escaping.
+REPORT_STYLES = \
+    '.pom { font-weight: bold; color: #7F0055; font-family: monospace; }\n' \
+    '.dependency { font-weight: bold; color: #55007F; font-family: monospace; }\n' \
+    '.version { font-weight: bold; color: #007F55; font-family: monospace; }\n' \
+    '.files { font-style: italic; }\n' \
+    '.padLeft { padding-left: 10px; }\n' \
+    'tr:hover { background-color: #DFDEF7; }\n'
+
+def reportStyles(html):
+    '''Write the style sheet of the m4e reports'''
+    html.style( A().type('text/css') ).write('\n', False)
+    html.write(REPORT_STYLES, False)
+    html._style().write('\n', False)
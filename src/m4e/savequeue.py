@@ -0,0 +1,211 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Save many POMs in background threads
+
+The POMs are serialized and written to temporary files by worker
+threads. The temporary files are renamed into place in batches, so a
+file is either the old or the new version, never half written.
+
+Backup policies for the files which are replaced:
+
+    none: No backup
+    bak: Rename the old file to *.bak (like Pom.save())
+    archive: Add all old files to a single archive per run
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import time
+import Queue
+import logging
+import tarfile
+import threading
+from lxml import etree
+
+log = logging.getLogger('m4e.savequeue')
+
+BACKUP_POLICIES = ('none', 'bak', 'archive')
+
+class SaveQueue(object):
+    '''Write-behind queue for Pom.save()
+    
+    Call close() at the end to wait for all files to be written; it
+    raises the first error of the worker threads.
+    
+    With threads=0, save() writes the files in the caller's thread.'''
+    def __init__(self, repoDir, threads=2, backup='bak', fsync=False, batchSize=100):
+        if backup not in BACKUP_POLICIES:
+            raise ValueError('Unknown backup policy "%s"; expected one of %s' % (backup, ', '.join(BACKUP_POLICIES)))
+        if threads < 0:
+            raise ValueError('The number of threads must not be negative: %d' % threads)
+        
+        self.repoDir = repoDir
+        self.backup = backup
+        self.fsync = fsync
+        self.batchSize = batchSize
+        
+        self.archivePath = repoDir + '-backup-%s.tar.gz' % time.strftime('%Y%m%d-%H%M%S')
+        self.archive = None
+        
+        # (tmp, fileName) of files which were written but not renamed, yet
+        self.pending = []
+        # Files which were renamed into place
+        self.committed = []
+        self.lock = threading.Lock()
+        self.error = None
+        
+        self.queue = Queue.Queue(threads * batchSize)
+        self.threads = []
+        for i in range(threads):
+            thread = threading.Thread(target=self.worker, name='SaveQueue-%d' % i)
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+    
+    def save(self, pom, fileName=None):
+        '''Queue a POM for saving. Don't change the POM afterwards.'''
+        self.checkError()
+        
+        if not fileName:
+            fileName = pom.pomFile
+        
+        pom.makeWritable()
+        pom.cleanup()
+        
+        if self.threads:
+            self.queue.put((fileName, pom.xml))
+        else:
+            self.write(fileName, pom.xml)
+    
+    def worker(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            
+            try:
+                if self.error is None:
+                    self.write(*item)
+            except Exception as e:
+                log.error('Error saving %s: %s', item[0], e)
+                self.error = e
+    
+    def write(self, fileName, xml):
+        data = etree.tostring(xml, encoding="UTF-8", pretty_print=True)
+        
+        dir = os.path.dirname(fileName)
+        if not os.path.exists(dir):
+            os.makedirs(dir)
+        
+        tmp = '%s.tmp' % fileName
+        try:
+            with open(tmp, 'wb') as fh:
+                fh.write(data)
+        except:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        
+        with self.lock:
+            self.pending.append((tmp, fileName))
+            if len(self.pending) >= self.batchSize:
+                self.commit()
+    
+    def commit(self):
+        '''Rename the pending files into place. Caller must hold the lock.'''
+        log.debug('Committing %d files', len(self.pending))
+        
+        for tmp, fileName in self.pending:
+            if self.backup == 'bak':
+                if os.path.exists(fileName):
+                    os.rename(fileName, '%s.bak' % fileName)
+            elif self.backup == 'archive':
+                self.archiveFile(fileName)
+            
+            os.rename(tmp, fileName)
+            self.committed.append(fileName)
+        
+        self.pending = []
+    
+    def discard(self):
+        '''Delete the temporary files which weren't renamed into place. Caller must hold the lock.'''
+        for tmp, fileName in self.pending:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        
+        self.pending = []
+    
+    def archiveFile(self, fileName):
+        if not os.path.exists(fileName):
+            return
+        
+        if self.archive is None:
+            log.info('Saving backups in %s', self.archivePath)
+            self.archive = tarfile.open(self.archivePath, 'w:gz')
+        
+        self.archive.add(fileName, os.path.relpath(fileName, self.repoDir))
+    
+    def checkError(self):
+        if self.error is not None:
+            raise self.error
+    
+    def close(self):
+        '''Wait until all POMs are saved.
+        
+        After an error, the files which weren't renamed into place, yet,
+        are deleted.'''
+        try:
+            for thread in self.threads:
+                self.queue.put(None)
+            for thread in self.threads:
+                thread.join()
+        
+            self.checkError()
+        
+            with self.lock:
+                self.commit()
+        finally:
+            with self.lock:
+                self.discard()
+            
+            if self.archive is not None:
+                self.archive.close()
+        
+        if self.fsync:
+            self.sync()
+        
+        log.info('Saved %d files', len(self.committed))
+    
+    def sync(self):
+        '''Flush all saved files and their directories to disk'''
+        log.debug('Syncing %d files', len(self.committed))
+        
+        dirs = set()
+        for fileName in self.committed:
+            fsyncPath(fileName)
+            dirs.add(os.path.dirname(fileName))
+        
+        if self.archive is not None:
+            fsyncPath(self.archivePath)
+        
+        for dir in dirs:
+            fsyncPath(dir)
+
+def fsyncPath(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
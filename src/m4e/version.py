@@ -0,0 +1,204 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Parse and compare OSGi/Maven versions and version ranges
+
+Versions are parsed into tuples (major, minor, micro, qualifier) which
+can be compared directly. Like in OSGi, a version without qualifier is
+smaller than the same version with a qualifier.
+
+All parse results are cached since the same version strings show up
+in many POMs.
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import re
+from bisect import bisect_left, bisect_right
+
+VERSION_RANGE_PATTERN = re.compile(r'^([\[\]()])([^,]*),([^,]*)([\[\]()])$')
+EXACT_VERSION_PATTERN = re.compile(r'^\[([^,]*)\]$')
+VERSION_PATTERN = re.compile(r'^(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:[.-]?(.*))?$')
+
+# Key of strings which don't look like versions. They sort before all versions.
+NO_VERSION = (-1, -1, -1, '')
+# Sorts after all versions
+INFINITE_VERSION = (float('inf'),)
+
+# Qualifiers of Maven versions: name, optional number and the rest
+QUALIFIER_PATTERN = re.compile(r'^[.-]?([a-z]*)[.-]?(\d*)(.*)$')
+# Order of the known qualifiers in Maven. The empty qualifier is the release.
+QUALIFIER_RANKS = {
+    'alpha': 0, 'a': 0,
+    'beta': 1, 'b': 1,
+    'milestone': 2, 'm': 2,
+    'rc': 3, 'cr': 3,
+    'snapshot': 4,
+    '': 5, 'ga': 5, 'final': 5,
+    'sp': 6,
+}
+RELEASE_RANK = QUALIFIER_RANKS['']
+# Unknown qualifiers sort after all known ones
+OTHER_RANK = 7
+
+def memoize(func):
+    '''Cache the results of a function with a single, hashable argument'''
+    cache = {}
+    
+    def wrapper(arg):
+        try:
+            return cache[arg]
+        except KeyError:
+            result = cache[arg] = func(arg)
+            return result
+    
+    wrapper.cache = cache
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+@memoize
+def versionKey(version):
+    '''Parse a version into a tuple (major, minor, micro, qualifier).
+    
+    Missing numbers are 0, so "3.6" and "3.6.0" are equal.'''
+    m = VERSION_PATTERN.match(version)
+    if m is None:
+        return NO_VERSION[:3] + (version,)
+    
+    major, minor, micro, qualifier = m.groups()
+    return (int(major), int(minor or 0), int(micro or 0), qualifier or '')
+
+def qualifierKey(qualifier):
+    '''Sort key for the qualifier of a Maven version'''
+    if not qualifier:
+        return (RELEASE_RANK,)
+    
+    name, number, rest = QUALIFIER_PATTERN.match(qualifier).groups()
+    if not name and not number:
+        # Only separators or characters which the pattern doesn't know
+        return (OTHER_RANK, rest, 0, (RELEASE_RANK,)) if rest else (RELEASE_RANK,)
+    
+    rank = QUALIFIER_RANKS.get(name, OTHER_RANK)
+    return (rank, name if rank == OTHER_RANK else '', int(number or 0), qualifierKey(rest))
+
+@memoize
+def mavenVersionKey(version):
+    '''Like versionKey() but the qualifiers are ordered like in Maven:
+    alpha < beta < milestone < rc < SNAPSHOT < release < sp < others.
+    
+    So 1.0-SNAPSHOT sorts before 1.0 and 1.0-rc-1 before 1.0-SNAPSHOT.'''
+    key = versionKey(version)
+    return key[:3] + (qualifierKey(key[3].lower()),)
+
+class VersionRange(object):
+    '''A range of versions. A bound which is None means "unbounded".'''
+    def __init__(self, lower, lowerInclusive, upper, upperInclusive):
+        self.lower = lower
+        self.lowerInclusive = lowerInclusive
+        self.upper = upper
+        self.upperInclusive = upperInclusive
+        
+        self.lowerKey = None if lower is None else versionKey(lower)
+        self.upperKey = None if upper is None else versionKey(upper)
+    
+    def __repr__(self):
+        return '%s%s,%s%s' % (
+            '[' if self.lowerInclusive else '(',
+            '' if self.lower is None else self.lower,
+            '' if self.upper is None else self.upper,
+            ']' if self.upperInclusive else ')',
+        )
+    
+    def contains(self, version):
+        '''Check whether a version is in this range'''
+        key = versionKey(version)
+        
+        if self.lowerKey is not None:
+            if key < self.lowerKey or (key == self.lowerKey and not self.lowerInclusive):
+                return False
+        
+        if self.upperKey is not None:
+            if key > self.upperKey or (key == self.upperKey and not self.upperInclusive):
+                return False
+        
+        return True
+    
+    def satisfiedBy(self, sortedKeys):
+        '''Check whether any of the version keys is in this range.
+        
+        sortedKeys must be a sorted list of results of versionKey().'''
+        if self.lowerKey is None:
+            index = 0
+        elif self.lowerInclusive:
+            index = bisect_left(sortedKeys, self.lowerKey)
+        else:
+            index = bisect_right(sortedKeys, self.lowerKey)
+        
+        if index >= len(sortedKeys):
+            return False
+        
+        if self.upperKey is None:
+            return True
+        
+        key = sortedKeys[index]
+        return key < self.upperKey or (key == self.upperKey and self.upperInclusive)
+
+def isRange(spec):
+    '''Check whether the version of a dependency is a range.
+    
+    Maven treats a plain version like "1.0" as a recommendation which
+    any other version satisfies, so only ranges can be unsatisfied.'''
+    return bool(spec) and spec[0] in '[('
+
+@memoize
+def parseRange(spec):
+    '''Parse the version of a dependency into a VersionRange.
+    
+    A plain version like "1.0" becomes [1.0,1.0]; that is only good for
+    sorting (see isRange()). Returns None for empty versions and for things
+    that can't be parsed, for example unions of several ranges.'''
+    if not spec:
+        return None
+    
+    m = VERSION_RANGE_PATTERN.match(spec)
+    if m is not None:
+        prefix, lower, upper, postfix = m.groups()
+        if prefix not in '[(' or postfix not in '])':
+            return None
+        
+        return VersionRange(lower or None, prefix == '[', upper or None, postfix == ']')
+    
+    m = EXACT_VERSION_PATTERN.match(spec)
+    if m is not None:
+        spec = m.group(1)
+    
+    if '[' in spec or '(' in spec or ',' in spec:
+        return None
+    
+    return VersionRange(spec, True, spec, True)
+
+@memoize
+def versionSpecKey(spec):
+    '''Sort key for versions and version ranges (the version of a dependency).
+    
+    Ranges are sorted by their lower and then their upper bound. None
+    comes first.'''
+    if spec is None:
+        return ()
+    
+    range = parseRange(spec)
+    if range is None:
+        return (NO_VERSION, NO_VERSION, spec)
+    
+    return (range.lowerKey or NO_VERSION, range.upperKey or INFINITE_VERSION, spec)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Compare the speed of the objectify and the etree backends for POMs
+
+Usage: python bench-pom.py [rounds]
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import time
+
+sys.path.append('../src')
+
+from m4e import pom, etreepom
+
+POMS = ('org.eclipse.birt.core-2.6.2.pom', 'org.eclipse.persistence.moxy-2.1.2.pom', 'patchedPom.pom', 'withoutNonOptional.pom')
+
+tmpDir = '../tmp/bench-pom'
+
+def parse(module, rounds):
+    for i in xrange(rounds):
+        for name in POMS:
+            module.Pom(name)
+
+def access(poms, rounds):
+    for i in xrange(rounds):
+        for p in poms:
+            p.key()
+            for d in p.dependencies():
+                d.key()
+                d.optional
+                d.scope
+
+def save(poms, rounds, suffix):
+    for i in xrange(rounds):
+        for index, p in enumerate(poms):
+            p.save(os.path.join(tmpDir, '%d.%s' % (index, suffix)))
+
+def timed(name, func, *args):
+    start = time.time()
+    func(*args)
+    duration = time.time() - start
+    print('%-20s %8.3fs' % (name, duration))
+    return duration
+
+def main(rounds):
+    if not os.path.exists(tmpDir):
+        os.makedirs(tmpDir)
+    
+    for module in (pom, etreepom):
+        name = module.__name__.split('.')[-1]
+        poms = [module.Pom(p) for p in POMS]
+        
+        timed('%s parse' % name, parse, module, rounds)
+        timed('%s access' % name, access, poms, rounds)
+        timed('%s save' % name, save, poms, max(1, rounds // 10), name)
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Benchmark for HtmlCanvas: Render a table with many rows
+
+Usage: python bench-rendersnake.py [rows]
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import time
+
+sys.path.append('../src')
+
+from m4e.rendersnake import *
+
+tmpDir = '../tmp/bench-rendersnake'
+
+def render(out, rows):
+    html = HtmlCanvas(out)
+    html.html().head().title().write('Benchmark')._title()._head().write('\n').body()
+    
+    html.table(A().border('0').cellspacing('0').cellpadding('0'))
+    for i in xrange(rows):
+        html.tr() \
+        .td().span(A().class_('pom')).write('org.eclipse.m4e:artifact-%d' % i)._span()._td() \
+        .td(A().class_('padLeft')).span(A().class_('version')).write('[1.0,2.0)')._span()._td() \
+        .td(A().class_('padLeft')).write('<depends on %d>' % (i + 1))._td() \
+        ._tr().write('\n')
+    html._table()
+    
+    html._body()._html().write('\n')
+
+def main(rows):
+    if not os.path.exists(tmpDir):
+        os.makedirs(tmpDir)
+    
+    path = os.path.join(tmpDir, 'table-%d.html' % rows)
+    start = time.time()
+    with open(path, 'w') as out:
+        render(out, rows)
+    duration = time.time() - start
+    
+    print('Rendered %d rows (%d bytes) in %.3fs' % (rows, os.path.getsize(path), duration))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
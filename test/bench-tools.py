@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Run the m4e tools against synthetic repositories of different sizes
+
+Each tool runs in its own process; the wall time, the throughput
+(POMs per second) and the peak RSS of the process are saved in a JSON
+file per commit. --compare prints the difference between two of them.
+
+The repositories are created with genrepo.py and kept in ../tmp/bench-tools
+for the next run. Tools which change the repository get a fresh copy.
+
+Usage: python bench-tools.py [options] [artifacts...]
+       python bench-tools.py --compare <old.json> <new.json>
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import time
+import json
+import shutil
+import platform
+import subprocess
+from optparse import OptionParser
+
+from genrepo import RepoGenerator
+
+tmpDir = os.path.abspath('../tmp/bench-tools')
+srcDir = os.path.abspath('../src')
+patchDir = os.path.abspath('../patches')
+
+def analyze(repoDir, workDir):
+    return ['m4e-analyze.py', '--no-html', repoDir]
+
+def applyPatches(repoDir, workDir):
+    copy = copyRepo(repoDir, workDir)
+    return ['m4e-apply-patches.py', '--backup', 'none', patchDir, copy]
+
+def dm(repoDir, workDir):
+    copy = copyRepo(repoDir, workDir)
+    return ['m4e-dm.py', copy, 'org.eclipse.m4e.bench:dependency-management:1.0']
+
+def merge(repoDir, workDir):
+    target = os.path.join(workDir, 'merged')
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    return ['m4e-merge.py', repoDir, target]
+
+def attachSources(repoDir, workDir):
+    copy = copyRepo(repoDir, workDir)
+    return ['m4e-attach-sources.py', copy]
+
+# name -> function which prepares the run and returns the command line
+TOOLS = (
+    ('analyze', analyze),
+    ('apply-patches', applyPatches),
+    ('dm', dm),
+    ('merge', merge),
+    ('attach-sources', attachSources),
+)
+
+def copyRepo(repoDir, workDir):
+    copy = os.path.join(workDir, 'copy')
+    if os.path.exists(copy):
+        shutil.rmtree(copy)
+    shutil.copytree(repoDir, copy)
+    return copy
+
+def createRepo(artifacts, seed):
+    repoDir = os.path.join(tmpDir, 'repo-%d-%d' % (artifacts, seed))
+    if os.path.exists(repoDir):
+        return repoDir
+    
+    print('Generating %s...' % repoDir)
+    tmp = repoDir + '.tmp'
+    if os.path.exists(tmp):
+        shutil.rmtree(tmp)
+    
+    generator = RepoGenerator(tmp, artifacts, seed)
+    generator.run()
+    os.rename(tmp, repoDir)
+    
+    return repoDir
+
+def runTool(cmd, logFile):
+    '''Run a tool and return the wall time, the exit code and the peak RSS in MB'''
+    with open(logFile, 'w') as fh:
+        start = time.time()
+        process = subprocess.Popen([sys.executable] + cmd, cwd=srcDir, stdout=fh, stderr=subprocess.STDOUT)
+        pid, status, rusage = os.wait4(process.pid, 0)
+        seconds = time.time() - start
+    
+    process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+    
+    # Linux reports KB, Mac OS X bytes
+    rss = rusage.ru_maxrss if sys.platform == 'darwin' else rusage.ru_maxrss * 1024
+    return seconds, process.returncode, rss / 1048576.0
+
+def currentCommit():
+    try:
+        process = subprocess.Popen(['git', 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE)
+    except OSError:
+        return 'unknown'
+    
+    output = process.communicate()[0].strip()
+    return output if process.returncode == 0 else 'unknown'
+
+def run(sizes, toolNames, seed, resultsFile):
+    commit = currentCommit()
+    if not resultsFile:
+        resultsFile = os.path.join(tmpDir, 'results-%s.json' % commit)
+    
+    results = {
+        'commit': commit,
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'results': [],
+    }
+    
+    for artifacts in sizes:
+        repoDir = createRepo(artifacts, seed)
+        workDir = os.path.join(tmpDir, 'work-%d' % artifacts)
+        if not os.path.exists(workDir):
+            os.makedirs(workDir)
+        
+        for name, prepare in TOOLS:
+            if name not in toolNames:
+                continue
+            
+            cmd = prepare(repoDir, workDir)
+            seconds, exitCode, rss = runTool(cmd, os.path.join(workDir, '%s.out' % name))
+            
+            result = {
+                'tool': name,
+                'artifacts': artifacts,
+                'seconds': round(seconds, 3),
+                'artifactsPerSecond': round(artifacts / seconds, 1),
+                'peakRssMB': round(rss, 1),
+                'exitCode': exitCode,
+            }
+            results['results'].append(result)
+            print('%(tool)-16s %(artifacts)8d %(seconds)10.3fs %(artifactsPerSecond)10.1f/s %(peakRssMB)8.1fMB %(exitCode)4d' % result)
+    
+    with open(resultsFile, 'w') as fh:
+        json.dump(results, fh, indent=2, sort_keys=True)
+    
+    print('Results saved in %s' % resultsFile)
+
+def compare(oldFile, newFile):
+    with open(oldFile) as fh:
+        old = json.load(fh)
+    with open(newFile) as fh:
+        new = json.load(fh)
+    
+    oldResults = dict(((r['tool'], r['artifacts']), r) for r in old['results'])
+    
+    print('%-16s %8s %10s %10s %7s %10s %10s' % ('Tool', 'POMs', old['commit'], new['commit'], 'Ratio', 'Old RSS', 'New RSS'))
+    for r in new['results']:
+        o = oldResults.get((r['tool'], r['artifacts']))
+        if o is None:
+            continue
+        
+        ratio = r['seconds'] / o['seconds'] if o['seconds'] else 0.0
+        print('%-16s %8d %9.3fs %9.3fs %6.2fx %8.1fMB %8.1fMB' % (
+            r['tool'], r['artifacts'], o['seconds'], r['seconds'], ratio, o['peakRssMB'], r['peakRssMB']))
+
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--tools', default=','.join([name for name, prepare in TOOLS]),
+                      help='Comma separated list of tools to run (default: %default)')
+    parser.add_option('--seed', type='int', default=0,
+                      help='Seed for the synthetic repositories (default: %default)')
+    parser.add_option('--results', metavar='FILE',
+                      help='Where to save the results (default: %s/results-<commit>.json)' % tmpDir)
+    parser.add_option('--compare', action='store_true',
+                      help='Compare two result files')
+    return parser
+
+def main(name, argv):
+    parser = optionParser()
+    options, argv = parser.parse_args(argv)
+    
+    if options.compare:
+        compare(argv[0], argv[1])
+        return
+    
+    sizes = [int(arg) for arg in argv] or [1000, 10000]
+    run(sizes, options.tools.split(','), options.seed, options.results)
+
+if __name__ == '__main__':
+    main(sys.argv[0], sys.argv[1:])
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Micro-benchmarks for element lookups in a POM with many dependencies
+
+Usage: python bench-xmlpath.py [dependencies]
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import time
+
+sys.path.append('../src')
+
+from m4e.pom import Pom, POM_NS, xmlPath, text, getOrCreate, setOptionalText
+
+tmpDir = '../tmp/bench-xmlpath'
+
+def createPom(count):
+    if not os.path.exists(tmpDir):
+        os.makedirs(tmpDir)
+    
+    path = os.path.join(tmpDir, 'dependencies-%d.pom' % count)
+    with open(path, 'w') as fh:
+        fh.write('<project xmlns="%s">\n  <groupId>bench</groupId>\n  <artifactId>bench</artifactId>\n  <version>1.0</version>\n  <dependencies>\n' % POM_NS)
+        for i in xrange(count):
+            fh.write('    <dependency>\n      <groupId>g%d</groupId>\n      <artifactId>a%d</artifactId>\n      <version>1.%d</version>\n    </dependency>\n' % (i, i, i))
+        fh.write('  </dependencies>\n</project>\n')
+    
+    return path
+
+def timed(name, func, *args):
+    start = time.time()
+    func(*args)
+    duration = time.time() - start
+    print('%-20s %8.3fs' % (name, duration))
+    return duration
+
+def paths(dependencies):
+    for d in dependencies:
+        xmlPath(d.version)
+
+def lookups(dependencies):
+    for d in dependencies:
+        text(d, 'groupId')
+        text(d, 'artifactId')
+        text(d, 'version')
+        text(d, 'scope')
+
+def creates(dependencies):
+    for d in dependencies:
+        getOrCreate(d, 'exclusions')
+
+def optionalText(dependencies):
+    for d in dependencies:
+        setOptionalText(d, 'scope', 'test', 'version')
+        setOptionalText(d, 'scope', None)
+
+def main(count):
+    path = createPom(count)
+    
+    timed('parse', Pom, path)
+    pom = Pom(path)
+    dependencies = list(pom.project.dependencies.dependency)
+    
+    timed('xmlPath', paths, dependencies)
+    timed('text', lookups, dependencies)
+    timed('getOrCreate', creates, dependencies)
+    timed('setOptionalText', optionalText, dependencies)
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Generate a synthetic Maven 2 repository for benchmarks
+
+The POMs are made from the *.pom files in this folder. The repository
+looks like the result of m4e-import.py: Bundles with several versions,
+dependencies with version ranges and Eclipse qualifiers, source bundles
+in *.source folders and dependencies on the Orbit bundles which the
+patches in ../patches replace.
+
+Usage: python genrepo.py [options] <m2repo>
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import re
+import sys
+import copy
+import random
+from optparse import OptionParser
+from lxml import etree
+
+POM_NS = 'http://maven.apache.org/POM/4.0.0'
+POM_NS_PREFIX = '{%s}' % POM_NS
+
+REPLACE_PATTERN = re.compile(r"^replace\('([^']+)'", re.MULTILINE)
+
+def tag(name):
+    return POM_NS_PREFIX + name
+
+def loadTemplates(dir):
+    '''Load the POMs in dir without their dependencies and profiles'''
+    parser = etree.XMLParser(remove_blank_text=True)
+    templates = []
+    
+    for name in sorted(os.listdir(dir)):
+        if not name.endswith('.pom'):
+            continue
+        
+        project = etree.parse(os.path.join(dir, name), parser).getroot()
+        for child in ('parent', 'dependencies', 'profiles'):
+            elem = project.find(tag(child))
+            if elem is not None:
+                project.remove(elem)
+        
+        templates.append(project)
+    
+    return templates
+
+def orbitDependencies(patchFile):
+    '''Get the coordinates of all dependencies which a patch file replaces'''
+    with open(patchFile) as fh:
+        return [m.split(':') for m in REPLACE_PATTERN.findall(fh.read())]
+
+def setText(project, name, value):
+    elem = project.find(tag(name))
+    if elem is None:
+        elem = etree.Element(tag(name))
+        project.insert(1, elem)
+    elem.text = value
+
+def addTextElement(parent, name, value):
+    etree.SubElement(parent, tag(name)).text = value
+
+class RepoGenerator(object):
+    '''Write a random (but reproducible) repository to repoDir'''
+    def __init__(self, repoDir, artifacts=1000, seed=0):
+        self.repoDir = repoDir
+        # Number of POMs (without the POMs of source bundles)
+        self.artifacts = artifacts
+        self.random = random.Random(seed)
+        
+        self.versionsPerArtifact = 2
+        self.artifactsPerGroup = 20
+        # Average number of dependencies per POM
+        self.fanOut = 5
+        # How many dependencies use a version range (the rest an exact version)
+        self.rangeRatio = 0.7
+        # How many version ranges contain an Eclipse qualifier
+        self.qualifierRatio = 0.3
+        # How many bundles have a source bundle
+        self.sourceRatio = 0.3
+        # How many POMs depend on an Orbit bundle
+        self.orbitRatio = 0.1
+        # How many dependencies point to artifacts which aren't in the repository
+        self.missingRatio = 0.01
+        
+        self.templateDir = os.path.dirname(os.path.abspath(__file__))
+        self.patchFile = os.path.join(self.templateDir, '..', 'patches', 'eclipse-3.6.2.patches')
+        
+        self.pomCount = 0
+        self.sourceCount = 0
+        self.dependencyCount = 0
+    
+    def run(self):
+        self.templates = loadTemplates(self.templateDir)
+        self.orbit = orbitDependencies(self.patchFile)
+        
+        # (groupId, artifactId, versions) of all bundles written so far
+        bundles = []
+        
+        index = 0
+        while self.pomCount < self.artifacts:
+            groupId = 'org.eclipse.m4e.bench%d' % (index // self.artifactsPerGroup)
+            artifactId = '%s.bundle%d' % (groupId, index)
+            bundle = (groupId, artifactId, self.versions())
+            
+            template = self.random.choice(self.templates)
+            hasSource = self.random.random() < self.sourceRatio
+            
+            for version in bundle[2]:
+                if self.pomCount == self.artifacts:
+                    break
+                
+                self.writeBundle(template, bundle, version, self.dependencies(bundles))
+                if hasSource:
+                    self.writeSource(template, bundle, version)
+            
+            bundles.append(bundle)
+            index += 1
+    
+    def versions(self):
+        major = self.random.randint(1, 4)
+        minor = self.random.randint(0, 9)
+        
+        result = []
+        for i in range(self.versionsPerArtifact):
+            result.append('%d.%d.%d' % (major, minor + i, self.random.randint(0, 3)))
+        return result
+    
+    def dependencies(self, bundles):
+        '''Get a list of (groupId, artifactId, version) for a new POM'''
+        result = []
+        
+        count = min(len(bundles), self.random.randint(0, 2 * self.fanOut))
+        seen = set()
+        for i in range(count):
+            if self.random.random() < self.missingRatio:
+                result.append(('org.eclipse.m4e.missing', 'missing%d' % self.random.randint(0, 99), '[1.0.0,2.0.0)'))
+                continue
+            
+            groupId, artifactId, versions = self.random.choice(bundles)
+            if artifactId in seen:
+                continue
+            seen.add(artifactId)
+            
+            result.append((groupId, artifactId, self.dependencyVersion(self.random.choice(versions))))
+        
+        if self.random.random() < self.orbitRatio:
+            result.append(tuple(self.random.choice(self.orbit)))
+        
+        return result
+    
+    def dependencyVersion(self, version):
+        if self.random.random() >= self.rangeRatio:
+            return version
+        
+        if self.random.random() < self.qualifierRatio:
+            lower = '%s.v20100505-1500' % version
+        else:
+            lower = version
+        
+        return '[%s,%d.0.0)' % (lower, int(version.split('.')[0]) + 1)
+    
+    def createPom(self, template, groupId, artifactId, version):
+        project = copy.deepcopy(template)
+        setText(project, 'version', version)
+        setText(project, 'artifactId', artifactId)
+        setText(project, 'groupId', groupId)
+        
+        name = project.find(tag('name'))
+        if name is not None:
+            name.text = 'Synthetic bundle %s' % artifactId
+        
+        return project
+    
+    def writePom(self, project, groupId, artifactId, version):
+        '''Write the POM and an empty JAR'''
+        dir = os.path.join(self.repoDir, groupId.replace('.', os.sep), artifactId, version)
+        if not os.path.exists(dir):
+            os.makedirs(dir)
+        
+        baseName = os.path.join(dir, '%s-%s' % (artifactId, version))
+        with open(baseName + '.pom', 'wb') as fh:
+            fh.write(etree.tostring(project, xml_declaration=True, encoding='UTF-8', pretty_print=True))
+        
+        open(baseName + '.jar', 'wb').close()
+    
+    def writeBundle(self, template, bundle, version, dependencies):
+        groupId, artifactId = bundle[:2]
+        project = self.createPom(template, groupId, artifactId, version)
+        
+        if dependencies:
+            elem = etree.SubElement(project, tag('dependencies'))
+            for dependency in dependencies:
+                d = etree.SubElement(elem, tag('dependency'))
+                addTextElement(d, 'groupId', dependency[0])
+                addTextElement(d, 'artifactId', dependency[1])
+                addTextElement(d, 'version', dependency[2])
+                addTextElement(d, 'optional', 'false')
+        
+        self.writePom(project, groupId, artifactId, version)
+        self.pomCount += 1
+        self.dependencyCount += len(dependencies)
+    
+    def writeSource(self, template, bundle, version):
+        '''Write a source bundle like m4e-import.py does'''
+        groupId, artifactId = bundle[:2]
+        artifactId += '.source'
+        
+        project = self.createPom(template, groupId, artifactId, version)
+        self.writePom(project, groupId, artifactId, version)
+        self.sourceCount += 1
+
+def optionParser():
+    parser = OptionParser(add_help_option=False)
+    parser.add_option('--artifacts', type='int', default=1000, metavar='N',
+                      help='Number of POMs (default: %default)')
+    parser.add_option('--versions', type='int', default=2, metavar='N',
+                      help='Versions per bundle (default: %default)')
+    parser.add_option('--fan-out', type='int', default=5, metavar='N',
+                      help='Average number of dependencies per POM (default: %default)')
+    parser.add_option('--ranges', type='float', default=0.7, metavar='RATIO',
+                      help='How many dependencies use version ranges (default: %default)')
+    parser.add_option('--sources', type='float', default=0.3, metavar='RATIO',
+                      help='How many bundles have a source bundle (default: %default)')
+    parser.add_option('--orbit', type='float', default=0.1, metavar='RATIO',
+                      help='How many POMs depend on an Orbit bundle which the patches replace (default: %default)')
+    parser.add_option('--seed', type='int', default=0,
+                      help='Seed for the random generator (default: %default)')
+    return parser
+
+def main(name, argv):
+    parser = optionParser()
+    
+    options, argv = parser.parse_args(argv)
+    if len(argv) != 1:
+        print('Usage: %s [options] <m2repo>' % name)
+        print('')
+        print(parser.format_option_help())
+        return
+    
+    if os.path.exists(argv[0]):
+        raise RuntimeError('%s already exists' % argv[0])
+    
+    generator = RepoGenerator(argv[0], options.artifacts, options.seed)
+    generator.versionsPerArtifact = options.versions
+    generator.fanOut = options.fan_out
+    generator.rangeRatio = options.ranges
+    generator.sourceRatio = options.sources
+    generator.orbitRatio = options.orbit
+    generator.run()
+    
+    print('Wrote %d POMs with %d dependencies and %d source bundles to %s' % (
+        generator.pomCount, generator.dependencyCount, generator.sourceCount, argv[0]))
+
+if __name__ == '__main__':
+    main(sys.argv[0], sys.argv[1:])
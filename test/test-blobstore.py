@@ -0,0 +1,111 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.blobstore
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import shutil
+import hashlib
+from nose.tools import eq_
+
+sys.path.append('../src')
+
+from m4e.blobstore import BlobStore, Deduplicator
+
+tmpDir = os.path.abspath('../tmp/test-blobstore')
+
+def createDir():
+    if os.path.exists(tmpDir):
+        shutil.rmtree(tmpDir)
+    os.makedirs(tmpDir)
+
+def writeFile(name, data):
+    path = os.path.join(tmpDir, name)
+    dirName = os.path.dirname(path)
+    if not os.path.exists(dirName):
+        os.makedirs(dirName)
+    
+    with open(path, 'wb') as fh:
+        fh.write(data)
+    return path
+
+def createRepos():
+    createDir()
+    writeFile('a/x/1.0/x-1.0.jar', 'x' * 100)
+    writeFile('a/x/1.0/x-1.0.pom', 'pom')
+    writeFile('a/y/1.0/y-1.0.jar', 'y' * 10)
+    writeFile('b/x/1.0/x-1.0.jar', 'x' * 100)
+    writeFile('b/x/1.0/x-1.0.pom', 'pom')
+    
+    return BlobStore(os.path.join(tmpDir, 'store'))
+
+def inode(name):
+    return os.stat(os.path.join(tmpDir, name)).st_ino
+
+def testDedupe():
+    store = createRepos()
+    
+    tool = Deduplicator(store)
+    tool.processes = 1
+    tool.run([os.path.join(tmpDir, 'a'), os.path.join(tmpDir, 'b')])
+    
+    eq_(3, tool.fileCount)
+    eq_(3, tool.hashedCount)
+    eq_(1, tool.linkedCount)
+    eq_(100, tool.reclaimedBytes)
+    
+    eq_(inode('a/x/1.0/x-1.0.jar'), inode('b/x/1.0/x-1.0.jar'))
+    eq_(inode('a/x/1.0/x-1.0.jar'), os.stat(store.blobPath(hashlib.sha256('x' * 100).hexdigest())).st_ino)
+    
+    # POMs stay in the repositories
+    eq_(1, os.stat(os.path.join(tmpDir, 'a/x/1.0/x-1.0.pom')).st_nlink)
+    
+    # Files which are already in the store aren't hashed again
+    tool = Deduplicator(store)
+    tool.run([os.path.join(tmpDir, 'a'), os.path.join(tmpDir, 'b')])
+    eq_(3, tool.fileCount)
+    eq_(0, tool.hashedCount)
+
+def testMergedRepo():
+    store = createRepos()
+    Deduplicator(store).run([os.path.join(tmpDir, 'a')])
+    
+    # m4e-merge.py --store: Hard links to the sources which are deduplicated afterwards
+    os.makedirs(os.path.join(tmpDir, 'c/x/1.0'))
+    os.link(os.path.join(tmpDir, 'a/x/1.0/x-1.0.jar'), os.path.join(tmpDir, 'c/x/1.0/x-1.0.jar'))
+    os.link(os.path.join(tmpDir, 'b/x/1.0/x-1.0.jar'), os.path.join(tmpDir, 'c/x/1.0/x-1.0-copy.jar'))
+    
+    tool = Deduplicator(store)
+    tool.processes = 1
+    tool.run([os.path.join(tmpDir, 'c')])
+    
+    # Only the file which wasn't in the store was hashed
+    eq_(1, tool.hashedCount)
+    eq_(inode('a/x/1.0/x-1.0.jar'), inode('c/x/1.0/x-1.0-copy.jar'))
+    assert inode('b/x/1.0/x-1.0.jar') != inode('c/x/1.0/x-1.0-copy.jar')
+
+def testVerify():
+    store = createRepos()
+    Deduplicator(store).run([os.path.join(tmpDir, 'a')])
+    
+    eq_((2, []), store.verify(1))
+    
+    blob = store.blobPath(hashlib.sha256('y' * 10).hexdigest())
+    with open(blob, 'ab') as fh:
+        fh.write('z')
+    
+    eq_((2, [blob]), store.verify(1))
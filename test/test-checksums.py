@@ -0,0 +1,91 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.checksums
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import shutil
+import hashlib
+from nose.tools import eq_
+
+sys.path.append('../src')
+
+from m4e.checksums import ChecksumCache, MMAP_THRESHOLD, findFiles, hashFile, loadCache, statKey
+
+tmpDir = os.path.abspath('../tmp/test-checksums')
+
+def createDir():
+    if os.path.exists(tmpDir):
+        shutil.rmtree(tmpDir)
+    os.makedirs(os.path.join(tmpDir, 'a', 'b'))
+
+def writeFile(name, data):
+    path = os.path.join(tmpDir, name)
+    with open(path, 'wb') as fh:
+        fh.write(data)
+    return path
+
+def check(data):
+    createDir()
+    path = writeFile('data.jar', data)
+    
+    key, result, digests = hashFile(('key', path))
+    
+    eq_('key', key)
+    eq_(path, result)
+    eq_((hashlib.md5(data).hexdigest(), hashlib.sha1(data).hexdigest()), digests)
+
+def testHashFile():
+    check('')
+    check('x' * 1000)
+
+def testHashFileMmap():
+    check(''.join([chr(i % 251) for i in xrange(MMAP_THRESHOLD + 12345)]))
+
+def testFindFiles():
+    createDir()
+    writeFile('a/x.pom', 'x')
+    writeFile('a/x.pom.sha1', 'y')
+    writeFile('a/b/x.jar', 'z')
+    writeFile('a/b/x.jar.md5', 'z')
+    writeFile('a/b/x.jar.tmp', 'z')
+    
+    paths = [os.path.relpath(path, tmpDir) for path, st in findFiles(tmpDir)]
+    paths.sort()
+    eq_(['a/b/x.jar', 'a/x.pom'], paths)
+
+def testCache():
+    createDir()
+    path = writeFile('x.pom', 'x')
+    key = statKey(os.stat(path))
+    
+    cache = ChecksumCache()
+    cache.put(key, ('md5', 'sha1'))
+    cache.put('old', ('md5', 'sha1'))
+    
+    fileName = os.path.join(tmpDir, 'cache.pickle')
+    cache.save(fileName)
+    
+    cache = loadCache(fileName)
+    eq_(('md5', 'sha1'), cache.get(key))
+    
+    cache.prune()
+    eq_([key], cache.entries.keys())
+    
+    # The key changes when the file is modified
+    writeFile('x.pom', 'yy')
+    eq_(None, cache.get(statKey(os.stat(path))))
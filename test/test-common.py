@@ -0,0 +1,201 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.common
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import json
+import logging
+import StringIO
+import multiprocessing
+from nose.tools import eq_
+
+sys.path.append('../src')
+
+from m4e.common import configLogger, configWorkerLogger, stopLogger, Instrumentation, instrumentation, loadPickle, savePickle
+
+log = logging.getLogger('m4e.test')
+
+class CountingArgument(object):
+    def __init__(self):
+        self.count = 0
+    
+    def __str__(self):
+        self.count += 1
+        return 'arg'
+
+def readLog(level):
+    fileName = os.path.abspath('../tmp/test-common/%s.log' % level)
+    console = StringIO.StringIO()
+    arg = CountingArgument()
+    
+    configLogger(fileName, console, level=level)
+    try:
+        log.debug('debug %s', arg)
+        log.info('info %s', arg)
+        log.warning('warning %s', arg)
+    finally:
+        stopLogger()
+        logging.getLogger().handlers = []
+        instrumentation.metricsFile = None
+    
+    with open(fileName) as fh:
+        lines = [line.split(' ', 2)[2].strip() for line in fh]
+    
+    return lines, console.getvalue(), arg.count
+
+def testConfigLogger():
+    lines, console, count = readLog('debug')
+    
+    eq_(['DEBUG m4e.test debug arg', 'INFO m4e.test info arg', 'WARNING m4e.test warning arg'], lines)
+    eq_('info arg\nwarning arg\n', console)
+    eq_(3, count)
+
+def testLogLevel():
+    lines, console, count = readLog('warning')
+    
+    eq_(['WARNING m4e.test warning arg'], lines)
+    eq_('warning arg\n', console)
+    # Messages below the level are never formatted
+    eq_(1, count)
+
+def testException():
+    fileName = os.path.abspath('../tmp/test-common/exception.log')
+    
+    configLogger(fileName, StringIO.StringIO())
+    try:
+        try:
+            raise RuntimeError('failed')
+        except RuntimeError:
+            log.exception('Oops')
+    finally:
+        stopLogger()
+        logging.getLogger().handlers = []
+        instrumentation.metricsFile = None
+    
+    with open(fileName) as fh:
+        text = fh.read()
+    
+    assert 'ERROR m4e.test Oops\nTraceback' in text, text
+    assert 'RuntimeError: failed' in text, text
+
+def logInWorker(index):
+    log.info('worker %d', index)
+    return index
+
+def testWorkerLogger():
+    fileName = os.path.abspath('../tmp/test-common/worker.log')
+    
+    configLogger(fileName, StringIO.StringIO())
+    try:
+        log.info('parent')
+        pool = multiprocessing.Pool(2, configWorkerLogger)
+        try:
+            eq_([0, 1, 2], pool.map(logInWorker, range(3)))
+        finally:
+            pool.close()
+            pool.join()
+    finally:
+        stopLogger()
+        logging.getLogger().handlers = []
+        instrumentation.metricsFile = None
+    
+    with open(fileName) as fh:
+        lines = sorted(line.split(' ', 2)[2].strip() for line in fh)
+    
+    eq_(['INFO m4e.test parent', 'INFO m4e.test worker 0', 'INFO m4e.test worker 1', 'INFO m4e.test worker 2'], lines)
+
+def testPhases():
+    instrumentation = Instrumentation()
+    
+    with instrumentation.phase('parse') as phase:
+        phase.count(2)
+    with instrumentation.phase('save'):
+        pass
+    with instrumentation.phase('parse') as phase:
+        phase.count()
+    instrumentation.count('save', 5)
+    
+    eq_(['parse', 'save'], [p.name for p in instrumentation.phases])
+    eq_(3, instrumentation.phase('parse').items)
+    eq_(5, instrumentation.phase('save').items)
+    assert instrumentation.phase('parse').peakRss > 0
+    
+    lines = instrumentation.summary()
+    eq_(3, len(lines))
+    eq_(['parse', 'save'], [line.split()[0] for line in lines[1:]])
+
+def testMetrics():
+    metrics = Instrumentation()
+    metrics.tool = 'test'
+    
+    metrics.metric('poms_scanned', 10)
+    metrics.increment('problems_by_kind', kind='Missing')
+    metrics.increment('problems_by_kind', 2, kind='Missing')
+    metrics.increment('problems_by_kind', kind='Say "hi"')
+    with metrics.phase('scan') as phase:
+        phase.count(10)
+    
+    lines = [l for l in metrics.metricsAsPrometheus().split('\n') if l.startswith(('m4e_phase', 'm4e_poms', 'm4e_problems'))]
+    eq_(['m4e_phase_items{tool="test",phase="scan"} 10',
+         'm4e_phase_seconds',
+         'm4e_poms_scanned{tool="test"} 10',
+         'm4e_problems_by_kind{tool="test",kind="Missing"} 3',
+         'm4e_problems_by_kind{tool="test",kind="Say \\"hi\\""} 1'],
+        [l if not l.startswith('m4e_phase_seconds') else 'm4e_phase_seconds' for l in lines])
+
+def testWriteMetrics():
+    metrics = Instrumentation()
+    metrics.metricsFile = os.path.abspath('../tmp/test-common/metrics')
+    metrics.metric('files_linked', 5)
+    metrics.writeMetrics()
+    
+    with open(metrics.metricsFile + '-%s.metrics.json' % metrics.tool) as fh:
+        data = json.load(fh)
+    eq_([{'name': 'files_linked', 'labels': {}, 'value': 5}], [m for m in data['metrics'] if m['name'] == 'files_linked'])
+    
+    with open(metrics.metricsFile + '-%s.prom' % metrics.tool) as fh:
+        assert '# TYPE m4e_files_linked gauge\nm4e_files_linked{tool="%s"} 5\n' % metrics.tool in fh.read()
+
+def testMetricsPerTool():
+    fileName = os.path.abspath('../tmp/test-common/repo')
+    for tool in ('merge', 'apply-patches'):
+        metrics = Instrumentation()
+        metrics.tool = tool
+        metrics.metricsFile = fileName
+        metrics.writeMetrics()
+    
+    for tool in ('merge', 'apply-patches'):
+        with open('%s-%s.prom' % (fileName, tool)) as fh:
+            assert 'tool="%s"' % tool in fh.read()
+
+def testPickle():
+    fileName = os.path.abspath('../tmp/test-common/data.pickle')
+    if os.path.exists(fileName):
+        os.remove(fileName)
+    elif not os.path.exists(os.path.dirname(fileName)):
+        os.makedirs(os.path.dirname(fileName))
+    
+    eq_(None, loadPickle(fileName, 1, 'test data'))
+    
+    savePickle(fileName, 1, {'a': (1, 2)})
+    eq_({'a': (1, 2)}, loadPickle(fileName, 1, 'test data'))
+    eq_(None, loadPickle(fileName, 2, 'test data'))
+    
+    with open(fileName, 'w') as fh:
+        fh.write('not a pickle')
+    eq_(None, loadPickle(fileName, 1, 'test data'))
@@ -0,0 +1,52 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.compress
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import gzip
+from nose.tools import eq_, raises
+
+sys.path.append('../src')
+
+from m4e.compress import openOutput, CompressedOutput
+from m4e.rendersnake import HtmlCanvas
+
+tmpDir = '../tmp/test-compress'
+
+def setup():
+    if not os.path.exists(tmpDir):
+        os.makedirs(tmpDir)
+
+def test_gzip():
+    out, path = openOutput(os.path.join(tmpDir, 'report.html'), 'gzip', 9, flushBytes=10)
+    eq_(os.path.join(tmpDir, 'report.html.gz'), path)
+    
+    with out:
+        html = HtmlCanvas(out)
+        html.html().write(u'<\xe4>')._html()
+    
+    eq_('<html>&lt;\xc3\xa4&gt;</html>', gzip.open(path).read())
+
+def test_uncompressed():
+    out, path = openOutput(os.path.join(tmpDir, 'report.html'))
+    eq_(os.path.join(tmpDir, 'report.html'), path)
+    out.close()
+
+@raises(ValueError)
+def test_unknownMethod():
+    CompressedOutput(os.path.join(tmpDir, 'report.html.xz'), 'xz')
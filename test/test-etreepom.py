@@ -0,0 +1,72 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.etreepom
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import StringIO
+from nose.tools import eq_
+
+sys.path.append('../src')
+
+from m4e import pom, etreepom
+
+POMS = ('org.eclipse.birt.core-2.6.2.pom', 'org.eclipse.persistence.moxy-2.1.2.pom', 'patchedPom.pom', 'withoutNonOptional.pom')
+
+tmpDir = '../tmp/test-etreepom'
+
+def save(p, name):
+    path = os.path.join(tmpDir, name)
+    p.save(path)
+    
+    with open(path, 'rb') as fh:
+        return fh.read()
+
+def test_sameApi():
+    for name in POMS:
+        p1 = pom.Pom(name)
+        p2 = etreepom.Pom(name)
+        
+        eq_(p1.key(), p2.key())
+        eq_([(d.key(), d.optional, d.scope) for d in p1.dependencies()],
+            [(d.key(), d.optional, d.scope) for d in p2.dependencies()])
+        eq_([(p.id, [d.key() for d in p.dependencies()]) for p in p1.profiles()],
+            [(p.id, [d.key() for d in p.dependencies()]) for p in p2.profiles()])
+
+def test_sameOutput():
+    for name in POMS:
+        eq_(save(pom.Pom(name), name + '.objectify'), save(etreepom.Pom(name), name + '.etree'))
+
+def test_sameOutputAfterChanges():
+    def change(p):
+        d = p.dependencies()[0]
+        d.version = '[1.0,2.0)'
+        d.optional = True
+        p.profile('m4e.default').addDependency(d)
+    
+    name = POMS[0]
+    p1 = pom.Pom(name)
+    change(p1)
+    p2 = etreepom.Pom(name)
+    change(p2)
+    
+    eq_(save(p1, name + '.objectify'), save(p2, name + '.etree'))
+
+def test_profilesSkipComments():
+    xml = '<project xmlns="%s"><profiles><!-- comment --><profile><id>a</id></profile><?pi x?></profiles></project>' % pom.POM_NS
+    
+    eq_(['a'], [p.id for p in etreepom.Pom(StringIO.StringIO(xml)).profiles()])
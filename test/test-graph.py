@@ -0,0 +1,78 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.graph
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import sys
+from nose.tools import eq_
+
+sys.path.append('../src')
+
+from m4e.graph import DependencyGraph
+
+def createGraph(*edges):
+    graph = DependencyGraph()
+    for edge in edges:
+        graph.addEdge(*edge.split('->'))
+    graph.freeze()
+    return graph
+
+def test_intern():
+    graph = DependencyGraph()
+    eq_(0, graph.intern('a:a'))
+    eq_(1, graph.intern('b:b'))
+    eq_(0, graph.intern('a:a'))
+    eq_(None, graph.id('c:c'))
+    eq_(2, len(graph))
+
+def test_dependencies():
+    graph = createGraph('a->b', 'a->c', 'b->c', 'a->b')
+    
+    eq_('DependencyGraph(3 nodes, 3 edges)', repr(graph))
+    eq_(['b', 'c'], graph.dependencies('a'))
+    eq_([], graph.dependencies('c'))
+    eq_([], graph.dependencies('x'))
+
+def test_dependents():
+    graph = createGraph('a->c', 'b->c', 'c->d')
+    
+    eq_(['a', 'b'], graph.dependents('c'))
+    eq_([], graph.dependents('a'))
+
+def test_transitive():
+    graph = createGraph('a->b', 'b->c', 'c->d', 'x->d')
+    
+    eq_(['b', 'c', 'd'], graph.transitiveDependencies('a'))
+    eq_(['a', 'b', 'c', 'x'], graph.transitiveDependents('d'))
+
+def test_noCycles():
+    graph = createGraph('a->b', 'b->c', 'a->c')
+    
+    eq_([], graph.cycles())
+    eq_(3, len(graph.stronglyConnectedComponents()))
+
+def test_cycles():
+    graph = createGraph('a->b', 'b->c', 'c->a', 'c->d', 'd->e', 'e->d', 'f->f', 'g->a')
+    
+    eq_([['a', 'b', 'c'], ['d', 'e'], ['f']], graph.cycles())
+
+def test_longChain():
+    edges = ['%d->%d' % (i, i+1) for i in range(20000)]
+    edges.append('20000->0')
+    graph = createGraph(*edges)
+    
+    eq_(1, len(graph.cycles()))
+    eq_(20001, len(graph.cycles()[0]))
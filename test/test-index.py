@@ -0,0 +1,85 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.index
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import shutil
+from nose.tools import eq_
+
+sys.path.append('../src')
+
+from m4e.index import RepoIndex, getIndex, loadIndex
+
+def createRepo():
+    repoDir = os.path.abspath('../tmp/test-index/m2repo')
+    if os.path.exists(repoDir):
+        shutil.rmtree(repoDir)
+    
+    for groupId, artifactId, version in (
+        ('org.eclipse.birt', 'org.eclipse.birt.core', '2.6.2'),
+        ('org.eclipse.persistence', 'org.eclipse.persistence.moxy', '2.1.2'),
+    ):
+        path = os.path.join(repoDir, *groupId.split('.'))
+        path = os.path.join(path, artifactId, version)
+        os.makedirs(path)
+        
+        shutil.copy('%s-%s.pom' % (artifactId, version), path)
+        open(os.path.join(path, '%s-%s.jar' % (artifactId, version)), 'w').close()
+    
+    return repoDir
+
+def test_build():
+    repoDir = createRepo()
+    index = RepoIndex(repoDir)
+    index.build()
+    
+    eq_(['2.6.2'], index.versions('org.eclipse.birt:org.eclipse.birt.core'))
+    eq_(['org/eclipse/birt/org.eclipse.birt.core/2.6.2/org.eclipse.birt.core-2.6.2.pom'],
+        index.coordinates['org.eclipse.birt:org.eclipse.birt.core'].values())
+    eq_(['jar', 'pom'], index.files['org.eclipse.birt:org.eclipse.birt.core:2.6.2'])
+    eq_(('org.eclipse.core:org.eclipse.core.runtime', '[3.2.0,4.0.0)', None),
+        index.dependencies['org.eclipse.birt:org.eclipse.birt.core:2.6.2'][0])
+    eq_([('org.eclipse.birt:org.eclipse.birt.core:2.6.2', '[4.2.1,5.0.0)')],
+        index.dependents['com.ibm.icu:com.ibm.icu'])
+
+def test_keys():
+    repoDir = createRepo()
+    index = RepoIndex(repoDir)
+    index.build()
+    
+    eq_(['org.eclipse.birt:org.eclipse.birt.core:2.6.2'], index.keys('org.eclipse.birt:org.eclipse.birt.core'))
+    eq_(['org.eclipse.birt:org.eclipse.birt.core:2.6.2'], index.keys('org.eclipse.birt:org.eclipse.birt.core:2.6.2'))
+    eq_([], index.keys('org.eclipse.birt:org.eclipse.birt.core:1.0'))
+    eq_([], index.keys('x:y'))
+
+def test_cache():
+    repoDir = createRepo()
+    fileName = repoDir + '-index.pickle'
+    if os.path.exists(fileName):
+        os.remove(fileName)
+    
+    eq_(None, loadIndex(repoDir, fileName))
+    
+    index = getIndex(repoDir)
+    eq_(2, len(index.files))
+    
+    index = loadIndex(repoDir, fileName)
+    eq_(2, len(index.files))
+    
+    os.makedirs(os.path.join(repoDir, 'org', 'eclipse', 'new'))
+    eq_(None, loadIndex(repoDir, fileName))
@@ -0,0 +1,61 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e-merge.py
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import imp
+import shutil
+from nose.tools import eq_
+
+sys.path.append('../src')
+
+from m4e.common import instrumentation
+
+merge = imp.load_source('m4e_merge', '../src/m4e-merge.py')
+
+tmpDir = os.path.abspath('../tmp/test-merge')
+
+def createRepo(name):
+    path = os.path.join(tmpDir, name, 'g', 'a', '1.0')
+    os.makedirs(path)
+    with open(os.path.join(path, 'a-1.0.pom'), 'w') as fh:
+        fh.write('<project/>')
+    return os.path.join(tmpDir, name)
+
+def testProfileSummaryIsLogged():
+    if os.path.exists(tmpDir):
+        shutil.rmtree(tmpDir)
+    
+    source = createRepo('source')
+    target = os.path.join(tmpDir, 'target')
+    
+    metricsFile = instrumentation.metricsFile
+    try:
+        merge.main('m4e-merge.py', ['--profile', source, target])
+    finally:
+        instrumentation.metricsFile = metricsFile
+        merge.logFile.close()
+        merge.logFile = None
+    
+    assert os.path.exists(os.path.join(target, 'g', 'a', '1.0', 'a-1.0.pom'))
+    
+    with open(target + '.log') as fh:
+        lines = fh.read().splitlines()
+    
+    summary = [line for line in lines if 'Peak RSS of the process' in line or 'Profile saved in' in line]
+    eq_(2, len(summary), lines)
@@ -0,0 +1,101 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.metadata
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import shutil
+from nose.tools import eq_
+
+sys.path.append('../src')
+
+from m4e.metadata import MetadataState, loadState, metadataPath, renderMetadata, scanRepository, writeMetadata
+
+tmpDir = os.path.abspath('../tmp/test-metadata')
+
+def createRepo(*poms):
+    if os.path.exists(tmpDir):
+        shutil.rmtree(tmpDir)
+    
+    for groupId, artifactId, version in poms:
+        path = os.path.join(tmpDir, groupId.replace('.', os.sep), artifactId, version)
+        os.makedirs(path)
+        with open(os.path.join(path, '%s-%s.pom' % (artifactId, version)), 'w') as fh:
+            fh.write('<project/>')
+
+def testScanRepository():
+    createRepo(
+        ('org.eclipse', 'a', '3.10.0'),
+        ('org.eclipse', 'a', '3.9.0'),
+        ('org.eclipse', 'a', '3.9.0.v20100101'),
+        ('org.eclipse.b', 'b', '1.0'),
+        ('org.eclipse.b', 'b', '1.0-SNAPSHOT'),
+        ('org.eclipse.b', 'b', '1.0-rc1'),
+    )
+    
+    eq_({
+        ('org.eclipse', 'a'): ('3.9.0', '3.9.0.v20100101', '3.10.0'),
+        ('org.eclipse.b', 'b'): ('1.0-rc1', '1.0-SNAPSHOT', '1.0'),
+    }, scanRepository(tmpDir))
+
+def testRenderMetadata():
+    eq_('''\
+<?xml version='1.0' encoding='UTF-8'?>
+<metadata>
+  <groupId>org.eclipse</groupId>
+  <artifactId>a</artifactId>
+  <versioning>
+    <latest>3.10.0-SNAPSHOT</latest>
+    <release>3.9.0</release>
+    <versions>
+      <version>3.9.0</version>
+      <version>3.10.0-SNAPSHOT</version>
+    </versions>
+    <lastUpdated>20261019120000</lastUpdated>
+  </versioning>
+</metadata>
+''', renderMetadata('org.eclipse', 'a', ('3.9.0', '3.10.0-SNAPSHOT'), '20261019120000'))
+
+def testReleaseIsNotASnapshot():
+    xml = renderMetadata('org.eclipse', 'a', ('1.0', '1.1-SNAPSHOT'), '20261019120000')
+    assert '<latest>1.1-SNAPSHOT</latest>' in xml
+    assert '<release>1.0</release>' in xml
+
+def testRenderMetadataOnlySnapshots():
+    xml = renderMetadata('org.eclipse', 'a', ('1.0-SNAPSHOT',), '20261019120000')
+    eq_(-1, xml.find('<release>'))
+
+def testWriteMetadata():
+    createRepo(('org.eclipse', 'a', '1.0'))
+    path = metadataPath(tmpDir, 'org.eclipse', 'a')
+    
+    task = (path, 'org.eclipse', 'a', ('1.0',), '20261019120000')
+    eq_(True, writeMetadata(task))
+    eq_(False, writeMetadata(task))
+    eq_(True, os.path.exists(path))
+
+def testState():
+    createRepo()
+    os.makedirs(tmpDir)
+    fileName = os.path.join(tmpDir, 'metadata.pickle')
+    
+    state = MetadataState()
+    state.versions[('org.eclipse', 'a')] = ('1.0',)
+    state.save(fileName)
+    
+    eq_({('org.eclipse', 'a'): ('1.0',)}, loadState(fileName).versions)
+    eq_({}, loadState(fileName + '.missing').versions)
@@ -0,0 +1,150 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.package
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import gzip
+import zlib
+import shutil
+import tarfile
+import zipfile
+from cStringIO import StringIO
+from nose.tools import eq_
+
+sys.path.append('../src')
+
+from m4e import package
+from m4e.package import CHUNK_SIZE, GzipWriter, StoredPayload, deflateFile, findFiles, gzipMember, writeDeflated, zipInfo
+
+tmpDir = os.path.abspath('../tmp/test-package')
+
+def createDir():
+    if os.path.exists(tmpDir):
+        shutil.rmtree(tmpDir)
+    os.makedirs(os.path.join(tmpDir, 'a', 'b'))
+
+def writeFile(name, data):
+    path = os.path.join(tmpDir, name)
+    with open(path, 'wb') as fh:
+        fh.write(data)
+    return path
+
+def gunzip(data):
+    return gzip.GzipFile(fileobj=StringIO(data)).read()
+
+def testFindFiles():
+    createDir()
+    writeFile('a/x.pom', 'x')
+    writeFile('a/x.pom.bak', 'x')
+    writeFile('a/b/x.jar', 'x')
+    writeFile('a/b/x.jar.tmp', 'x')
+    writeFile('a/m4e.log', 'x')
+    writeFile('a/m4e.log.1', 'x')
+    writeFile('a/m4e.log.12', 'x')
+    writeFile('a/x.logo', 'x')
+    
+    paths = [os.path.relpath(path, tmpDir) for path in findFiles(tmpDir)]
+    eq_(['a/b/x.jar', 'a/x.logo', 'a/x.pom'], paths)
+
+def members(data):
+    '''Count the gzip members in data'''
+    count = 0
+    while data:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        decompressor.decompress(data)
+        data = decompressor.unused_data
+        count += 1
+    
+    return count
+
+def testGzipMember():
+    eq_('x' * 1000, gunzip(gzipMember([('x' * 1000, 6)])))
+    eq_('y' * 1000, gunzip(gzipMember([('y' * 1000, 0)])))
+    eq_('', gunzip(gzipMember([('', 6)])))
+
+def testGzipMemberSegments():
+    data = gzipMember([('x' * 1000, 6), ('y' * 1000, 0), ('z' * 10, 6)])
+    
+    eq_('x' * 1000 + 'y' * 1000 + 'z' * 10, gunzip(data))
+    eq_(1, members(data))
+
+def testGzipWriter():
+    out = StringIO()
+    writer = GzipWriter(out, 2)
+    
+    writer.write('a' * 100)
+    writer.level = 0
+    writer.write('b' * (CHUNK_SIZE + 10))
+    writer.level = 6
+    writer.write('c' * 10)
+    writer.close()
+    
+    eq_(CHUNK_SIZE + 120, writer.tell())
+    eq_('a' * 100 + 'b' * (CHUNK_SIZE + 10) + 'c' * 10, gunzip(out.getvalue()))
+    
+    # Changing the level doesn't start a new member
+    eq_(2, members(out.getvalue()))
+    
+    # The stored data is bigger than its chunk
+    eq_(True, writer.compressedSize > CHUNK_SIZE)
+
+def testStoredPayload():
+    data = ''.join([chr(i % 251) for i in xrange(100000)])
+    out = StringIO()
+    writer = GzipWriter(out, 1)
+    
+    archive = tarfile.open(mode='w', fileobj=writer)
+    info = tarfile.TarInfo('x.jar')
+    info.size = len(data)
+    archive.addfile(info, StoredPayload(StringIO(data), writer))
+    eq_(0, writer.level)
+    writer.level = 6
+    archive.close()
+    writer.close()
+    
+    # Only the payload (and the padding of its last block) was stored; the
+    # header and the end of the archive are compressed
+    eq_(102400, writer.tell())
+    eq_(True, writer.compressedSize < len(data) + 512 + 100)
+    eq_(data, tarfile.open(fileobj=StringIO(gunzip(out.getvalue()))).extractfile('x.jar').read())
+
+def testWriteDeflated():
+    checkWriteDeflated()
+
+def testWriteDeflatedWithoutInternals():
+    internals = package.ZIPFILE_INTERNALS
+    package.ZIPFILE_INTERNALS = False
+    try:
+        checkWriteDeflated()
+    finally:
+        package.ZIPFILE_INTERNALS = internals
+
+def checkWriteDeflated():
+    createDir()
+    path = writeFile('a/x.pom', '<project/>' * 100)
+    
+    out = StringIO()
+    archive = zipfile.ZipFile(out, 'w')
+    crc, size, data = deflateFile(path)
+    writeDeflated(archive, zipInfo(path, 'x.pom', zipfile.ZIP_DEFLATED), crc, size, data)
+    archive.close()
+    
+    archive = zipfile.ZipFile(StringIO(out.getvalue()))
+    eq_(None, archive.testzip())
+    eq_('<project/>' * 100, archive.read('x.pom'))
+    eq_(zipfile.ZIP_DEFLATED, archive.getinfo('x.pom').compress_type)
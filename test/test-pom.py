@@ -0,0 +1,152 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.pom
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import shutil
+from nose.tools import eq_
+from lxml import objectify
+
+sys.path.append('../src')
+
+from m4e.pom import Pom, PomLoader, pomPath, coordinatesFromPath, xmlPath
+
+def createRepo(version='2.6.2'):
+    repoDir = os.path.abspath('../tmp/test-pom/m2repo')
+    if os.path.exists(repoDir):
+        shutil.rmtree(repoDir)
+    
+    path = pomPath(repoDir, 'org.eclipse.birt', 'org.eclipse.birt.core', version)
+    os.makedirs(os.path.dirname(path))
+    shutil.copy('org.eclipse.birt.core-2.6.2.pom', path)
+    
+    return repoDir, path
+
+def test_coordinatesFromPath():
+    eq_(('org.eclipse.birt', 'org.eclipse.birt.core', '2.6.2'),
+        coordinatesFromPath('/repo', pomPath('/repo', 'org.eclipse.birt', 'org.eclipse.birt.core', '2.6.2')))
+
+def test_coordinatesFromPath_noRepoLayout():
+    eq_(None, coordinatesFromPath('/repo', '/repo/org/eclipse/birt/core.pom'))
+    eq_(None, coordinatesFromPath('/repo', '/repo/a/b/1.0/b-2.0.pom'))
+    eq_(None, coordinatesFromPath('/repo', '/other/a/b/1.0/b-1.0.pom'))
+
+def test_lazy():
+    repoDir, path = createRepo()
+    pom = Pom(path, repoDir)
+    
+    eq_('org.eclipse.birt:org.eclipse.birt.core:2.6.2', pom.key())
+    eq_('org.eclipse.birt:org.eclipse.birt.core', pom.shortKey())
+    eq_(False, pom.isLoaded())
+    
+    eq_('org.eclipse.core:org.eclipse.core.runtime:[3.2.0,4.0.0)', pom.dependencies()[0].key())
+    eq_(True, pom.isLoaded())
+
+def test_lazyChangedAfterLoad():
+    repoDir, path = createRepo()
+    pom = Pom(path, repoDir)
+    
+    pom.makeWritable()
+    pom.project.version._setText('2.7.0')
+    eq_('org.eclipse.birt:org.eclipse.birt.core:2.7.0', pom.key())
+
+def test_verify():
+    repoDir, path = createRepo()
+    pom = Pom(path, repoDir, verify=True)
+    
+    eq_(True, pom.isLoaded())
+    eq_([], pom.mismatches)
+
+def test_verifyMismatch():
+    repoDir, path = createRepo('2.6.3')
+    pom = Pom(path, repoDir, verify=True)
+    
+    eq_(['version is "2.6.2" but the path says "2.6.3"'], pom.mismatches)
+
+def test_loaderReusesParser():
+    loader = PomLoader()
+    eq_(loader.parser(), loader.parser())
+
+def test_load():
+    repoDir, path = createRepo()
+    pom = PomLoader().load(path, repoDir, verify=True)
+    
+    eq_('org.eclipse.birt:org.eclipse.birt.core:2.6.2', pom.key())
+    eq_(True, pom.isLoaded())
+    eq_([], pom.mismatches)
+
+def test_loadMany():
+    paths = ['org.eclipse.birt.core-2.6.2.pom', 'org.eclipse.persistence.moxy-2.1.2.pom'] * 5
+    
+    for loader in (PomLoader(), PomLoader(threads=2, prefetch=3)):
+        keys = [pom.key() for pom in loader.loadMany(iter(paths))]
+        eq_(['org.eclipse.birt:org.eclipse.birt.core:2.6.2', 'org.eclipse.persistence:org.eclipse.persistence.moxy:2.1.2'] * 5, keys)
+
+def test_xmlPath():
+    pom = Pom('org.eclipse.birt.core-2.6.2.pom')
+    dependencies = pom.project.dependencies.dependency
+    
+    eq_('/project/dependencies/dependency[0]/version', xmlPath(dependencies[0].version))
+    eq_('/project/dependencies/dependency[2]', xmlPath(dependencies[2]))
+
+def test_setScope():
+    pom = Pom('org.eclipse.birt.core-2.6.2.pom')
+    d = pom.dependencies()[0]
+    d.scope = 'test'
+    
+    eq_('test', d.scope)
+    eq_('/project/dependencies/dependency[0]/scope', xmlPath(d.xml().scope))
+    eq_('version', d.xml().scope.getprevious().tag.split('}')[1])
+
+def test_xmlPathAfterRemove():
+    pom = Pom('org.eclipse.birt.core-2.6.2.pom')
+    dependencies = pom.dependencies()
+    
+    eq_('/project/dependencies/dependency[2]', xmlPath(dependencies[2].xml()))
+    dependencies[0].remove()
+    eq_('/project/dependencies/dependency[1]', xmlPath(dependencies[2].xml()))
+
+def test_xmlPathAfterDirectChange():
+    # Changes which bypass the Pom API must not return stale positions
+    root = objectify.fromstring('<project><module>a</module><module>b</module><name>c</name></project>')
+    first, second, name = root.getchildren()
+    
+    eq_('/project/module[1]', xmlPath(second))
+    root.remove(first)
+    eq_('/project/module', xmlPath(second))
+    
+    root.insert(0, first)
+    eq_('/project/module[1]', xmlPath(second))
+    eq_('/project/name', xmlPath(name))
+
+def test_xmlPathSameText():
+    # objectify elements with the same text are equal
+    root = objectify.fromstring('<project><module>a</module><name>a</name><module>a</module></project>')
+    
+    eq_('/project/module[1]', xmlPath(root.getchildren()[2]))
+    eq_('/project/name', xmlPath(root.getchildren()[1]))
+
+def test_xmlPathAfterAddingProfile():
+    pom = Pom('org.eclipse.birt.core-2.6.2.pom')
+    pom.profile('a')
+    
+    profiles = pom.project.profiles
+    eq_('/project/profiles/profile', xmlPath(profiles.profile))
+    
+    pom.profile('b')
+    eq_('/project/profiles/profile[1]', xmlPath(pom.profile('b').xml()))
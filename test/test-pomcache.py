@@ -0,0 +1,158 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.pomcache
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import shutil
+from nose.tools import eq_
+
+sys.path.append('../src')
+
+from m4e.pomcache import PomCache
+
+BIRT = 'org.eclipse.birt.core-2.6.2.pom'
+MOXY = 'org.eclipse.persistence.moxy-2.1.2.pom'
+
+def test_hit():
+    cache = PomCache()
+    pom1 = cache.get(BIRT)
+    pom2 = cache.get(BIRT)
+    
+    eq_('org.eclipse.birt:org.eclipse.birt.core:2.6.2', pom2.key())
+    assert pom1.xml is pom2.xml
+    eq_({'entries': 1, 'bytes': os.path.getsize(BIRT), 'hits': 1, 'misses': 1, 'evictions': 0}, cache.stats())
+
+def test_changedFile():
+    tmpDir = '../tmp/test-pomcache'
+    if not os.path.exists(tmpDir):
+        os.makedirs(tmpDir)
+    
+    path = os.path.join(tmpDir, BIRT)
+    shutil.copy(BIRT, path)
+    
+    cache = PomCache()
+    cache.get(path)
+    
+    with open(path, 'a') as fh:
+        fh.write('\n')
+    
+    cache.get(path)
+    eq_(2, cache.misses)
+    eq_(1, len(cache))
+
+def test_maxEntries():
+    cache = PomCache(maxEntries=1)
+    cache.get(BIRT)
+    cache.get(MOXY)
+    cache.get(BIRT)
+    
+    eq_(1, len(cache))
+    eq_(3, cache.misses)
+    eq_(2, cache.evictions)
+
+def test_leastRecentlyUsed():
+    cache = PomCache(maxEntries=2)
+    cache.get(BIRT)
+    cache.get(MOXY)
+    cache.get(BIRT)
+    cache.get('withoutNonOptional.pom')
+    
+    eq_([BIRT, 'withoutNonOptional.pom'], sorted(cache.links.keys()))
+
+def test_maxBytes():
+    cache = PomCache(maxBytes=os.path.getsize(BIRT))
+    cache.get(BIRT)
+    cache.get(MOXY)
+    
+    eq_([MOXY], cache.links.keys())
+    eq_(os.path.getsize(MOXY), cache.bytes)
+
+def test_copyOnWrite():
+    cache = PomCache()
+    pom = cache.get(BIRT)
+    
+    pom.makeWritable()
+    pom.project.version._setText('2.7.0')
+    
+    eq_('org.eclipse.birt:org.eclipse.birt.core:2.7.0', pom.key())
+    eq_('org.eclipse.birt:org.eclipse.birt.core:2.6.2', cache.get(BIRT).key())
+
+def test_setterCopies():
+    cache = PomCache()
+    pom = cache.get(BIRT)
+    
+    dependencies = pom.dependencies()
+    version = dependencies[0].version
+    dependencies[0].version = '9.9'
+    dependencies[1].scope = 'test'
+    
+    eq_('9.9', pom.dependencies()[0].version)
+    eq_('test', pom.dependencies()[1].scope)
+    eq_(version, cache.get(BIRT).dependencies()[0].version)
+    eq_(None, cache.get(BIRT).dependencies()[1].scope)
+
+def test_removeCopies():
+    cache = PomCache()
+    pom = cache.get(BIRT)
+    count = len(pom.dependencies())
+    
+    pom.dependencies()[0].remove()
+    
+    eq_(count - 1, len(pom.dependencies()))
+    eq_(count, len(cache.get(BIRT).dependencies()))
+
+def test_profileCopies():
+    cache = PomCache()
+    pom = cache.get(BIRT)
+    
+    pom.profile('m4e.optional')
+    
+    eq_(['m4e.optional'], [p.id for p in pom.profiles()])
+    eq_([], cache.get(BIRT).profiles())
+
+def test_etreeCopies():
+    from m4e.etreepom import pomCache
+    pom = pomCache.get(BIRT)
+    
+    dependency = pom.dependencies()[0]
+    version = dependency.version
+    dependency.version = '9.9'
+    
+    eq_('9.9', pom.dependencies()[0].version)
+    eq_(version, pomCache.get(BIRT).dependencies()[0].version)
+
+def test_loaderUsesCache():
+    from m4e.pom import PomLoader
+    loader = PomLoader(cache=PomCache())
+    pom1 = loader.load(BIRT)
+    pom2 = loader.load(BIRT)
+    
+    assert pom1.xml is pom2.xml
+    
+    pom1.dependencies()[0].version = '9.9'
+    assert pom1.xml is not pom2.xml
+    eq_('9.9', pom1.dependencies()[0].version)
+    assert loader.load(BIRT).dependencies()[0].version != '9.9'
+
+def test_pomIsNotCached():
+    from m4e.pom import Pom
+    pom1 = Pom(BIRT)
+    pom2 = Pom(BIRT)
+    
+    assert pom1.xml is not pom2.xml
+    assert not pom1.shared
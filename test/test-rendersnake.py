@@ -18,4 +18,28 @@ def test_Render():
     ._div() \
     ._body()._html().write('\n')
 
-    eq_('<html><head>\n<title>Demo</title>\n</head>\n<body>\n<div id="xxx" class="yyy" onclick="a=\'x\'; b=&quot;b&quot;">&lt;hello&amp;&gt;</div></body></html>\n', buffer.getvalue())
\ No newline at end of file
+    eq_('<html><head>\n<title>Demo</title>\n</head>\n<body>\n<div id="xxx" class="yyy" onclick="a=\'x\'; b=&quot;b&quot;">&lt;hello&amp;&gt;</div></body></html>\n', buffer.getvalue())
+
+def test_attrs():
+    eq_(' class="pom"', A().class_('pom').text())
+    eq_(' class="pom" id="x&amp;y"', A().class_('pom').id('x&y').text())
+    eq_(' class="a&amp;b"', A().class_('a&b').text())
+    eq_(' class="a&amp;b"', A().class_('a&b').text())
+    eq_('', A().text())
+
+def test_attrsAreMutable():
+    attrs = A()
+    attrs.class_('x')
+    attrs.href('#y')
+    
+    eq_(' class="x" href="#y"', attrs.text())
+    eq_('', A().text())
+
+def test_closeFlushes():
+    buffer = StringIO.StringIO()
+    
+    with HtmlCanvas(buffer) as html:
+        html.div().write('<unfinished>')
+        eq_('', buffer.getvalue())
+    
+    eq_('<div>&lt;unfinished&gt;', buffer.getvalue())
@@ -0,0 +1,115 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.savequeue
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import os
+import sys
+import shutil
+import tarfile
+from nose.tools import eq_
+
+sys.path.append('../src')
+
+from m4e.pom import Pom
+from m4e.savequeue import SaveQueue
+
+POMS = ('org.eclipse.birt.core-2.6.2.pom', 'org.eclipse.persistence.moxy-2.1.2.pom')
+
+def createRepo(name):
+    repoDir = os.path.abspath('../tmp/test-savequeue/%s' % name)
+    if os.path.exists(repoDir):
+        shutil.rmtree(repoDir)
+    os.makedirs(repoDir)
+    
+    for fileName in POMS:
+        shutil.copy(fileName, repoDir)
+    
+    return repoDir
+
+def readFile(path):
+    with open(path, 'rb') as fh:
+        return fh.read()
+
+def saveAll(repoDir, backup, batchSize=100):
+    queue = SaveQueue(repoDir, backup=backup, fsync=True, batchSize=batchSize)
+    for fileName in POMS:
+        pom = Pom(os.path.join(repoDir, fileName)).makeWritable()
+        pom.project.version._setText('9.9')
+        queue.save(pom)
+    queue.close()
+    
+    return queue
+
+def test_sameAsSave():
+    repoDir = createRepo('same')
+    pom = Pom(POMS[0]).makeWritable()
+    pom.project.version._setText('9.9')
+    pom.save(os.path.join(repoDir, 'expected.pom'))
+    
+    saveAll(repoDir, 'none', batchSize=1)
+    
+    eq_(readFile(os.path.join(repoDir, 'expected.pom')), readFile(os.path.join(repoDir, POMS[0])))
+    eq_(['expected.pom'] + list(POMS), sorted(os.listdir(repoDir)))
+
+def test_bak():
+    repoDir = createRepo('bak')
+    saveAll(repoDir, 'bak')
+    
+    eq_(readFile(POMS[1]), readFile(os.path.join(repoDir, POMS[1] + '.bak')))
+
+def test_archive():
+    repoDir = createRepo('archive')
+    queue = saveAll(repoDir, 'archive')
+    
+    eq_(list(POMS), sorted(os.listdir(repoDir)))
+    
+    archive = tarfile.open(queue.archivePath)
+    eq_(list(POMS), sorted(archive.getnames()))
+    eq_(readFile(POMS[0]), archive.extractfile(POMS[0]).read())
+    
+    os.remove(queue.archivePath)
+
+def test_noThreads():
+    repoDir = createRepo('noThreads')
+    queue = SaveQueue(repoDir, threads=0, backup='none')
+    
+    pom = Pom(os.path.join(repoDir, POMS[0])).makeWritable()
+    pom.project.version._setText('9.9')
+    queue.save(pom)
+    queue.close()
+    
+    eq_([os.path.join(repoDir, POMS[0])], queue.committed)
+    eq_('9.9', Pom(os.path.join(repoDir, POMS[0])).project.version.text)
+
+def test_errorDeletesTmpFiles():
+    repoDir = createRepo('error')
+    queue = SaveQueue(repoDir, threads=1, backup='archive', batchSize=1)
+    
+    pom = Pom(os.path.join(repoDir, POMS[0])).makeWritable()
+    queue.save(pom)
+    queue.save(pom, os.path.join(repoDir, POMS[1], 'cant-create-dir.pom'))
+    
+    try:
+        queue.close()
+        assert False, 'Expected an error'
+    except EnvironmentError:
+        pass
+    
+    eq_(list(POMS), sorted(os.listdir(repoDir)))
+    assert queue.archive.closed
+    
+    os.remove(queue.archivePath)
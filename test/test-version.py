@@ -0,0 +1,100 @@
+# /*******************************************************************************
+# * Copyright (c) 19.10.2026 Aaron Digulla.
+# * All rights reserved. This program and the accompanying materials
+# * are made available under the terms of the Eclipse Public License v1.0
+# * which accompanies this distribution, and is available at
+# * http://www.eclipse.org/legal/epl-v10.html
+# *
+# * Contributors:
+# *    Aaron Digulla - initial API and implementation and/or initial documentation
+# *******************************************************************************/
+'''
+Test cases for m4e.version
+
+Created on Oct 19, 2026
+
+@author: Aaron Digulla <digulla@hepe.com>
+'''
+
+import sys
+from nose.tools import eq_
+
+sys.path.append('../src')
+
+from m4e.version import *
+
+def test_versionKey():
+    eq_((3, 6, 0, ''), versionKey('3.6.0'))
+    eq_((3, 6, 0, ''), versionKey('3.6'))
+    eq_((3, 6, 2, 'v20110110'), versionKey('3.6.2.v20110110'))
+    eq_((1, 7, 0, 'R2'), versionKey('1.7R2'))
+    eq_((1, 0, 0, 'SNAPSHOT'), versionKey('1.0-SNAPSHOT'))
+    eq_((-1, -1, -1, 'latest'), versionKey('latest'))
+
+def test_versionKeyIsCached():
+    eq_(True, versionKey('3.7.0') is versionKey('3.7.0'))
+
+def test_sortVersions():
+    versions = ['3.10.0', '3.6.0.v2', '3.6.0', '3.9', '3.6.0.v1']
+    versions.sort(key=versionKey)
+    eq_(['3.6.0', '3.6.0.v1', '3.6.0.v2', '3.9', '3.10.0'], versions)
+
+def test_parseRange():
+    eq_('[3.2.0,4.0.0)', repr(parseRange('[3.2.0,4.0.0)')))
+    eq_('[0,)', repr(parseRange('[0,)')))
+    eq_('(,1.0]', repr(parseRange('(,1.0]')))
+    eq_('[1.0,1.0]', repr(parseRange('[1.0]')))
+    eq_('[1.0,1.0]', repr(parseRange('1.0')))
+    eq_(None, parseRange(''))
+    eq_(None, parseRange(None))
+    eq_(None, parseRange('[1,2),[3,4)'))
+    eq_(None, parseRange(']1,2['))
+
+def test_isRange():
+    eq_(True, isRange('[3.2.0,4.0.0)'))
+    eq_(True, isRange('(,1.0]'))
+    eq_(True, isRange('[1.0]'))
+    eq_(False, isRange('3.6.2'))
+    eq_(False, isRange(''))
+    eq_(False, isRange(None))
+
+def test_contains():
+    r = parseRange('[3.2.0,4.0.0)')
+    eq_(True, r.contains('3.2'))
+    eq_(True, r.contains('3.6.2.v2011'))
+    eq_(False, r.contains('4.0.0'))
+    eq_(False, r.contains('3.1.9'))
+    
+    r = parseRange('(3.2.0,4.0.0]')
+    eq_(False, r.contains('3.2.0'))
+    eq_(True, r.contains('4.0'))
+
+def sortedKeys(*versions):
+    result = [versionKey(v) for v in versions]
+    result.sort()
+    return result
+
+def test_satisfiedBy():
+    keys = sortedKeys('3.1.0', '3.6.2', '4.0.0')
+    
+    eq_(True, parseRange('[3.2.0,4.0.0)').satisfiedBy(keys))
+    eq_(False, parseRange('[3.7.0,4.0.0)').satisfiedBy(keys))
+    eq_(True, parseRange('[3.7.0,4.0.0]').satisfiedBy(keys))
+    eq_(False, parseRange('(4.0.0,)').satisfiedBy(keys))
+    eq_(True, parseRange('[4.0.0,)').satisfiedBy(keys))
+    eq_(True, parseRange('(,3.1]').satisfiedBy(keys))
+    eq_(False, parseRange('(,3.1)').satisfiedBy(keys))
+    eq_(True, parseRange('3.6.2').satisfiedBy(keys))
+    eq_(False, parseRange('3.6.1').satisfiedBy(keys))
+    eq_(False, parseRange('[1.0,2.0)').satisfiedBy([]))
+
+def test_versionSpecKey():
+    versions = ['[3.5.0,4.0.0)', None, '[3.0.0,)', '[3.0.0,4.0.0)', '3.1']
+    versions.sort(key=versionSpecKey)
+    eq_([None, '[3.0.0,4.0.0)', '[3.0.0,)', '3.1', '[3.5.0,4.0.0)'], versions)
+
+def test_mavenVersionKey():
+    versions = ['1.0', '1.0-SNAPSHOT', '1.0-rc-1', '1.0-alpha-1', '1.0-alpha-1-SNAPSHOT', '1.0-beta2', '1.0-sp1', '1.0.v20100101', '0.9', '1.0.1', '1.0-M1', '1.0_x']
+    versions.sort(key=mavenVersionKey)
+    eq_(['0.9', '1.0-alpha-1-SNAPSHOT', '1.0-alpha-1', '1.0-beta2', '1.0-M1', '1.0-rc-1', '1.0-SNAPSHOT', '1.0', '1.0-sp1', '1.0_x', '1.0.v20100101', '1.0.1'], versions)
+    eq_(mavenVersionKey('3.6'), mavenVersionKey('3.6.0'))